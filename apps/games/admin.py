@@ -1,25 +1,32 @@
 from django.contrib import admin
 
-from .models import Game, GamePlayer, GameRound, GamePlayerGameRound
+from predictive_whist.replica import ReplicaReadsAdminMixin
 
+from .models import Game, GamePlayer, GameRound, GamePlayerGameRound, GameSummary
 
-class GameAdmin(admin.ModelAdmin):
+
+class GameAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
     readonly_fields = ("inserted_at", "updated_at")
 
 
-class GamePlayerAdmin(admin.ModelAdmin):
+class GamePlayerAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
     readonly_fields = ("inserted_at", "updated_at")
 
 
-class GameRoundAdmin(admin.ModelAdmin):
+class GameRoundAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
     readonly_fields = ("inserted_at", "updated_at")
 
 
-class GamePlayerGameRoundAdmin(admin.ModelAdmin):
+class GamePlayerGameRoundAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
     readonly_fields = ("inserted_at", "updated_at")
 
 
+class GameSummaryAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
+    readonly_fields = ("updated_at",)
+
+
 admin.site.register(Game, GameAdmin)
 admin.site.register(GamePlayer, GamePlayerAdmin)
 admin.site.register(GameRound, GameRoundAdmin)
 admin.site.register(GamePlayerGameRound, GamePlayerGameRoundAdmin)
+admin.site.register(GameSummary, GameSummaryAdmin)
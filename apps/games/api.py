@@ -0,0 +1,352 @@
+"""A JSON API for reading a game's state and submitting a whole round in one request.
+
+The API is served to logged-in users from their session, like the pages, so requests
+which change anything must send the CSRF token in the `X-CSRFToken` header. Bids and
+tricks are checked by the same forms as the round pages, and saved by the same
+functions (see rounds.py), so each submission is one transaction which returns the
+scoreboard delta that is also pushed to the game's live subscribers.
+
+A submission may send the `version` of the game it was made from, as returned in the
+game's state. If the game has changed since that version, or changes while the
+submission is being saved, nothing is saved and the response is a 409 with the game's
+current state, to retry from.
+"""
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.forms import Form
+from django.http import HttpRequest, JsonResponse
+from django.views.generic import View
+
+from .cache import get_or_build_scoreboard
+from .forms import (
+    GameRoundPredictionForm,
+    GameRoundScoreForm,
+    tricks_by_player_number,
+)
+from .models import Game, GamePlayer, GamePlayerGameRound, GameRound
+from .rounds import (
+    RoundConflict,
+    load_round,
+    save_round_bids,
+    save_round_scores,
+)
+from .views import build_scoreboard, conditional_game_page
+
+
+def error_response(
+    status: int,
+    message: str,
+    errors: Optional[Dict] = None,
+    game: Optional[Dict] = None,
+) -> JsonResponse:
+    """Return a JSON error response.
+
+    Args:
+        status (int): The HTTP status code.
+        message (str): What went wrong.
+        errors (Optional[Dict]):
+            The validation errors of each player, keyed by player number, with errors
+            in the round as a whole under `__all__`.
+        game (Optional[Dict]): The current state of the game, from `game_state`.
+
+    Returns:
+        JsonResponse: The response.
+    """
+    body: Dict = {"error": message}
+
+    if errors is not None:
+        body["errors"] = errors
+
+    if game is not None:
+        body["game"] = game
+
+    return JsonResponse(body, status=status)
+
+
+def blank_to_none(value):
+    """Map the blanks used in the round table for anything not yet entered to None."""
+    return None if value == "" else value
+
+
+def game_state(game: Game, game_players: List[GamePlayer], game_rounds: List) -> Dict:
+    """Return the state of a game, as sent by the API.
+
+    Args:
+        game (Game): The game, with its summary.
+        game_players (List[GamePlayer]): The game's players, in player number order.
+        game_rounds (List): The game's round table, from `build_round_table`.
+
+    Returns:
+        Dict: The state of the game.
+    """
+    game_summary = game.summary
+
+    return {
+        "id": str(game.id),
+        "name": game.name,
+        "is_ongoing": game.is_ongoing,
+        "starting_round_card_number": game.starting_round_card_number,
+        "number_of_decks": game.number_of_decks,
+        "correct_prediction_points": game.correct_prediction_points,
+        "missed_prediction_points": game.missed_prediction_points,
+        "zero_prediction_points": game.zero_prediction_points,
+        "double_last_round_points": game.double_last_round_points,
+        "card_progression": game.card_progression,
+        "version": game_summary.version,
+        "latest_round_number": game_summary.latest_round_number,
+        "latest_round_card_number": game_summary.latest_round_card_number,
+        "latest_round_total_tricks_predicted": (
+            game_summary.latest_round_total_tricks_predicted
+        ),
+        "trump_suit": game_summary.trump_suit,
+        "dealer_player_number": game_summary.dealer_player_number,
+        "leaders": game_summary.leaders,
+        "players": [
+            {
+                "player_number": game_player.player_number,
+                "name": game_player.unique_display_name,
+                "score": game_player.score,
+            }
+            for game_player in game_players
+        ],
+        "rounds": [
+            {
+                "round_number": int(round_number),
+                "players": [
+                    {
+                        "player_number": cell["player_number"],
+                        "tricks_predicted": blank_to_none(cell["tricks_predicted"]),
+                        "tricks_won": blank_to_none(cell["tricks_won"]),
+                        "round_score": blank_to_none(cell["score"]),
+                        "score": cell["running_total"],
+                    }
+                    for cell in cells
+                ],
+            }
+            for round_number, cells in game_rounds
+        ],
+    }
+
+
+class ApiLoginRequiredMixin(LoginRequiredMixin):
+    """Answers requests which aren't logged in with a JSON error, not a redirect."""
+
+    # Django's stubs only allow the redirect to the login page here, but any response
+    # can be returned.
+    def handle_no_permission(self) -> JsonResponse:  # type: ignore[override]
+        return error_response(401, "You must be logged in.")
+
+
+class GameApiView(ApiLoginRequiredMixin, View):
+    """This view returns the state of a game, with its players' scores and rounds."""
+
+    @conditional_game_page
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        try:
+            game = Game.objects.select_related("summary").get(id=self.kwargs["pk"])
+        except (Game.DoesNotExist, ValueError):
+            return error_response(404, "There is no such game.")
+
+        if not game.visible_to(request.user):
+            return error_response(403, "You can't see this game.")
+
+        scoreboard = get_or_build_scoreboard(game, lambda: build_scoreboard(game))
+
+        return JsonResponse(
+            game_state(game, scoreboard["game_players"], scoreboard["game_rounds"])
+        )
+
+
+def conflict_response(game_id) -> JsonResponse:
+    """Return the response to a submission made from an old version of a game.
+
+    Args:
+        game_id: The ID of the game.
+
+    Returns:
+        JsonResponse: The 409 response, with the game's current state.
+    """
+    game = Game.objects.select_related("summary").get(id=game_id)
+    scoreboard = get_or_build_scoreboard(game, lambda: build_scoreboard(game))
+
+    return error_response(
+        409,
+        "The game has changed since this was submitted. Check its current state and "
+        "submit again.",
+        game=game_state(game, scoreboard["game_players"], scoreboard["game_rounds"]),
+    )
+
+
+class InvalidSubmission(Exception):
+    """Raised when a round's submission is invalid, with the validation errors, if any.
+
+    Args:
+        message (str): What is wrong with the submission.
+        errors (Optional[Dict]): The validation errors, as sent by `error_response`.
+    """
+
+    def __init__(self, message: str, errors: Optional[Dict] = None) -> None:
+        super().__init__(message)
+        self.errors = errors
+
+
+class GameRoundApiView(ApiLoginRequiredMixin, View):
+    """This is the base for views which submit every player's tricks for a round.
+
+    The request's body is a JSON object holding the number of tricks of each player,
+    keyed by player number, under `payload_key`, and optionally the version of the game
+    they were entered from. For example:
+
+        {"bids": {"1": 2, "2": 0, "3": 1}, "version": 4}
+    """
+
+    form_class: Callable[..., Form]
+    payload_key: str
+    field_prefix: str
+    save_round: Callable[..., Dict]
+
+    def read_body(self, request: HttpRequest) -> Tuple[Dict, Optional[int]]:
+        """Read the tricks of each player and the game's version from a request's body.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Raises:
+            InvalidSubmission: If the body isn't valid.
+
+        Returns:
+            Tuple[Dict, Optional[int]]:
+                The tricks, keyed by player number, and the version, if one was sent.
+        """
+        try:
+            body = json.loads(request.body)
+            tricks = body[self.payload_key]
+            version = body.get("version")
+        except (ValueError, TypeError, KeyError, AttributeError):
+            tricks = version = None
+
+        if not isinstance(tricks, dict):
+            raise InvalidSubmission(
+                f"The body must be a JSON object with a `{self.payload_key}` object."
+            )
+
+        if version is not None and (
+            not isinstance(version, int) or isinstance(version, bool)
+        ):
+            raise InvalidSubmission("The `version` must be an integer.")
+
+        return tricks, version
+
+    def round_form(
+        self,
+        tricks: Dict,
+        game_round: GameRound,
+        round_players: List[GamePlayerGameRound],
+    ) -> Form:
+        """Check the tricks of each player with the round's form.
+
+        Args:
+            tricks (Dict): The tricks, keyed by player number.
+            game_round (GameRound): The round.
+            round_players (List[GamePlayerGameRound]):
+                Every player's row for the round, with their game player.
+
+        Raises:
+            InvalidSubmission: If the tricks aren't valid for the round.
+
+        Returns:
+            Form: The valid form.
+        """
+        player_numbers = {
+            str(round_player.game_player.player_number)
+            for round_player in round_players
+        }
+
+        unknown_player_numbers = sorted(set(tricks) - player_numbers)
+
+        if unknown_player_numbers:
+            raise InvalidSubmission(
+                "The round is invalid.",
+                {
+                    player_number: ["There is no such player in this game."]
+                    for player_number in unknown_player_numbers
+                },
+            )
+
+        form = self.form_class(
+            data={
+                f"{self.field_prefix}_{player_number}": player_tricks
+                for player_number, player_tricks in tricks.items()
+            },
+            round_players=round_players,
+            card_number=game_round.card_number,
+        )
+
+        if not form.is_valid():
+            raise InvalidSubmission(
+                "The round is invalid.",
+                {
+                    (
+                        field_name
+                        if field_name == NON_FIELD_ERRORS
+                        else field_name.rsplit("_", 1)[1]
+                    ): field_errors
+                    for field_name, field_errors in form.errors.items()
+                },
+            )
+
+        return form
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        try:
+            tricks, version = self.read_body(request)
+        except InvalidSubmission as error:
+            return error_response(400, str(error), error.errors)
+
+        try:
+            game = Game.objects.select_related("summary").get(id=self.kwargs["game_id"])
+            game_round, round_players = load_round(
+                game, int(self.kwargs["round_number"])
+            )
+        except (Game.DoesNotExist, GameRound.DoesNotExist, ValueError):
+            return error_response(404, "There is no such round.")
+
+        if not game_round.visible_to(request.user):
+            return error_response(403, "You can't see this game.")
+
+        try:
+            form = self.round_form(tricks, game_round, round_players)
+
+            if version is not None and version != game.summary.version:
+                raise RoundConflict(f"Game {game.id} has changed since {version}.")
+
+            delta = self.save_round(
+                game, game_round, round_players, tricks_by_player_number(form)
+            )
+        except InvalidSubmission as error:
+            return error_response(400, str(error), error.errors)
+        except RoundConflict:
+            return conflict_response(game.id)
+
+        return JsonResponse(delta)
+
+
+class GameRoundBidsApiView(GameRoundApiView):
+    """This view submits the bids of every player in a round."""
+
+    form_class = GameRoundPredictionForm
+    payload_key = "bids"
+    field_prefix = "tricks_predicted"
+    save_round = staticmethod(save_round_bids)
+
+
+class GameRoundTricksApiView(GameRoundApiView):
+    """This view submits the tricks won by every player in a round."""
+
+    form_class = GameRoundScoreForm
+    payload_key = "tricks"
+    field_prefix = "tricks_won"
+    save_round = staticmethod(save_round_scores)
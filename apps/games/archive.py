@@ -0,0 +1,377 @@
+"""Archiving of completed games, packing their rounds into a blob on the game.
+
+A completed game's rounds are only read, so they can be taken out of the round tables:
+each player's bid and tricks won in every round are packed into
+`Game.archived_rounds`, and the game's GameRound and GamePlayerGameRound rows are
+deleted. Nothing else needs to be kept, as each round's card number and trump suit
+follow from the game's schedule, and its total bid from the bids.
+
+The game page, the export, players' statistics and rescoring read archived games from
+the blob, and so do the round pages, without writing anything. Saving a round of an
+archived game unarchives it first, in the same transaction, recreating its rows (with new
+timestamps), and it can be archived again once it is left alone.
+
+The blob is an array of little-endian unsigned 16-bit integers: the version of the
+format, the number of players and the number of rounds, then each player's bid and
+tricks won, by round number then player number.
+"""
+import sys
+from array import array
+from itertools import groupby
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from django.db import transaction
+
+from .models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from .schedule import schedule_of_game
+
+ARCHIVE_FORMAT_VERSION = 1
+
+# The number of games archived or unarchived in each transaction.
+ARCHIVE_BATCH_SIZE = 200
+
+
+def pack_rounds(
+    number_of_players: int, rounds: Sequence[Sequence[Tuple[int, int]]]
+) -> bytes:
+    """Pack the bids and tricks won of a game's rounds into an archive.
+
+    Args:
+        number_of_players (int): The number of players in the game.
+        rounds (Sequence[Sequence[Tuple[int, int]]]): Each player's bid and tricks won
+            in each round, in round number then player number order.
+
+    Returns:
+        bytes: The archive.
+    """
+    values = array("H", (ARCHIVE_FORMAT_VERSION, number_of_players, len(rounds)))
+
+    for round_tricks in rounds:
+        for tricks_predicted, tricks_won in round_tricks:
+            values.append(tricks_predicted)
+            values.append(tricks_won)
+
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def unpack_rounds(archive: Union[bytes, memoryview]) -> List[List[Tuple[int, int]]]:
+    """Unpack the bids and tricks won of a game's rounds from an archive.
+
+    Args:
+        archive (Union[bytes, memoryview]): The archive, from `pack_rounds`, as the
+            database returns it.
+
+    Raises:
+        ValueError: If the archive isn't in a format this version can read.
+
+    Returns:
+        List[List[Tuple[int, int]]]: Each player's bid and tricks won in each round, in
+            round number then player number order.
+    """
+    values = array("H")
+    values.frombytes(bytes(archive))
+
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    format_version, number_of_players, round_count = values[:3]
+
+    if format_version != ARCHIVE_FORMAT_VERSION:
+        raise ValueError(f"Unknown archive format version {format_version}.")
+
+    tricks = values[3:]
+    row_length = number_of_players * 2
+
+    return [
+        list(zip(round_tricks[::2], round_tricks[1::2]))
+        for round_tricks in (
+            tricks[start : start + row_length]
+            for start in range(0, round_count * row_length, row_length)
+        )
+    ]
+
+
+def round_table_rows(game: Game) -> List[Dict]:
+    """The rows of an archived game's rounds, as `build_round_table` reads them.
+
+    Args:
+        game (Game): The archived game.
+
+    Returns:
+        List[Dict]: The rows, in round number then player number order.
+    """
+    assert game.archived_rounds is not None
+
+    return [
+        {
+            "game_round__round_number": round_number,
+            "game_player__player_number": player_number,
+            "tricks_predicted": tricks_predicted,
+            "tricks_won": tricks_won,
+        }
+        for round_number, round_tricks in enumerate(
+            unpack_rounds(game.archived_rounds), start=1
+        )
+        for player_number, (tricks_predicted, tricks_won) in enumerate(
+            round_tricks, start=1
+        )
+    ]
+
+
+def archived_scored_rows(
+    game_ids: Iterable,
+) -> Iterator[Tuple[Any, Any, Any, int, int, int]]:
+    """The scored rounds of the archived games among the given games.
+
+    Args:
+        game_ids (Iterable): The IDs of the games, archived or not.
+
+    Yields:
+        Tuple[Any, Any, Any, int, int, int]: The game ID, game player ID, player ID,
+            round number, tricks predicted and tricks won of each player in each round
+            of the archived games, grouped by game.
+    """
+    archives = dict(
+        Game.objects.filter(
+            id__in=list(game_ids), archived_rounds__isnull=False
+        ).values_list("id", "archived_rounds")
+    )
+
+    if not archives:
+        return
+
+    game_players = (
+        GamePlayer.objects.filter(game_id__in=archives)
+        .order_by("game_id", "player_number")
+        .values_list("game_id", "id", "player_id")
+    )
+
+    for game_id, game_player_rows in groupby(game_players, key=lambda row: row[0]):
+        players = list(game_player_rows)
+
+        for round_number, round_tricks in enumerate(
+            unpack_rounds(archives[game_id]), start=1
+        ):
+            for (_, game_player_id, player_id), (tricks_predicted, tricks_won) in zip(
+                players, round_tricks
+            ):
+                yield (
+                    game_id,
+                    game_player_id,
+                    player_id,
+                    round_number,
+                    tricks_predicted,
+                    tricks_won,
+                )
+
+
+def is_archivable(
+    game: Game,
+    round_keys: List[Tuple[int, int, str]],
+    rounds: List[List[Tuple[Any, Any]]],
+) -> bool:
+    """Whether a game's rounds can be archived without losing anything.
+
+    Args:
+        game (Game): The game.
+        round_keys (List[Tuple[int, int, str]]): The number, card number and trump suit
+            of each of the game's rounds, in round number order.
+        rounds (List[List[Tuple[Any, Any]]]): Each player's bid and tricks won in each
+            round, in round number then player number order.
+
+    Returns:
+        bool: Whether every round of the game's schedule has been played, as
+            scheduled, by every player.
+    """
+    number_of_players = len(rounds[0])
+    schedule = schedule_of_game(game, number_of_players)
+
+    return (
+        round_keys
+        == [
+            (round_number, round_schedule.card_number, round_schedule.trump_suit)
+            for round_number, round_schedule in enumerate(schedule, start=1)
+        ]
+        and all(len(round_tricks) == number_of_players for round_tricks in rounds)
+        and all(
+            tricks_predicted is not None and tricks_won is not None
+            for round_tricks in rounds
+            for tricks_predicted, tricks_won in round_tricks
+        )
+    )
+
+
+@transaction.atomic
+def archive_games(game_ids: Iterable) -> int:
+    """Archive the rounds of the given games, where they are completed.
+
+    A game is left as it is if it is ongoing or already archived, or if its rounds
+    aren't exactly those of its schedule.
+
+    Args:
+        game_ids (Iterable): The IDs of the games.
+
+    Returns:
+        int: The number of games archived.
+    """
+    games = {
+        game.id: game
+        for game in Game.objects.select_for_update()
+        .select_related("summary")
+        .filter(id__in=list(game_ids), is_ongoing=False, archived_rounds__isnull=True)
+    }
+    round_rows = (
+        GamePlayerGameRound.objects.filter(game_round__game_id__in=games)
+        .order_by(
+            "game_round__game_id",
+            "game_round__round_number",
+            "game_player__player_number",
+        )
+        .values_list(
+            "game_round__game_id",
+            "game_round__round_number",
+            "game_round__card_number",
+            "game_round__trump_suit",
+            "tricks_predicted",
+            "tricks_won",
+        )
+    )
+    archived_games = []
+
+    for game_id, game_rows in groupby(round_rows, key=lambda row: row[0]):
+        game = games[game_id]
+        round_keys = []
+        rounds: List[List[Tuple[Any, Any]]] = []
+
+        for round_key, rows in groupby(game_rows, key=lambda row: row[1:4]):
+            round_keys.append(round_key)
+            rounds.append([(row[4], row[5]) for row in rows])
+
+        # Claiming the game's next version makes a round submission read before the
+        # game was archived conflict, rather than save to the deleted rows.
+        if is_archivable(game, round_keys, rounds) and GameSummary.claim_next_version(
+            game
+        ):
+            game.archived_rounds = pack_rounds(len(rounds[0]), rounds)
+            archived_games.append(game)
+
+    Game.objects.bulk_update(archived_games, ["archived_rounds"])
+    GamePlayerGameRound.objects.filter(game_round__game__in=archived_games).delete()
+    GameRound.objects.filter(game__in=archived_games).delete()
+
+    return len(archived_games)
+
+
+def unpacked_rounds(
+    game: Game, game_players: List[GamePlayer]
+) -> Iterator[Tuple[GameRound, List[GamePlayerGameRound]]]:
+    """The rounds of an archived game, unpacked from its archive without saving them.
+
+    Args:
+        game (Game): The archived game.
+        game_players (List[GamePlayer]): The game's players, in player number order.
+
+    Yields:
+        Tuple[GameRound, List[GamePlayerGameRound]]: Each round, in round number order,
+            and its players' rows in player number order.
+    """
+    assert game.archived_rounds is not None
+
+    schedule = schedule_of_game(game, len(game_players))
+
+    for round_number, (round_schedule, round_tricks) in enumerate(
+        zip(schedule, unpack_rounds(game.archived_rounds)), start=1
+    ):
+        game_round = GameRound(
+            game=game,
+            round_number=round_number,
+            trump_suit=round_schedule.trump_suit,
+            card_number=round_schedule.card_number,
+            total_tricks_predicted=sum(
+                tricks_predicted for tricks_predicted, _ in round_tricks
+            ),
+        )
+
+        yield game_round, [
+            GamePlayerGameRound(
+                game_round=game_round,
+                game_player=game_player,
+                tricks_predicted=tricks_predicted,
+                tricks_won=tricks_won,
+            )
+            for game_player, (tricks_predicted, tricks_won) in zip(
+                game_players, round_tricks
+            )
+        ]
+
+
+def archived_round(
+    game: Game, round_number: int
+) -> Tuple[GameRound, List[GamePlayerGameRound]]:
+    """A round of an archived game, unpacked from its archive without saving it.
+
+    Args:
+        game (Game): The archived game.
+        round_number (int): The number of the round.
+
+    Raises:
+        GameRound.DoesNotExist: If the game has no such round.
+
+    Returns:
+        Tuple[GameRound, List[GamePlayerGameRound]]: The round, and its players' rows
+            (with their game players) in player number order.
+    """
+    game_players = list(GamePlayer.objects.filter(game=game).order_by("player_number"))
+
+    for game_round, round_players in unpacked_rounds(game, game_players):
+        if game_round.round_number == round_number:
+            return game_round, round_players
+
+    raise GameRound.DoesNotExist(f"Game {game.id} has no round {round_number}.")
+
+
+@transaction.atomic
+def unarchive_games(game_ids: Iterable) -> int:
+    """Recreate the rounds of the given games which are archived, from their archives.
+
+    Args:
+        game_ids (Iterable): The IDs of the games.
+
+    Returns:
+        int: The number of games unarchived.
+    """
+    games = list(
+        Game.objects.select_for_update().filter(
+            id__in=list(game_ids), archived_rounds__isnull=False
+        )
+    )
+    game_players = {
+        game_id: list(players)
+        for game_id, players in groupby(
+            GamePlayer.objects.filter(game__in=games).order_by(
+                "game_id", "player_number"
+            ),
+            key=lambda game_player: game_player.game_id,
+        )
+    }
+    game_rounds: List[GameRound] = []
+    round_players: List[GamePlayerGameRound] = []
+
+    for game in games:
+        for game_round, game_round_players in unpacked_rounds(
+            game, game_players[game.id]
+        ):
+            game_rounds.append(game_round)
+            round_players.extend(game_round_players)
+
+        game.archived_rounds = None
+
+    # bulk_create() sets the rounds' IDs, which the round players then refer to.
+    GameRound.objects.bulk_create(game_rounds)
+    GamePlayerGameRound.objects.bulk_create(round_players)
+    Game.objects.bulk_update(games, ["archived_rounds"])
+
+    return len(games)
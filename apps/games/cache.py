@@ -0,0 +1,90 @@
+"""Caching of each game's scoreboard data between changes to its bids and scores.
+
+Entries are keyed on the game's ID and its summary's version, which is incremented in
+the same transaction as every change to the game's bids or scores. A changed game is
+therefore never read from a stale entry, and superseded entries are left for the
+cache's own expiry and culling to evict.
+"""
+from collections import Counter
+from typing import Awaitable, Callable, Dict
+
+from django.core.cache import cache
+
+from .models import Game, GameSummary
+
+# Hits and misses of the scoreboard cache in this process.
+scoreboard_cache_stats: Counter = Counter()
+
+
+def scoreboard_cache_key(game: Game) -> str:
+    """The cache key of the current version of a game's scoreboard.
+
+    Args:
+        game (Game): The game, loaded with its summary.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"scoreboard:{game.id}:{game.summary.version}"
+
+
+def get_or_build_scoreboard(game: Game, build: Callable[[], Dict]) -> Dict:
+    """Return the game's cached scoreboard, building and caching it on a miss.
+
+    Args:
+        game (Game): The game, loaded with its summary.
+        build (Callable[[], Dict]): Builds the scoreboard from the database.
+
+    Returns:
+        Dict: The scoreboard.
+    """
+    key = scoreboard_cache_key(game)
+    scoreboard = cache.get(key)
+
+    if scoreboard is not None:
+        scoreboard_cache_stats["hits"] += 1
+        return scoreboard
+
+    scoreboard_cache_stats["misses"] += 1
+    scoreboard = build()
+    cache.set(key, scoreboard)
+
+    return scoreboard
+
+
+async def aget_or_build_scoreboard(
+    game: Game, build: Callable[[], Awaitable[Dict]]
+) -> Dict:
+    """The async equivalent of `get_or_build_scoreboard`.
+
+    Args:
+        game (Game): The game, loaded with its summary.
+        build (Callable[[], Awaitable[Dict]]): Builds the scoreboard from the database.
+
+    Returns:
+        Dict: The scoreboard.
+    """
+    key = scoreboard_cache_key(game)
+    scoreboard = await cache.aget(key)
+
+    if scoreboard is not None:
+        scoreboard_cache_stats["hits"] += 1
+        return scoreboard
+
+    scoreboard_cache_stats["misses"] += 1
+    scoreboard = await build()
+    await cache.aset(key, scoreboard)
+
+    return scoreboard
+
+
+def invalidate_scoreboard(game: Game) -> None:
+    """Remove the current version of a game's scoreboard from the cache.
+
+    Args:
+        game (Game): The game, loaded with its summary.
+    """
+    try:
+        cache.delete(scoreboard_cache_key(game))
+    except GameSummary.DoesNotExist:
+        pass
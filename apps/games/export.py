@@ -0,0 +1,418 @@
+"""Export of a user's games, with every player's bids and tricks in every round.
+
+The rows are streamed from the database in chunks and written out as they arrive, so
+an export holds one chunk (and, for JSON Lines, one game) in memory at a time however
+many games the user has. The rows of archived games are unpacked from their archives
+and merged into the stream in order. Under ASGI the export is an async iterator, as Django would
+otherwise read a synchronous iterator to the end before sending anything.
+"""
+import csv
+import heapq
+import json
+from itertools import groupby, islice
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .archive import unpack_rounds
+from .models import GAME_SETTINGS_FIELDS, Game, GamePlayer, GamePlayerGameRound
+from .schedule import game_schedule
+from .scoring import GameScorer, ScoringRules, compile_scoring_rules
+
+# The number of rows fetched from the database at a time.
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = (
+    "game_round__game_id",
+    "game_round__game__name",
+    "game_round__game__inserted_at",
+    "game_round__game__is_ongoing",
+    *(f"game_round__game__{field}" for field in GAME_SETTINGS_FIELDS),
+    "game_round__round_number",
+    "game_round__card_number",
+    "game_round__trump_suit",
+    "game_player__player_number",
+    "game_player__player__first_name",
+    "game_player__player__last_name",
+    "game_player__score",
+    "tricks_predicted",
+    "tricks_won",
+)
+
+CSV_HEADER = (
+    "game_id",
+    "game_name",
+    "game_inserted_at",
+    "game_is_ongoing",
+    *GAME_SETTINGS_FIELDS,
+    "round_number",
+    "card_number",
+    "trump_suit",
+    "player_number",
+    "player_name",
+    "tricks_predicted",
+    "tricks_won",
+    "round_score",
+    "game_score",
+)
+
+
+def export_rows(user) -> Iterator[Tuple]:
+    """Stream every round row of the user's games, in the order they are exported.
+
+    The games are ordered by when they were started, and their rows by round number
+    then player number.
+
+    Args:
+        user (auth.User): The user.
+
+    Returns:
+        Iterator[Tuple]: The rows, as tuples of `EXPORT_FIELDS`.
+    """
+    rows = (
+        GamePlayerGameRound.objects.filter(game_round__game__created_by_user=user)
+        .order_by(
+            "game_round__game__inserted_at",
+            "game_round__game_id",
+            "game_round__round_number",
+            "game_player__player_number",
+        )
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    # aexport_lines() reads the rows a chunk at a time, so they must be an iterator.
+    return iter(
+        heapq.merge(
+            rows, archived_export_rows(user), key=lambda row: (row[2], row[0].id)
+        )
+    )
+
+
+def archived_export_rows(user) -> Iterator[Tuple]:
+    """Stream the round rows of the user's archived games, unpacked from their archives.
+
+    Args:
+        user (auth.User): The user.
+
+    Yields:
+        Tuple: The rows, as tuples of `EXPORT_FIELDS`, in the order of `export_rows`.
+    """
+    # The game's ID and fields come before the round and player fields in
+    # EXPORT_FIELDS.
+    game_fields = [
+        field.removeprefix("game_round__game__")
+        for field in EXPORT_FIELDS
+        if field.startswith("game_round__game__")
+    ]
+    games = (
+        Game.objects.filter(created_by_user=user, archived_rounds__isnull=False)
+        .order_by("inserted_at", "id")
+        .values_list("id", *game_fields, "archived_rounds")
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    game_players = groupby(
+        GamePlayer.objects.filter(
+            game__created_by_user=user, game__archived_rounds__isnull=False
+        )
+        .order_by("game__inserted_at", "game_id", "player_number")
+        .values_list(
+            "game_id",
+            "player_number",
+            "player__first_name",
+            "player__last_name",
+            "score",
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        key=lambda row: row[0],
+    )
+
+    for (*game_row, archived_rounds), (_, game_player_rows) in zip(games, game_players):
+        players = [player[1:] for player in game_player_rows]
+        game = dict(zip(game_fields, game_row[1:]))
+        schedule = game_schedule(
+            game["card_progression"],
+            game["starting_round_card_number"],
+            game["double_last_round_points"],
+            len(players),
+        )
+
+        for round_number, (round_schedule, round_tricks) in enumerate(
+            zip(schedule, unpack_rounds(archived_rounds)), start=1
+        ):
+            for player, tricks in zip(players, round_tricks):
+                yield (
+                    *game_row,
+                    round_number,
+                    round_schedule.card_number,
+                    round_schedule.trump_suit,
+                    *player,
+                    *tricks,
+                )
+
+
+def player_name(first_name: str, last_name: str) -> str:
+    """The full name a player is exported with, which the import matches them on.
+
+    Their display name in the game isn't used, as it depends on the game's other
+    players, so "Alice S." wouldn't be recognised as Alice Smith.
+    """
+    return f"{first_name} {last_name}".strip()
+
+
+class Echo:
+    """A file-like object which returns what is written to it, for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class GameExporter:
+    """Formats round rows, in the order of `export_rows`, as they are read.
+
+    Subclasses return the lines to send for the start of the export, for each row, and
+    for the end of the export.
+    """
+
+    content_type: str
+    file_extension: str
+
+    def __init__(self) -> None:
+        self._game_id = None
+        self._scorer: Optional[GameScorer] = None
+
+    def start(self) -> List[str]:
+        """The lines to send before any rows."""
+        return []
+
+    def feed(self, row: Tuple) -> List[str]:
+        """The lines to send for a row."""
+        raise NotImplementedError
+
+    def finish(self) -> List[str]:
+        """The lines to send after every row."""
+        return []
+
+    def round_score(self, row: Tuple) -> Optional[int]:
+        """The player's score for the row's round, if it has been scored."""
+        (
+            game_id,
+            _,
+            _,
+            _,
+            starting_round_card_number,
+            _,
+            correct_prediction_points,
+            missed_prediction_points,
+            zero_prediction_points,
+            double_last_round_points,
+            card_progression,
+            round_number,
+            *_,
+            tricks_predicted,
+            tricks_won,
+        ) = row
+
+        if tricks_won is None:
+            return None
+
+        if self._scorer is None or self._game_id != game_id:
+            self._game_id = game_id
+            self._scorer = compile_scoring_rules(
+                ScoringRules(
+                    card_progression=card_progression,
+                    max_card_number=starting_round_card_number,
+                    double_last_round_points=double_last_round_points,
+                    correct_prediction_points=correct_prediction_points,
+                    missed_prediction_points=missed_prediction_points,
+                    zero_prediction_points=zero_prediction_points,
+                )
+            )
+
+        return self._scorer.round_score(round_number, tricks_predicted, tricks_won)
+
+
+class CsvGameExporter(GameExporter):
+    """Exports one CSV row for each player in each round."""
+
+    content_type = "text/csv"
+    file_extension = "csv"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._writer = csv.writer(Echo())
+
+    def start(self) -> List[str]:
+        return [self._writer.writerow(CSV_HEADER)]
+
+    def feed(self, row: Tuple) -> List[str]:
+        (
+            game_id,
+            name,
+            inserted_at,
+            *game_and_round,
+            first_name,
+            last_name,
+            game_score,
+            tricks_predicted,
+            tricks_won,
+        ) = row
+
+        return [
+            self._writer.writerow(
+                (
+                    game_id,
+                    name,
+                    inserted_at.isoformat(),
+                    *game_and_round,
+                    player_name(first_name, last_name),
+                    tricks_predicted,
+                    tricks_won,
+                    self.round_score(row),
+                    game_score,
+                )
+            )
+        ]
+
+
+class JsonLinesGameExporter(GameExporter):
+    """Exports one JSON object for each game, with its players and rounds."""
+
+    content_type = "application/jsonl"
+    file_extension = "jsonl"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._current: Optional[Dict] = None
+
+    @staticmethod
+    def new_game(row: Tuple) -> Dict:
+        """The object of a row's game, before its players and rounds are added."""
+        game_id, name, inserted_at, is_ongoing, *settings = row[
+            : 4 + len(GAME_SETTINGS_FIELDS)
+        ]
+
+        return {
+            "id": str(game_id),
+            "name": name,
+            "inserted_at": inserted_at.isoformat(),
+            "is_ongoing": is_ongoing,
+            **dict(zip(GAME_SETTINGS_FIELDS, settings)),
+            "players": [],
+            "rounds": [],
+        }
+
+    def feed(self, row: Tuple) -> List[str]:
+        (
+            game_id,
+            *_,
+            round_number,
+            card_number,
+            trump_suit,
+            player_number,
+            first_name,
+            last_name,
+            game_score,
+            tricks_predicted,
+            tricks_won,
+        ) = row
+
+        lines = []
+
+        if self._current is None or self._current["id"] != str(game_id):
+            lines = self.finish()
+            self._current = self.new_game(row)
+
+        game = self._current
+
+        if round_number == 1:
+            # Every player has a row in every round, so the first round lists them all.
+            game["players"].append(
+                {
+                    "player_number": player_number,
+                    "name": player_name(first_name, last_name),
+                    "score": game_score,
+                }
+            )
+
+        if not game["rounds"] or game["rounds"][-1]["round_number"] != round_number:
+            game["rounds"].append(
+                {
+                    "round_number": round_number,
+                    "card_number": card_number,
+                    "trump_suit": trump_suit,
+                    "players": [],
+                }
+            )
+
+        game["rounds"][-1]["players"].append(
+            {
+                "player_number": player_number,
+                "tricks_predicted": tricks_predicted,
+                "tricks_won": tricks_won,
+                "round_score": self.round_score(row),
+            }
+        )
+
+        return lines
+
+    def finish(self) -> List[str]:
+        if self._current is None:
+            return []
+
+        line = json.dumps(self._current, separators=(",", ":")) + "\n"
+        self._current = None
+
+        return [line]
+
+
+EXPORTERS = {
+    exporter.file_extension: exporter
+    for exporter in (CsvGameExporter, JsonLinesGameExporter)
+}
+
+
+def export_lines(exporter: GameExporter, rows: Iterator[Tuple]) -> Iterator[str]:
+    """Stream the export of the rows.
+
+    Args:
+        exporter (GameExporter): The exporter.
+        rows (Iterator[Tuple]): The rows, from `export_rows`.
+
+    Yields:
+        str: The lines of the export.
+    """
+    yield from exporter.start()
+
+    for row in rows:
+        yield from exporter.feed(row)
+
+    yield from exporter.finish()
+
+
+async def aexport_lines(
+    exporter: GameExporter, rows: Iterator[Tuple]
+) -> AsyncIterator[str]:
+    """Stream the export of the rows, from an async context.
+
+    Args:
+        exporter (GameExporter): The exporter.
+        rows (Iterator[Tuple]): The rows, from `export_rows`.
+
+    Yields:
+        str: The lines of the export.
+    """
+    for line in exporter.start():
+        yield line
+
+    # The rows are read from the database as they are iterated, so each chunk is read
+    # in a thread rather than in the event loop.
+    next_chunk = sync_to_async(lambda: list(islice(rows, EXPORT_CHUNK_SIZE)))
+
+    while chunk := await next_chunk():
+        for row in chunk:
+            for line in exporter.feed(row):
+                yield line
+
+    for line in exporter.finish():
+        yield line
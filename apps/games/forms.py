@@ -1,10 +1,10 @@
 import datetime
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional
 from django import forms
 from django.core.validators import MaxValueValidator, MinValueValidator
 
-from .models import Game, Player
+from .models import GAME_SETTINGS_FIELDS, Game, Player
 
 
 class GameModelForm(forms.ModelForm):
@@ -41,22 +41,27 @@ class GameModelForm(forms.ModelForm):
 
     class Meta:
         model = Game
-        fields = (
-            "name",
-            "starting_round_card_number",
-            "number_of_decks",
-            "correct_prediction_points",
-            "double_last_round_points",
-            "players",
-        )
+        fields = ("name", *GAME_SETTINGS_FIELDS, "players")
         help_texts = {
             "name": "What do you want to name your game?",
-            "starting_round_card_number": "How many cards should be dealt in the first round?",
+            "starting_round_card_number": (
+                "How many cards should be dealt in the first round? If the cards count "
+                "up from one, this is the most dealt in a round."
+            ),
             "number_of_decks": "How many decks of cards are in play?",
             "correct_prediction_points": (
                 "How many points should be awarded for a correct prediction?"
             ),
+            "missed_prediction_points": (
+                "How many points should be taken off for each trick a prediction is "
+                "missed by?"
+            ),
+            "zero_prediction_points": (
+                "How many points should be awarded for correctly predicting no tricks? "
+                "Leave blank to award the correct prediction points."
+            ),
             "double_last_round_points": "Should the final round have doubled points? (Beta)",
+            "card_progression": "How should the number of cards change each round?",
         }
         labels = {
             "name": "Name",
@@ -64,7 +69,10 @@ class GameModelForm(forms.ModelForm):
             "starting_round_card_number": "Starting Card Number",
             "number_of_decks": "Number of Decks",
             "correct_prediction_points": "Correct Prediction Points",
+            "missed_prediction_points": "Missed Prediction Penalty",
+            "zero_prediction_points": "Zero Prediction Points",
             "double_last_round_points": "Double Last Round Points?",
+            "card_progression": "Card Progression",
         }
         widgets = {"double_last_round_points": forms.RadioSelect}
 
@@ -153,6 +161,42 @@ class GameModelForm(forms.ModelForm):
 
         return correct_prediction_points
 
+    def clean_missed_prediction_points(self) -> int:
+        """Validate the missed prediction points field.
+
+        Raises:
+            forms.ValidationError: If the missed prediction points are less than 0.
+
+        Returns:
+            int: The cleaned missed prediction points.
+        """
+        missed_prediction_points = self.cleaned_data["missed_prediction_points"]
+
+        if missed_prediction_points < 0:
+            raise forms.ValidationError(
+                "The missed prediction penalty must be greater than or equal to 0."
+            )
+
+        return missed_prediction_points
+
+    def clean_zero_prediction_points(self) -> Optional[int]:
+        """Validate the zero prediction points field.
+
+        Raises:
+            forms.ValidationError: If the zero prediction points are less than 0.
+
+        Returns:
+            Optional[int]: The cleaned zero prediction points, if given.
+        """
+        zero_prediction_points = self.cleaned_data["zero_prediction_points"]
+
+        if zero_prediction_points is not None and zero_prediction_points < 0:
+            raise forms.ValidationError(
+                "The zero prediction points must be greater than or equal to 0."
+            )
+
+        return zero_prediction_points
+
     def clean(self) -> Dict:
         """Validate the form as a whole.
 
@@ -168,12 +212,17 @@ class GameModelForm(forms.ModelForm):
         cleaned_data = super().clean()
 
         assert cleaned_data is not None
-        starting_round_card_number = cleaned_data["starting_round_card_number"]
-        number_of_decks = cleaned_data["number_of_decks"]
+        starting_round_card_number = cleaned_data.get("starting_round_card_number")
+        number_of_decks = cleaned_data.get("number_of_decks")
 
         players = cleaned_data.get("players")
 
-        if players is not None:
+        # Any field which is missing has already failed validation.
+        if (
+            players is not None
+            and starting_round_card_number is not None
+            and number_of_decks is not None
+        ):
             max_starting_round_card_number = (number_of_decks * 52) // len(players)
 
             if (
@@ -188,6 +237,58 @@ class GameModelForm(forms.ModelForm):
         return cleaned_data
 
 
+def tricks_by_player_number(form: forms.Form) -> Dict[int, int]:
+    """Return the cleaned numbers of tricks of a round form, keyed by player number.
+
+    Args:
+        form (forms.Form): A valid GameRoundPredictionForm or GameRoundScoreForm.
+
+    Returns:
+        Dict[int, int]: The number of tricks of each player.
+    """
+    return {
+        int(field_name.rsplit("_", 1)[1]): tricks
+        for field_name, tricks in form.cleaned_data.items()
+    }
+
+
+class GameImportForm(forms.Form):
+    """Form for uploading games to import."""
+
+    file = forms.FileField(
+        help_text=(
+            "A CSV or JSON Lines (.jsonl) file of games, in the format they are "
+            "exported in."
+        ),
+    )
+
+    def clean_file(self):
+        """Validate the file field.
+
+        Raises:
+            forms.ValidationError: If the file isn't CSV or JSON Lines.
+
+        Returns:
+            UploadedFile: The cleaned file.
+        """
+        file = self.cleaned_data["file"]
+
+        if file_extension(file.name) not in ("csv", "jsonl"):
+            raise forms.ValidationError("The file must be a .csv or .jsonl file.")
+
+        return file
+
+    @property
+    def import_format(self) -> str:
+        """The format of the cleaned file: "csv" or "jsonl"."""
+        return file_extension(self.cleaned_data["file"].name)
+
+
+def file_extension(file_name: str) -> str:
+    """Return the lowercase extension of a file name."""
+    return file_name.rsplit(".", 1)[-1].lower()
+
+
 class GameRoundPredictionForm(forms.Form):
     """Form for predicting the number of tricks each player will win in a round."""
 
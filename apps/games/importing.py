@@ -0,0 +1,765 @@
+"""Import of historic games, with every player's bids and tricks in every round.
+
+Games are read from JSON Lines (one game per line) or CSV (one row per player per
+round), in the formats written by the export (see export.py). Each game is checked with
+the same forms as games created and played in the app. Only if every game is valid
+are they inserted, in batches with `bulk_create()`. The players' scores, statistics
+and ratings and each game's summary are worked out in memory, rather than by replaying
+the rounds through the database.
+
+Players are matched to the user's players by full name, or by first name where that
+is unique. Any other players are created.
+"""
+import csv
+import io
+import json
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import transaction
+from django.forms import Form
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..players.models import Player, unique_display_names
+
+from .forms import GameModelForm, GameRoundPredictionForm, GameRoundScoreForm
+from .models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from .ratings import rate_games
+from .schedule import MAX_TO_ONE_TO_MAX, number_of_rounds, round_schedule
+from .scoring import game_scorer
+from .stats import PlayerStatsChanges
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# The number of games inserted at a time.
+IMPORT_BATCH_SIZE = 500
+
+# The number of errors reported before the rest are left out.
+MAX_REPORTED_ERRORS = 20
+
+
+class GameImportError(Exception):
+    """The games to import couldn't be read, or some of them aren't valid.
+
+    Attributes:
+        messages (List[str]): What is wrong, and with which game.
+    """
+
+    def __init__(self, messages: List[str]) -> None:
+        super().__init__("\n".join(messages))
+        self.messages = messages
+
+
+class ImportedGame:
+    """A valid game to import, as unsaved model instances which refer to each other.
+
+    Attributes:
+        game (Game): The game.
+        game_players (List[GamePlayer]): The game's players, in player number order.
+        game_rounds (List[GameRound]): The game's rounds, in round number order.
+        round_players (List[GamePlayerGameRound]): Every player's row in every round.
+        inserted_at (Optional[datetime]): When the game was played, if known.
+    """
+
+    def __init__(self, game: Game, inserted_at=None) -> None:
+        self.game = game
+        self.game_players: List[GamePlayer] = []
+        self.game_rounds: List[GameRound] = []
+        self.round_players: List[GamePlayerGameRound] = []
+        self.inserted_at = inserted_at
+
+
+def optional_int(value) -> Optional[int]:
+    """Read an optional whole number from a CSV cell or JSON value."""
+    if value is None or value == "":
+        return None
+
+    if isinstance(value, bool) or not str(value).lstrip("-").isdigit():
+        raise ValidationError(f"{value!r} is not a whole number.")
+
+    return int(value)
+
+
+def read_jsonl_games(text: str) -> Iterator[Dict]:
+    """Read games from JSON Lines, in the format of `JsonLinesGameExporter`.
+
+    Args:
+        text (str): The JSON Lines.
+
+    Yields:
+        Dict: Each game, with the line it was read from as its `source`.
+    """
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+
+        try:
+            game_data = json.loads(line)
+        except ValueError as error:
+            raise GameImportError([f"Line {line_number}: {error}"]) from error
+
+        if not isinstance(game_data, dict):
+            raise GameImportError([f"Line {line_number}: expected a JSON object."])
+
+        yield {**game_data, "source": f"Line {line_number}"}
+
+
+def read_csv_games(text: str) -> Iterator[Dict]:
+    """Read games from CSV, in the format of `CsvGameExporter`.
+
+    The rows of each game must be together, and are grouped by their `game_id`, which
+    only has to be unique within the file. The game's settings are read from its first
+    row. If `starting_round_card_number` is left out, it is the first round's card
+    number, so it must be given for games whose card progression starts from one card.
+
+    Args:
+        text (str): The CSV.
+
+    Yields:
+        Dict: Each game, with the line it starts on as its `source`.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    required_columns = {
+        "game_id",
+        "game_name",
+        "round_number",
+        "player_number",
+        "player_name",
+        "tricks_predicted",
+        "tricks_won",
+    }
+    missing_columns = required_columns - set(reader.fieldnames or ())
+
+    if missing_columns:
+        raise GameImportError(
+            [f"The CSV is missing the columns: {', '.join(sorted(missing_columns))}."]
+        )
+
+    # A game's rows are together, so each run of rows with the same game ID is a game.
+    for _, rows in groupby(reader, key=itemgetter("game_id")):
+        # Only the game's first row has been read so far.
+        source = f"Line {reader.line_num}"
+        game_rows = list(rows)
+        first_row = game_rows[0]
+        game_data: Dict = {
+            "id": first_row["game_id"],
+            "source": source,
+            "name": first_row["game_name"],
+            "inserted_at": first_row.get("game_inserted_at") or None,
+            "starting_round_card_number": (
+                first_row.get("starting_round_card_number")
+                or (
+                    first_row.get("card_number")
+                    if first_row["round_number"] == "1"
+                    else None
+                )
+            ),
+            "number_of_decks": first_row.get("number_of_decks") or None,
+            "correct_prediction_points": first_row.get("correct_prediction_points")
+            or None,
+            "missed_prediction_points": first_row.get("missed_prediction_points")
+            or None,
+            "zero_prediction_points": first_row.get("zero_prediction_points") or None,
+            "double_last_round_points": first_row.get("double_last_round_points")
+            or None,
+            "card_progression": first_row.get("card_progression") or None,
+            "players": [],
+            "rounds": [],
+        }
+        rounds: Dict[str, Dict] = {}
+
+        for row in game_rows:
+            if row["round_number"] == "1":
+                game_data["players"].append(
+                    {"player_number": row["player_number"], "name": row["player_name"]}
+                )
+
+            if row["round_number"] not in rounds:
+                rounds[row["round_number"]] = {
+                    "round_number": row["round_number"],
+                    "players": [],
+                }
+                game_data["rounds"].append(rounds[row["round_number"]])
+
+            rounds[row["round_number"]]["players"].append(
+                {
+                    "player_number": row["player_number"],
+                    "tricks_predicted": row["tricks_predicted"],
+                    "tricks_won": row["tricks_won"],
+                }
+            )
+
+        yield game_data
+
+
+def read_games(text: str, import_format: str) -> List[Dict]:
+    """Read games in the given format.
+
+    Args:
+        text (str): The games.
+        import_format (str): "csv" or "jsonl".
+
+    Raises:
+        GameImportError: If the games can't be read.
+
+    Returns:
+        List[Dict]: The games.
+    """
+    if import_format == "csv":
+        return list(read_csv_games(text))
+
+    return list(read_jsonl_games(text))
+
+
+def player_key(name: str) -> str:
+    """The key a player is matched on by name."""
+    return " ".join(name.split()).casefold()
+
+
+def resolve_players(user, names: Iterable[str]) -> Dict[str, Player]:
+    """Find or create the user's player with each name.
+
+    Args:
+        user (auth.User): The user.
+        names (Iterable[str]): The names of the players.
+
+    Returns:
+        Dict[str, Player]: The player with each name, by `player_key`.
+    """
+    players = list(Player.objects.filter(created_by_user=user, is_deleted=False))
+    players_by_key = {player_key(player.full_name()): player for player in players}
+
+    first_name_counts: Dict[str, int] = {}
+
+    for player in players:
+        key = player_key(player.first_name)
+        first_name_counts[key] = first_name_counts.get(key, 0) + 1
+
+    for player in players:
+        key = player_key(player.first_name)
+
+        if first_name_counts[key] == 1:
+            players_by_key.setdefault(key, player)
+
+    new_players = {}
+
+    for name in names:
+        key = player_key(name)
+
+        if key and key not in players_by_key and key not in new_players:
+            first_name, _, last_name = " ".join(name.split()).partition(" ")
+            new_players[key] = Player(
+                first_name=first_name, last_name=last_name, created_by_user=user
+            )
+
+    Player.objects.bulk_create(new_players.values())
+
+    return {**players_by_key, **new_players}
+
+
+def form_error_messages(form, field_prefix: str = "") -> List[str]:
+    """The messages of a form's errors, each prefixed with the field it is about."""
+    return [
+        message
+        if field_name == NON_FIELD_ERRORS
+        else f"{field_prefix}{field_name}: {message}"
+        for field_name, messages in form.errors.items()
+        for message in messages
+    ]
+
+
+def clean_game(
+    user, game_data: Dict, players_by_key: Dict[str, Player]
+) -> ImportedGame:
+    """Check a game to import, and build its model instances.
+
+    Args:
+        user (auth.User): The user importing the game.
+        game_data (Dict): The game, as read by `read_games`.
+        players_by_key (Dict[str, Player]): The user's players, from `resolve_players`.
+
+    Raises:
+        ValidationError: If the game isn't valid.
+
+    Returns:
+        ImportedGame: The game.
+    """
+    player_rows = sorted(
+        (
+            (
+                optional_int(player_row.get("player_number")),
+                player_row.get("name") or "",
+            )
+            for player_row in game_data.get("players") or []
+        ),
+        key=lambda player_row: player_row[0] or 0,
+    )
+
+    if [player_number for player_number, _ in player_rows] != list(
+        range(1, len(player_rows) + 1)
+    ):
+        raise ValidationError("The players must be numbered from 1.")
+
+    players = [
+        player
+        for player in (players_by_key.get(player_key(name)) for _, name in player_rows)
+        if player is not None
+    ]
+
+    if len(players) != len(player_rows):
+        raise ValidationError("Every player must have a name.")
+
+    if len({player.pk for player in players}) != len(players):
+        raise ValidationError("A player can't play in a game more than once.")
+
+    starting_round_card_number = optional_int(
+        game_data.get("starting_round_card_number")
+    )
+    number_of_decks = optional_int(game_data.get("number_of_decks"))
+    correct_prediction_points = optional_int(game_data.get("correct_prediction_points"))
+    missed_prediction_points = optional_int(game_data.get("missed_prediction_points"))
+    double_last_round_points = str(game_data.get("double_last_round_points")) in (
+        "True",
+        "true",
+        "1",
+    )
+
+    game_form = GameModelForm(
+        data={
+            "name": game_data.get("name"),
+            "starting_round_card_number": starting_round_card_number,
+            "number_of_decks": 1 if number_of_decks is None else number_of_decks,
+            "correct_prediction_points": (
+                5 if correct_prediction_points is None else correct_prediction_points
+            ),
+            "missed_prediction_points": (
+                0 if missed_prediction_points is None else missed_prediction_points
+            ),
+            "zero_prediction_points": optional_int(
+                game_data.get("zero_prediction_points")
+            ),
+            "double_last_round_points": double_last_round_points,
+            "card_progression": game_data.get("card_progression") or MAX_TO_ONE_TO_MAX,
+            "players": [player.pk for player in players],
+        },
+        user=user,
+    )
+
+    if starting_round_card_number is None:
+        raise ValidationError("The starting round card number is required.")
+
+    if not game_form.is_valid():
+        raise ValidationError(form_error_messages(game_form))
+
+    imported = ImportedGame(
+        Game(
+            name=game_form.cleaned_data["name"],
+            is_ongoing=True,
+            correct_prediction_points=game_form.cleaned_data[
+                "correct_prediction_points"
+            ],
+            starting_round_card_number=starting_round_card_number,
+            missed_prediction_points=game_form.cleaned_data["missed_prediction_points"],
+            zero_prediction_points=game_form.cleaned_data["zero_prediction_points"],
+            number_of_decks=game_form.cleaned_data["number_of_decks"],
+            double_last_round_points=game_form.cleaned_data["double_last_round_points"],
+            card_progression=game_form.cleaned_data["card_progression"],
+            created_by_user=user,
+        ),
+        inserted_at=clean_inserted_at(game_data.get("inserted_at")),
+    )
+
+    imported.game_players = [
+        GamePlayer(
+            game=imported.game,
+            player=player,
+            player_number=player_number,
+            unique_display_name=unique_display_name,
+        )
+        # The players have been checked to be numbered from 1, in this order.
+        for player_number, (player, unique_display_name) in enumerate(
+            zip(players, unique_display_names(players)), start=1
+        )
+    ]
+
+    clean_rounds(imported, game_data.get("rounds") or [])
+
+    return imported
+
+
+def clean_inserted_at(value):
+    """Read when a game was played, if known."""
+    if not value:
+        return None
+
+    inserted_at = parse_datetime(str(value))
+
+    if inserted_at is None:
+        raise ValidationError(f"{value!r} is not a valid date and time.")
+
+    if timezone.is_naive(inserted_at):
+        inserted_at = timezone.make_aware(inserted_at)
+
+    return inserted_at
+
+
+def read_rounds(
+    player_numbers: List[int], last_round_number: int, rounds_data: List[Dict]
+) -> List[Tuple[int, Dict[int, Optional[int]], Dict[int, Optional[int]]]]:
+    """Read the bids and tricks won of a game to import's rounds.
+
+    Args:
+        player_numbers (List[int]): The game's player numbers, in order.
+        last_round_number (int): The number of the game's last round.
+        rounds_data (List[Dict]): The rounds, as read by `read_games`.
+
+    Raises:
+        ValidationError: If the rounds aren't numbered in order, or not every player
+            played them.
+
+    Returns:
+        List[Tuple[int, Dict[int, Optional[int]], Dict[int, Optional[int]]]]: The
+            number of each round, with every player's bid and tricks won in it, by
+            player number.
+    """
+    rounds: List[Tuple[int, Dict[int, Optional[int]], Dict[int, Optional[int]]]] = []
+
+    for round_data in rounds_data:
+        round_number = optional_int(round_data.get("round_number"))
+        round_rows = {
+            optional_int(row.get("player_number")): row
+            for row in round_data.get("players") or []
+        }
+
+        if round_number != len(rounds) + 1:
+            raise ValidationError("The rounds must be numbered from 1, in order.")
+
+        if round_number > last_round_number:
+            raise ValidationError(f"The game only has {last_round_number} rounds.")
+
+        if sorted(round_rows, key=lambda number: number or 0) != player_numbers:
+            raise ValidationError(f"Round {round_number}: every player must play.")
+
+        rounds.append(
+            (
+                round_number,
+                {
+                    number: optional_int(round_rows[number].get("tricks_predicted"))
+                    for number in player_numbers
+                },
+                {
+                    number: optional_int(round_rows[number].get("tricks_won"))
+                    for number in player_numbers
+                },
+            )
+        )
+
+    return rounds
+
+
+def clean_rounds(imported: ImportedGame, rounds_data: List[Dict]) -> None:
+    """Check the rounds of a game to import, and add them and the scores to the game.
+
+    Every round but the last must have been scored. Unless every round of the game has
+    been scored, the game is left ongoing at the round after the last one scored, with
+    any bids given for it.
+
+    Args:
+        imported (ImportedGame): The game, with its players.
+        rounds_data (List[Dict]): The rounds, as read by `read_games`.
+
+    Raises:
+        ValidationError: If the rounds aren't valid.
+    """
+    game = imported.game
+    game_players = imported.game_players
+    last_round_number = number_of_rounds(
+        game.card_progression, game.starting_round_card_number
+    )
+    rounds = read_rounds(
+        [game_player.player_number for game_player in game_players],
+        last_round_number,
+        rounds_data,
+    )
+
+    # The forms only need the player numbers of the rows they are given.
+    form_round_players = [
+        GamePlayerGameRound(game_player=game_player) for game_player in game_players
+    ]
+    scored_round_count = 0
+
+    for round_number, tricks_predicted, tricks_won in rounds:
+        card_number = round_schedule(game, round_number, len(game_players)).card_number
+        has_bids = any(tricks is not None for tricks in tricks_predicted.values())
+        is_scored = any(tricks is not None for tricks in tricks_won.values())
+
+        if not is_scored and round_number != len(rounds):
+            raise ValidationError(f"Round {round_number}: the tricks won are missing.")
+
+        errors = []
+
+        if has_bids or is_scored:
+            # A round can be scored without bids, which score as missed (see
+            # scoring.py).
+            errors += round_errors(
+                GameRoundPredictionForm,
+                "tricks_predicted",
+                tricks_predicted,
+                form_round_players,
+                card_number,
+                allow_missing=is_scored,
+            )
+
+        if is_scored:
+            errors += round_errors(
+                GameRoundScoreForm,
+                "tricks_won",
+                tricks_won,
+                form_round_players,
+                card_number,
+            )
+            scored_round_count += 1
+
+        if errors:
+            raise ValidationError(
+                [f"Round {round_number}: {error}" for error in errors]
+            )
+
+        add_round(imported, round_number, tricks_predicted, tricks_won)
+
+    if scored_round_count == last_round_number:
+        game.is_ongoing = False
+    elif scored_round_count == len(rounds):
+        # Every round given has been scored, so the game is ready for the next round's
+        # bids, as if the last round had just been played.
+        add_round(imported, len(rounds) + 1, {}, {})
+
+
+def round_errors(
+    form_class: Callable[..., Form],
+    field_prefix: str,
+    tricks: Dict[int, Optional[int]],
+    round_players: List[GamePlayerGameRound],
+    card_number: int,
+    allow_missing: bool = False,
+) -> List[str]:
+    """Check a round's bids or tricks won with the form of the round's page.
+
+    Args:
+        form_class (Callable[..., Form]): The round page's form.
+        field_prefix (str): The prefix of the form's fields, before the player number.
+        tricks (Dict[int, Optional[int]]): Each player's tricks, by player number.
+        round_players (List[GamePlayerGameRound]): Every player's row for the round.
+        card_number (int): The number of cards in the round.
+        allow_missing (bool): Whether some players' tricks may be missing. Only the
+            tricks given are then checked, and their total only if none are missing.
+
+    Returns:
+        List[str]: The errors, if any.
+    """
+    if allow_missing:
+        round_players = [
+            round_player
+            for round_player in round_players
+            if tricks[round_player.game_player.player_number] is not None
+        ]
+
+    form = form_class(
+        data={
+            f"{field_prefix}_{number}": player_tricks
+            for number, player_tricks in tricks.items()
+            if player_tricks is not None
+        },
+        round_players=round_players,
+        card_number=card_number,
+    )
+
+    if form.is_valid():
+        return []
+
+    if len(round_players) < len(tricks):
+        # The form checks the total of every player's tricks.
+        form.errors.pop(NON_FIELD_ERRORS, None)
+
+    return form_error_messages(form)
+
+
+def add_round(
+    imported: ImportedGame,
+    round_number: int,
+    tricks_predicted: Dict[int, Optional[int]],
+    tricks_won: Dict[int, Optional[int]],
+) -> None:
+    """Add a round to a game to import, and its scores to the players' scores."""
+    game = imported.game
+    schedule = round_schedule(game, round_number, len(imported.game_players))
+    game_round = GameRound(
+        game=game,
+        round_number=round_number,
+        trump_suit=schedule.trump_suit,
+        card_number=schedule.card_number,
+    )
+    scorer = game_scorer(game)
+
+    bids = [tricks for tricks in tricks_predicted.values() if tricks is not None]
+
+    if bids and len(bids) == len(tricks_predicted):
+        game_round.total_tricks_predicted = sum(bids)
+
+    imported.game_rounds.append(game_round)
+
+    for game_player in imported.game_players:
+        player_tricks_predicted = tricks_predicted.get(game_player.player_number)
+        player_tricks_won = tricks_won.get(game_player.player_number)
+
+        imported.round_players.append(
+            GamePlayerGameRound(
+                game_round=game_round,
+                game_player=game_player,
+                tricks_predicted=player_tricks_predicted,
+                tricks_won=player_tricks_won,
+            )
+        )
+
+        if player_tricks_won is not None:
+            game_player.score += scorer.round_score(
+                round_number, player_tricks_predicted, player_tricks_won
+            )
+
+
+def save_games(imported_games: List[ImportedGame]) -> None:
+    """Insert a batch of games, with a query or so for each model.
+
+    `bulk_create()` sets the primary keys of the new rows, so each model's foreign keys
+    are taken from the instances inserted before it.
+
+    Args:
+        imported_games (List[ImportedGame]): The games.
+    """
+    Game.objects.bulk_create(imported.game for imported in imported_games)
+
+    # auto_now_add overrides the date a game was played when it is inserted, but
+    # bulk_update() saves the value given.
+    played_games = []
+
+    for imported in imported_games:
+        if imported.inserted_at is not None:
+            imported.game.inserted_at = imported.inserted_at
+            played_games.append(imported.game)
+
+    Game.objects.bulk_update(played_games, ["inserted_at"])
+
+    GamePlayer.objects.bulk_create(
+        game_player
+        for imported in imported_games
+        for game_player in imported.game_players
+    )
+    GameRound.objects.bulk_create(
+        game_round for imported in imported_games for game_round in imported.game_rounds
+    )
+    GamePlayerGameRound.objects.bulk_create(
+        round_player
+        for imported in imported_games
+        for round_player in imported.round_players
+    )
+    GameSummary.objects.bulk_create(
+        GameSummary.build(
+            imported.game, imported.game_players, imported.game_rounds[-1]
+        )
+        for imported in imported_games
+    )
+
+
+@transaction.atomic
+def import_games(
+    user, games_data: List[Dict], batch_size: int = IMPORT_BATCH_SIZE
+) -> List[Game]:
+    """Check and import games for a user.
+
+    Nothing is imported unless every game is valid.
+
+    Args:
+        user (auth.User): The user.
+        games_data (List[Dict]): The games, as read by `read_games`.
+        batch_size (int): The number of games inserted at a time.
+
+    Raises:
+        GameImportError: If any of the games aren't valid.
+
+    Returns:
+        List[Game]: The imported games.
+    """
+    players_by_key = resolve_players(
+        user,
+        (
+            str(player_data.get("name") or "")
+            for game_data in games_data
+            for player_data in game_data.get("players") or []
+            if isinstance(player_data, dict)
+        ),
+    )
+
+    imported_games = []
+    errors: List[str] = []
+
+    for game_number, game_data in enumerate(games_data, start=1):
+        source = game_data.get("source") or f"Game {game_number}"
+
+        try:
+            imported_games.append(clean_game(user, game_data, players_by_key))
+        except (ValidationError, AttributeError, TypeError) as error:
+            messages = (
+                error.messages
+                if isinstance(error, ValidationError)
+                else ["The game isn't in the expected format."]
+            )
+            errors.extend(f"{source}: {message}" for message in messages)
+
+    if errors:
+        raise GameImportError(errors)
+
+    if not imported_games:
+        raise GameImportError(["There are no games to import."])
+
+    for start in range(0, len(imported_games), batch_size):
+        save_games(imported_games[start : start + batch_size])
+
+    stats_changes = PlayerStatsChanges()
+
+    for imported in imported_games:
+        stats_changes.add_game(
+            imported.game,
+            (
+                (
+                    round_player.game_player.player_id,
+                    round_player.game_round.round_number,
+                    round_player.tricks_predicted,
+                    round_player.tricks_won,
+                )
+                for round_player in imported.round_players
+            ),
+        )
+
+    stats_changes.save()
+
+    # The completed games are rated in the order they were played.
+    rate_games(
+        [
+            (
+                user.id,
+                {
+                    game_player.player_id: game_player.score
+                    for game_player in imported.game_players
+                },
+            )
+            for imported in sorted(
+                imported_games, key=lambda imported: imported.game.inserted_at
+            )
+            if not imported.game.is_ongoing
+        ]
+    )
+
+    return [imported.game for imported in imported_games]
@@ -0,0 +1,389 @@
+"""Live scoreboard updates, pushed to the game page over Server-Sent Events.
+
+Whenever a round's bids or scores are saved (see rounds.py), the change is published
+as a scoreboard delta on the game's channel once the transaction commits. Each worker
+runs a `BroadcastHub`, which fans the deltas out to the game pages it is streaming to,
+and a `BroadcastBackend` carries deltas published in any worker to the hub of every
+worker.
+
+Streaming holds a request open for as long as the page is, so it is only offered when
+`LIVE_SCOREBOARD_ENABLED` is set and the app is served through ASGI.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional, Set
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from .models import Game, GamePlayerGameRound, GameRound, GameSummary
+from .scoring import GameScorer
+
+logger = logging.getLogger(__name__)
+
+# How long the browser waits before reconnecting a dropped stream.
+RECONNECT_MILLISECONDS = 3000
+
+# How often a comment is sent on an idle stream, to stop proxies closing it.
+KEEPALIVE_SECONDS = 15
+
+# How long a stream is held open before the browser is made to reconnect. This bounds
+# the life of a stream whose client has gone away without the server noticing.
+MAX_STREAM_SECONDS = 5 * 60
+
+
+class Subscription:
+    """A stream's subscription to a channel, which queues messages on its event loop.
+
+    Messages may be delivered from any thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def put(self, message: str) -> None:
+        """Queue a message for the stream.
+
+        Args:
+            message (str): The message.
+        """
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+        except RuntimeError:
+            # The stream's event loop has closed.
+            pass
+
+    async def get(self, timeout: float) -> Optional[str]:
+        """Wait for the next message.
+
+        Args:
+            timeout (float): The number of seconds to wait.
+
+        Returns:
+            Optional[str]: The message, or None if none arrived in time.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BroadcastBackend:
+    """Carries messages published in any worker to the hub of every worker.
+
+    Attributes:
+        hub (BroadcastHub): The hub of this worker.
+    """
+
+    def __init__(self, broadcast_hub: "BroadcastHub") -> None:
+        self.hub = broadcast_hub
+
+    def publish(self, channel: str, message: str) -> None:
+        """Send a message to the subscribers of a channel in every worker.
+
+        Args:
+            channel (str): The channel.
+            message (str): The message.
+        """
+        raise NotImplementedError
+
+    def listen(self) -> None:
+        """Start delivering messages from other workers to this worker's hub.
+
+        This is called whenever a stream subscribes, so must be cheap once started.
+        """
+
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """Delivers messages to the hub of the publishing worker only.
+
+    This is enough for a single worker, and for tests.
+    """
+
+    def publish(self, channel: str, message: str) -> None:
+        self.hub.deliver(channel, message)
+
+
+class PostgresBroadcastBackend(BroadcastBackend):
+    """Delivers messages to every worker through PostgreSQL's LISTEN and NOTIFY.
+
+    Each worker listens on a connection of its own, in a background thread, and hands
+    the notifications it receives to its hub. Every channel shares one notification
+    channel, so a worker listens once however many games it is streaming.
+    """
+
+    notification_channel = "live_scoreboard"
+
+    def __init__(self, broadcast_hub: "BroadcastHub") -> None:
+        super().__init__(broadcast_hub)
+        self._listener: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: str) -> None:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                [self.notification_channel, json.dumps([channel, message])],
+            )
+
+    def listen(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen_forever, name="live-scoreboard", daemon=True
+                )
+                self._listener.start()
+
+    def _listen_forever(self) -> None:
+        while True:
+            try:
+                self._listen()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Lost the live scoreboard listener's connection")
+                time.sleep(1)
+
+    def _listen(self) -> None:
+        database = connections.create_connection(DEFAULT_DB_ALIAS)
+
+        try:
+            with database.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.notification_channel}")
+
+            raw_connection = database.connection
+
+            while True:
+                readable, _, _ = select.select([raw_connection], [], [], 60)
+
+                if not readable:
+                    continue
+
+                raw_connection.poll()
+
+                while raw_connection.notifies:
+                    notification = raw_connection.notifies.pop(0)
+                    channel, message = json.loads(notification.payload)
+                    self.hub.deliver(channel, message)
+        finally:
+            database.close()
+
+
+class BroadcastHub:
+    """Fans the messages published on each channel out to this worker's subscribers."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @cached_property
+    def backend(self) -> BroadcastBackend:
+        """The backend named by the `LIVE_SCOREBOARD_BACKEND` setting."""
+        return import_string(settings.LIVE_SCOREBOARD_BACKEND)(self)
+
+    def publish(self, channel: str, message: str) -> None:
+        """Send a message to the subscribers of a channel in every worker.
+
+        Args:
+            channel (str): The channel.
+            message (str): The message.
+        """
+        self.backend.publish(channel, message)
+
+    def deliver(self, channel: str, message: str) -> None:
+        """Send a message to the subscribers of a channel in this worker.
+
+        Args:
+            channel (str): The channel.
+            message (str): The message.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    @contextmanager
+    def subscribe(self, channel: str) -> Iterator[Subscription]:
+        """Subscribe to a channel, for the duration of the context.
+
+        This must be called from the event loop the messages will be read on.
+
+        Args:
+            channel (str): The channel.
+
+        Yields:
+            Subscription: The subscription.
+        """
+        self.backend.listen()
+        subscription = Subscription(asyncio.get_running_loop())
+
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions[channel].discard(subscription)
+
+                if not self._subscriptions[channel]:
+                    del self._subscriptions[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        """The number of subscribers to a channel in this worker.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            int: The number of subscribers.
+        """
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+hub = BroadcastHub()
+
+
+def game_channel(game_id) -> str:
+    """The channel a game's scoreboard deltas are published on.
+
+    Args:
+        game_id: The ID of the game.
+
+    Returns:
+        str: The channel.
+    """
+    return f"game:{game_id}"
+
+
+def server_sent_event(data: Dict, event_id: Optional[int] = None) -> str:
+    """Format data as a Server-Sent Event.
+
+    Args:
+        data (Dict): The data, which is sent as JSON.
+        event_id (Optional[int]): The ID of the event, if it has one.
+
+    Returns:
+        str: The event.
+    """
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+
+    return "\n".join(lines) + "\n\n"
+
+
+def publish_on_commit(game: Game, data: Dict) -> None:
+    """Publish data to the game's live subscribers once the transaction commits.
+
+    Args:
+        game (Game): The game.
+        data (Dict): The data, which is sent as JSON.
+    """
+    if not settings.LIVE_SCOREBOARD_ENABLED:
+        return
+
+    event_id = data.get("version")
+
+    transaction.on_commit(
+        partial(hub.publish, game_channel(game.id), server_sent_event(data, event_id))
+    )
+
+
+def round_delta(
+    game: Game,
+    game_round: GameRound,
+    round_players: Iterable[GamePlayerGameRound],
+    scorer: GameScorer,
+    event: str,
+) -> Dict:
+    """The scoreboard delta for a change to a round's bids or scores.
+
+    Args:
+        game (Game): The game, with its updated summary.
+        game_round (GameRound): The round.
+        round_players (Iterable[GamePlayerGameRound]):
+            Every player's updated row for the round, with their game player.
+        scorer (GameScorer): The game's compiled scoring rules.
+        event (str): What changed: "bids" or "scores".
+
+    Returns:
+        Dict: The delta.
+    """
+    return {
+        "event": event,
+        "version": game.summary.version,
+        "is_ongoing": game.is_ongoing,
+        "latest_round_number": game.summary.latest_round_number,
+        "round_number": game_round.round_number,
+        "players": [
+            {
+                "player_number": round_player.game_player.player_number,
+                "tricks_predicted": round_player.tricks_predicted,
+                "tricks_won": round_player.tricks_won,
+                # A round scored without a player's bid scores it as missed.
+                "round_score": (
+                    None
+                    if round_player.tricks_won is None
+                    else scorer.round_score(
+                        game_round.round_number,
+                        round_player.tricks_predicted,
+                        round_player.tricks_won,
+                    )
+                ),
+                "score": round_player.game_player.score,
+            }
+            for round_player in round_players
+        ],
+    }
+
+
+async def scoreboard_events(game_id, last_version: Optional[int]) -> AsyncIterator[str]:
+    """Stream a game's scoreboard deltas as Server-Sent Events.
+
+    Args:
+        game_id: The ID of the game.
+        last_version (Optional[int]):
+            The version of the game the client last saw. If the game has changed since,
+            the client is told its scoreboard is stale rather than sent what it missed.
+
+    Yields:
+        str: The events, and keepalive comments.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + MAX_STREAM_SECONDS
+
+    # Subscribe before checking the version, so no change can fall between the two.
+    with hub.subscribe(game_channel(game_id)) as subscription:
+        yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+
+        version = (
+            await GameSummary.objects.filter(game_id=game_id)
+            .values_list("version", flat=True)
+            .afirst()
+        )
+
+        if version is None:
+            yield server_sent_event({"event": "deleted"})
+            return
+
+        if version != last_version:
+            yield server_sent_event({"event": "stale", "version": version}, version)
+
+        while (remaining := deadline - loop.time()) > 0:
+            message = await subscription.get(min(KEEPALIVE_SECONDS, remaining))
+
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+
+            yield message
@@ -0,0 +1,76 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...archive import ARCHIVE_BATCH_SIZE, archive_games, unarchive_games
+from ...models import Game
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive the rounds of completed games which haven't changed for a while, "
+        "packing them into their games and deleting their round rows. With "
+        "--unarchive, recreate the round rows of every archived game instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Only archive games which haven't changed for this many days "
+            "(default: 30).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="The number of games archived in each transaction "
+            f"(default: {ARCHIVE_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--unarchive",
+            action="store_true",
+            help="Unarchive every archived game.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if batch_size < 1 or options["days"] < 0:
+            raise CommandError(
+                "--batch-size must be at least 1, and --days at least 0."
+            )
+
+        started = time.monotonic()
+
+        if options["unarchive"]:
+            games = Game.objects.filter(archived_rounds__isnull=False)
+            process = unarchive_games
+            verb = "Unarchived"
+        else:
+            games = Game.objects.filter(
+                is_ongoing=False,
+                archived_rounds__isnull=True,
+                summary__updated_at__lt=(
+                    timezone.now() - datetime.timedelta(days=options["days"])
+                ),
+            )
+            process = archive_games
+            verb = "Archived"
+
+        # The IDs are read up front, as the games change as they are processed.
+        game_ids = list(games.order_by("id").values_list("id", flat=True))
+        game_count = sum(
+            process(game_ids[start : start + batch_size])
+            for start in range(0, len(game_ids), batch_size)
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {game_count} of {len(game_ids)} games in "
+                f"{time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,87 @@
+from typing import Dict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+
+from apps.players.models import Player, PlayerRating
+
+from ...models import Game, GamePlayer, GamePlayerGameRound, GameRound
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan of each hot query, to confirm it uses the indexes. The "
+        "queries are run against the first game in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run the queries and report actual timings (Postgres only).",
+        )
+
+    def handle(self, *args, **options):
+        game_round = GameRound.objects.select_related("game").order_by("id").first()
+
+        if game_round is None:
+            raise CommandError("There are no games to run the queries against.")
+
+        explain_options = {}
+
+        if options["analyze"]:
+            if connection.vendor != "postgresql":
+                raise CommandError("--analyze is only supported on Postgres.")
+
+            explain_options["analyze"] = True
+
+        for name, queryset in self.hot_queries(game_round).items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
+
+    def hot_queries(self, game_round: GameRound) -> Dict[str, QuerySet]:
+        """The hot queries, by name, filtered on the given round and its game."""
+        game = game_round.game
+        game_player = GamePlayer.objects.filter(game=game).first()
+
+        return {
+            "Game list (ongoing games)": Game.objects.filter(
+                created_by_user_id=game.created_by_user_id, is_ongoing=True
+            ).order_by("inserted_at", "id"),
+            "Game list (page of completed games)": Game.objects.filter(
+                created_by_user_id=game.created_by_user_id,
+                is_ongoing=False,
+                inserted_at__lt=game.inserted_at,
+            ).order_by("-inserted_at", "-id")[:21],
+            "Game players by number": GamePlayer.objects.filter(game=game).order_by(
+                "player_number"
+            ),
+            "Game round by number": GameRound.objects.filter(
+                game=game, round_number=game_round.round_number
+            ),
+            "Latest game round": GameRound.objects.filter(game=game).order_by(
+                "-round_number"
+            )[:1],
+            "Round players": GamePlayerGameRound.objects.select_related("game_player")
+            .filter(game_round=game_round)
+            .order_by("game_player__player_number"),
+            "Round player by game player": GamePlayerGameRound.objects.filter(
+                game_round=game_round, game_player=game_player
+            ),
+            "Game round table": GamePlayerGameRound.objects.filter(
+                game_round__game=game
+            ).order_by("game_round__round_number", "game_player__player_number"),
+            "Player list": Player.objects.filter(
+                created_by_user_id=game.created_by_user_id
+            )
+            .exclude(is_deleted=True)
+            .select_related("stats"),
+            "Player leaderboard": PlayerRating.objects.filter(
+                created_by_user_id=game.created_by_user_id
+            )
+            .exclude(player__is_deleted=True)
+            .select_related("player")
+            .order_by("-rating"),
+        }
@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import User
+
+from ...importing import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    MAX_REPORTED_ERRORS,
+    GameImportError,
+    import_games,
+    read_games,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import games for a user from a CSV or JSON Lines file, in the format they are "
+        "exported in. Nothing is imported unless every game is valid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file of games to import.")
+        parser.add_argument(
+            "--user", required=True, help="The email address of the user to import for."
+        )
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="The format of the file (default: from its extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help=f"The number of games inserted at a time (default: {IMPORT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        import_format = options["format"] or path.suffix.lstrip(".").lower()
+
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError("Give the file's format with --format.")
+
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        try:
+            user = User.objects.get(email=options["user"])
+        except User.DoesNotExist as error:
+            raise CommandError(f"There is no user {options['user']}.") from error
+
+        try:
+            text = path.read_text(encoding="utf-8-sig")
+        except (OSError, UnicodeDecodeError) as error:
+            raise CommandError(f"Couldn't read {path}: {error}") from error
+
+        started = time.monotonic()
+
+        try:
+            games = import_games(
+                user, read_games(text, import_format), options["batch_size"]
+            )
+        except GameImportError as error:
+            for message in error.messages[:MAX_REPORTED_ERRORS]:
+                self.stderr.write(message)
+
+            raise CommandError(
+                f"Nothing was imported, as {len(error.messages)} errors were found."
+            ) from error
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(games)} games in {time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.players.models import PlayerStats
+
+from ...stats import STATS_BATCH_SIZE, rebuild_player_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every player's statistics from scratch, from the rounds of their "
+        "games. The statistics are otherwise kept up to date as games are played."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=STATS_BATCH_SIZE,
+            help=f"The number of games read at a time (default: {STATS_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        started = time.monotonic()
+        game_count = rebuild_player_stats(options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt the statistics of {PlayerStats.objects.count()} players from "
+                f"{game_count} games in {time.monotonic() - started:.1f}s."
+            )
+        )
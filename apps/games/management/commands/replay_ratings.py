@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.players.models import PlayerRating
+
+from ...ratings import replay_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every player's rating from scratch, by rating every completed game "
+        "in the order they were started. Ratings are otherwise updated as games are "
+        "completed, so this picks up edits to completed games and deleted games."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        game_count = replay_ratings()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rated {PlayerRating.objects.count()} players from {game_count} "
+                f"completed games in {time.monotonic() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,297 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple, cast
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from ...live import publish_on_commit
+from ...archive import archived_scored_rows
+from ...models import Game, GamePlayer, GamePlayerGameRound, GameSummary
+from ...rounds import RoundConflict, claim_next_version
+from ...scoring import SCORING_FIELDS, replay_scores
+from ...stats import rebuild_player_stats
+
+# The number of rows fetched from the database at a time while streaming.
+ROW_CHUNK_SIZE = 2000
+
+
+class ScoreDrift(NamedTuple):
+    """A game player whose saved score differs from the replay of their rounds."""
+
+    game_id: object
+    game_player_id: object
+    player_name: str
+    saved_score: int
+    replayed_score: int
+
+
+def game_id_batches(batch_size: int) -> Iterator[List]:
+    """Stream the IDs of every game, in batches.
+
+    Args:
+        batch_size (int): The number of games in each batch.
+
+    Yields:
+        List: The IDs of the next batch of games.
+    """
+    batch: List = []
+
+    for game_id in (
+        Game.objects.order_by("id")
+        .values_list("id", flat=True)
+        .iterator(chunk_size=ROW_CHUNK_SIZE)
+    ):
+        batch.append(game_id)
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def audit_games(game_ids: List) -> Tuple[int, List[ScoreDrift]]:
+    """Replay the scores of a batch of games, and compare them with the saved scores.
+
+    This is run in the worker processes, so only reads from the database.
+
+    Args:
+        game_ids (List): The IDs of the games.
+
+    Returns:
+        Tuple[int, List[ScoreDrift]]:
+            The number of scored round rows replayed, and every game player whose saved
+            score differs from their replayed score.
+    """
+    games = {
+        game.id: game
+        for game in Game.objects.filter(id__in=game_ids).only(*SCORING_FIELDS)
+    }
+
+    # Only the scored rows are read, so each has its tricks won.
+    round_rows = cast(
+        List[Tuple[Any, Any, int, Optional[int], int]],
+        list(
+            GamePlayerGameRound.objects.filter(
+                game_round__game_id__in=game_ids, tricks_won__isnull=False
+            )
+            .values_list(
+                "game_round__game_id",
+                "game_player_id",
+                "game_round__round_number",
+                "tricks_predicted",
+                "tricks_won",
+            )
+            .iterator(chunk_size=ROW_CHUNK_SIZE)
+        ),
+    )
+    round_rows.extend(
+        (game_id, game_player_id, round_number, tricks_predicted, tricks_won)
+        for (
+            game_id,
+            game_player_id,
+            _,
+            round_number,
+            tricks_predicted,
+            tricks_won,
+        ) in archived_scored_rows(game_ids)
+    )
+    replayed_scores = replay_scores(games, round_rows)
+
+    drifts = []
+
+    for game_id, game_player_id, player_name, saved_score in (
+        GamePlayer.objects.filter(game_id__in=game_ids)
+        .order_by("game_id", "player_number")
+        .values_list("game_id", "id", "unique_display_name", "score")
+        .iterator(chunk_size=ROW_CHUNK_SIZE)
+    ):
+        replayed_score = replayed_scores.get(game_player_id, 0)
+
+        if saved_score != replayed_score:
+            drifts.append(
+                ScoreDrift(
+                    game_id, game_player_id, player_name, saved_score, replayed_score
+                )
+            )
+
+    return len(round_rows), drifts
+
+
+@transaction.atomic
+def repair_drifts(drifts: List[ScoreDrift]) -> List[ScoreDrift]:
+    """Save the replayed scores of the drifted game players, and update their games.
+
+    A round may have been saved since the games were audited, so their summaries are
+    locked, and the games audited again, before anything is written. Each game's change
+    then claims its next version, as a round submission does, so that a submission
+    read before the repair gets a conflict rather than overwriting it. Each game's
+    summary is updated, which also retires its cached scoreboard, and its live
+    subscribers are told to reload.
+
+    Args:
+        drifts (List[ScoreDrift]): The drifted game players, from `audit_games`.
+
+    Raises:
+        RoundConflict: If one of the games changed while it was locked.
+
+    Returns:
+        List[ScoreDrift]: The drifted game players, as audited with the games locked.
+    """
+    games = list(
+        Game.objects.select_for_update()
+        .select_related("summary")
+        .filter(id__in={drift.game_id for drift in drifts})
+        .order_by("pk")
+    )
+    _, locked_drifts = audit_games([game.id for game in games])
+    drifted_game_ids = {drift.game_id for drift in locked_drifts}
+    drifted_games = [game for game in games if game.id in drifted_game_ids]
+
+    for game in drifted_games:
+        claim_next_version(game)
+
+    updated_at = timezone.now()
+
+    # bulk_update() skips auto_now, so updated_at is set explicitly.
+    GamePlayer.objects.bulk_update(
+        [
+            GamePlayer(
+                id=drift.game_player_id,
+                score=drift.replayed_score,
+                updated_at=updated_at,
+            )
+            for drift in locked_drifts
+        ],
+        ["score", "updated_at"],
+        batch_size=ROW_CHUNK_SIZE,
+    )
+
+    for game in drifted_games:
+        GameSummary.update_for_game(game, version_claimed=True)
+        publish_on_commit(game, {"event": "stale", "version": game.summary.version})
+
+    return locked_drifts
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the score of every game player from their rounds, and report (or with "
+        "--fix, repair) any which differ from the saved scores. Games are processed in "
+        "batches, streamed from the database, optionally across several processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Save the replayed scores of any game players which differ.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of games replayed at a time (default: 500).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="The number of processes to replay the games in (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        workers = options["workers"]
+
+        if batch_size < 1 or workers < 1:
+            raise CommandError("--batch-size and --workers must be at least 1.")
+
+        if (
+            workers > 1
+            and connection.vendor == "sqlite"
+            and connection.is_in_memory_db()
+        ):
+            raise CommandError("An in-memory database can't be shared with --workers.")
+
+        started = time.monotonic()
+        game_count = 0
+        round_row_count = 0
+        drifts: List[ScoreDrift] = []
+
+        for game_ids, (batch_round_row_count, batch_drifts) in self.audit_batches(
+            batch_size, workers
+        ):
+            game_count += len(game_ids)
+            round_row_count += batch_round_row_count
+            drifts.extend(batch_drifts)
+
+            for drift in batch_drifts:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{drift.game_id} {drift.player_name}: saved score "
+                        f"{drift.saved_score}, replayed score {drift.replayed_score}"
+                    )
+                )
+
+            if options["fix"] and batch_drifts:
+                try:
+                    repair_drifts(batch_drifts)
+                except RoundConflict:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            "A game changed while its scores were repaired, so none "
+                            "of its batch were. Run the command again."
+                        )
+                    )
+
+        drifted_game_count = len({drift.game_id for drift in drifts})
+        summary = (
+            f"Replayed {round_row_count} scored rounds of {game_count} games in "
+            f"{time.monotonic() - started:.1f}s: {len(drifts)} scores differed, in "
+            f"{drifted_game_count} games"
+        )
+
+        if drifts and options["fix"]:
+            # A game's result may have been counted in its players' statistics with
+            # the drifted scores, so they are rebuilt from the rounds.
+            rebuild_player_stats(batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{summary}, and were repaired. The players' statistics were "
+                    "rebuilt."
+                )
+            )
+        elif drifts:
+            self.stdout.write(
+                self.style.ERROR(f"{summary}. Run with --fix to repair them.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{summary}."))
+
+    def audit_batches(
+        self, batch_size: int, workers: int
+    ) -> Iterator[Tuple[List, Tuple[int, List[ScoreDrift]]]]:
+        """Audit the games in batches, in this process or a pool of workers.
+
+        Yields:
+            Tuple[List, Tuple[int, List[ScoreDrift]]]:
+                The IDs of each batch of games, and the result of auditing it.
+        """
+        if workers == 1:
+            for game_ids in game_id_batches(batch_size):
+                yield game_ids, audit_games(game_ids)
+
+            return
+
+        batches = list(game_id_batches(batch_size))
+
+        # The workers open connections of their own, and mustn't share this process's.
+        connections.close_all()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            yield from zip(batches, pool.map(audit_games, batches))
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.3 on 2026-10-17 18:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_game_summaries(apps, schema_editor):
+    """Create a summary for every existing game."""
+    Game = apps.get_model("games", "Game")
+    GamePlayer = apps.get_model("games", "GamePlayer")
+    GameRound = apps.get_model("games", "GameRound")
+    GameSummary = apps.get_model("games", "GameSummary")
+
+    for game in Game.objects.iterator():
+        game_players = list(
+            GamePlayer.objects.filter(game=game).order_by("player_number")
+        )
+        latest_game_round = (
+            GameRound.objects.filter(game=game).order_by("round_number").last()
+        )
+
+        if not game_players or latest_game_round is None:
+            continue
+
+        max_score = max(game_player.score for game_player in game_players)
+
+        GameSummary.objects.create(
+            game=game,
+            leaders=", ".join(
+                game_player.unique_display_name
+                for game_player in game_players
+                if game_player.score == max_score
+            ),
+            player_names=", ".join(
+                game_player.unique_display_name for game_player in game_players
+            ),
+            latest_round_number=latest_game_round.round_number,
+            latest_round_card_number=latest_game_round.card_number,
+            latest_round_total_tricks_predicted=(
+                latest_game_round.total_tricks_predicted
+            ),
+            trump_suit=latest_game_round.trump_suit,
+            dealer_player_number=(
+                latest_game_round.round_number % len(game_players) + 1
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0005_alter_game_double_last_round_points"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameSummary",
+            fields=[
+                (
+                    "game",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="games.game",
+                    ),
+                ),
+                ("leaders", models.TextField()),
+                ("player_names", models.TextField()),
+                ("latest_round_number", models.IntegerField()),
+                ("latest_round_card_number", models.IntegerField()),
+                ("latest_round_total_tricks_predicted", models.IntegerField(null=True)),
+                ("trump_suit", models.CharField(max_length=1)),
+                ("dealer_player_number", models.IntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_game_summaries, migrations.RunPython.noop),
+    ]
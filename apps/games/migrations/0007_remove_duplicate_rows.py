@@ -0,0 +1,107 @@
+from django.db import migrations
+from django.db.models import Count, Q
+
+
+class DuplicateRowsError(Exception):
+    """Raised when duplicate rows can't be removed without losing a game's data."""
+
+
+def duplicated(queryset, *fields):
+    """The values of `fields` which more than one row of the queryset shares."""
+    return (
+        queryset.values(*fields)
+        .annotate(row_count=Count("pk"))
+        .filter(row_count__gt=1)
+        .values_list(*fields)
+    )
+
+
+def remove_duplicate_rows(apps, schema_editor):
+    """Remove the duplicate rows which 0008_hot_path_indexes's unique constraints forbid.
+
+    Before those constraints, submitting a round twice at once could save the next
+    round, or a player's row of a round, twice. A duplicate is only removed when that
+    loses nothing: a round which nobody has bid in or scored, or a copy of a player's
+    row of a round. Anything else needs to be resolved by hand, so the migration stops
+    and lists it.
+    """
+    GamePlayer = apps.get_model("games", "GamePlayer")
+    GameRound = apps.get_model("games", "GameRound")
+    GamePlayerGameRound = apps.get_model("games", "GamePlayerGameRound")
+
+    problems = []
+
+    for game_id, player_number in duplicated(
+        GamePlayer.objects, "game_id", "player_number"
+    ):
+        problems.append(f"game {game_id} has more than one player {player_number}")
+
+    for game_id, round_number in duplicated(
+        GameRound.objects, "game_id", "round_number"
+    ):
+        game_rounds = list(
+            GameRound.objects.filter(game_id=game_id, round_number=round_number)
+            .annotate(
+                played_count=Count(
+                    "gameplayergameround",
+                    filter=Q(gameplayergameround__tricks_predicted__isnull=False)
+                    | Q(gameplayergameround__tricks_won__isnull=False),
+                )
+            )
+            .order_by("-played_count", "pk")
+        )
+
+        # The round with the most bids and scores is kept.
+        if any(game_round.played_count for game_round in game_rounds[1:]):
+            problems.append(
+                f"game {game_id} has more than one round {round_number} with bids or "
+                "scores"
+            )
+            continue
+
+        unplayed = [game_round.pk for game_round in game_rounds[1:]]
+
+        GamePlayerGameRound.objects.filter(game_round_id__in=unplayed).delete()
+        GameRound.objects.filter(pk__in=unplayed).delete()
+
+    for game_round_id, game_player_id in duplicated(
+        GamePlayerGameRound.objects, "game_round_id", "game_player_id"
+    ):
+        round_players = list(
+            GamePlayerGameRound.objects.filter(
+                game_round_id=game_round_id, game_player_id=game_player_id
+            ).order_by("pk")
+        )
+
+        if any(
+            (round_player.tricks_predicted, round_player.tricks_won)
+            != (round_players[0].tricks_predicted, round_players[0].tricks_won)
+            for round_player in round_players
+        ):
+            problems.append(
+                f"game player {game_player_id} has differing rows for round "
+                f"{game_round_id}"
+            )
+            continue
+
+        GamePlayerGameRound.objects.filter(
+            pk__in=[round_player.pk for round_player in round_players[1:]]
+        ).delete()
+
+    if problems:
+        raise DuplicateRowsError(
+            "These duplicate rows must be removed before the games' unique constraints "
+            "can be added: " + "; ".join(problems) + "."
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0006_gamesummary"),
+    ]
+
+    # Kept apart from the constraints, so that the rows are deleted in an earlier
+    # transaction than the one which alters their tables.
+    operations = [
+        migrations.RunPython(remove_duplicate_rows, migrations.RunPython.noop),
+    ]
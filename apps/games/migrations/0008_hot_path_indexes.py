@@ -0,0 +1,77 @@
+# Generated by Django 4.2.3 on 2026-10-17 19:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("games", "0007_remove_duplicate_rows"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="game",
+            name="created_by_user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gameplayer",
+            name="game",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="games.game",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gameplayergameround",
+            name="game_round",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="games.gameround",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gameround",
+            name="game",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="games.game",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["created_by_user", "is_ongoing", "inserted_at", "id"],
+                name="game_user_ongoing_inserted_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="gameplayer",
+            constraint=models.UniqueConstraint(
+                fields=("game", "player_number"), name="unique_game_player_number"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="gameplayergameround",
+            constraint=models.UniqueConstraint(
+                fields=("game_round", "game_player"),
+                name="unique_game_round_game_player",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="gameround",
+            constraint=models.UniqueConstraint(
+                fields=("game", "round_number"), name="unique_game_round_number"
+            ),
+        ),
+    ]
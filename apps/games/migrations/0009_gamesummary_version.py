@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-17 19:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0008_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gamesummary",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
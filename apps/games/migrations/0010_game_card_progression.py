@@ -0,0 +1,32 @@
+# Generated by Django 4.2.3 on 2026-10-17 20:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0009_gamesummary_version"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="game",
+            name="card_number_descending",
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="card_progression",
+            field=models.CharField(
+                choices=[
+                    ("max_1_max", "Down to one card and back up (e.g. 7..1..7)"),
+                    ("1_max_1", "Up from one card and back down (e.g. 1..7..1)"),
+                    (
+                        "max_1_1_max",
+                        "Down to one card twice and back up (e.g. 7..1, 1..7)",
+                    ),
+                ],
+                default="max_1_max",
+                max_length=16,
+            ),
+        ),
+    ]
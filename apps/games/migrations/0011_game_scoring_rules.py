@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-17 20:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0010_game_card_progression"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="missed_prediction_points",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="zero_prediction_points",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
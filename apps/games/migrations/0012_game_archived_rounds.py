@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-17 20:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0011_game_scoring_rules"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="archived_rounds",
+            field=models.BinaryField(null=True),
+        ),
+    ]
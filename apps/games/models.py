@@ -1,9 +1,25 @@
+from typing import Any, List, Optional
 from django.db import models
+from django.db.models import F
 from django.conf import settings
 
 from hashid_field import BigHashidAutoField  # type: ignore
 
 from ..players.models import Player
+from .schedule import CARD_PROGRESSIONS, MAX_TO_ONE_TO_MAX, dealer_player_number
+
+
+# The settings a game is created with, in the order that the game form and the export
+# list them.
+GAME_SETTINGS_FIELDS = (
+    "starting_round_card_number",
+    "number_of_decks",
+    "correct_prediction_points",
+    "missed_prediction_points",
+    "zero_prediction_points",
+    "double_last_round_points",
+    "card_progression",
+)
 
 
 class Game(models.Model):
@@ -15,12 +31,21 @@ class Game(models.Model):
         correct_prediction_points (int):
             The number of points awarded for a correct prediction of the number of tricks
             a player will win.
+        missed_prediction_points (int):
+            The number of points taken off for each trick a prediction is missed by.
+        zero_prediction_points (int):
+            The number of points awarded for a correct prediction of no tricks, if
+            different from correct_prediction_points.
         starting_round_card_number (int):
-            The number of cards dealt to each player in the first round.
-        card_number_descending (bool):
-            Whether the number of cards dealt to each player should decrease by one in
-            the next round.
+            The most cards dealt to each player in a round, which are dealt in the
+            first round unless the card progression starts from one card.
+        card_progression (str):
+            How the number of cards dealt changes from round to round (see
+            schedule.py).
         number_of_decks (int): The number of decks of cards in play.
+        archived_rounds (bytes):
+            The packed bids and tricks won of a completed game whose rounds have been
+            archived (see archive.py), or None.
         created_by_user (auth.User): The user who created this game.
         players (list of Player): The players in this game.
         inserted_at (datetime): The datetime when this game was created.
@@ -31,21 +56,38 @@ class Game(models.Model):
     name = models.CharField(max_length=255)
     is_ongoing = models.BooleanField(default=True)
     correct_prediction_points = models.IntegerField(default=5)
+    missed_prediction_points = models.IntegerField(default=0)
+    zero_prediction_points = models.IntegerField(null=True, blank=True)
     starting_round_card_number = models.IntegerField()
-    card_number_descending = models.BooleanField(default=True)
+    card_progression = models.CharField(
+        max_length=16, choices=CARD_PROGRESSIONS, default=MAX_TO_ONE_TO_MAX
+    )
     number_of_decks = models.IntegerField(default=1)
     double_last_round_points = models.BooleanField(
         default=False, choices=((True, "Yes"), (False, "No"))
     )
+    archived_rounds = models.BinaryField(null=True, editable=False)
 
+    # The foreign keys covered by the leading column of a composite index or unique
+    # constraint in Meta don't get an index of their own.
     created_by_user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False
     )
     players = models.ManyToManyField(Player, through="GamePlayer")
 
     inserted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves the game list, which pages through a user's games by
+            # (inserted_at, id).
+            models.Index(
+                fields=["created_by_user", "is_ongoing", "inserted_at", "id"],
+                name="game_user_ongoing_inserted_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
@@ -58,7 +100,7 @@ class Game(models.Model):
         Returns:
             bool: Whether the given user can see this game.
         """
-        return self.created_by_user == user or user.is_superuser
+        return self.created_by_user_id == user.id or user.is_superuser
 
 
 class GamePlayer(models.Model):
@@ -77,8 +119,11 @@ class GamePlayer(models.Model):
     """
 
     id = BigHashidAutoField(primary_key=True, prefix="gpl_")
-    game = models.ForeignKey(Game, on_delete=models.CASCADE)
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_index=False)
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
+    # The mypy plugin can't derive the types of foreign keys to hashid primary keys.
+    game_id: Any
+    player_id: Any
     player_number = models.IntegerField()
     score = models.IntegerField(default=0)
     unique_display_name = models.CharField(max_length=255)
@@ -88,6 +133,11 @@ class GamePlayer(models.Model):
 
     class Meta:
         ordering = ["player_number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "player_number"], name="unique_game_player_number"
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.game.id) + " - " + str(self.player.id)
@@ -119,7 +169,7 @@ class GameRound(models.Model):
     """
 
     id = BigHashidAutoField(primary_key=True, prefix="rou_")
-    game = models.ForeignKey(Game, on_delete=models.CASCADE)
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, db_index=False)
     round_number = models.IntegerField()
     trump_suit = models.CharField(
         max_length=1,
@@ -139,6 +189,13 @@ class GameRound(models.Model):
     inserted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "round_number"], name="unique_game_round_number"
+            ),
+        ]
+
     def visible_to(self, user) -> bool:
         """Whether the given user can see this game round.
 
@@ -171,7 +228,7 @@ class GamePlayerGameRound(models.Model):
     """
 
     id = BigHashidAutoField(primary_key=True, prefix="rgp_")
-    game_round = models.ForeignKey(GameRound, on_delete=models.CASCADE)
+    game_round = models.ForeignKey(GameRound, on_delete=models.CASCADE, db_index=False)
     game_player = models.ForeignKey(GamePlayer, on_delete=models.CASCADE)
     tricks_predicted = models.IntegerField(null=True)
     tricks_won = models.IntegerField(null=True)
@@ -179,6 +236,14 @@ class GamePlayerGameRound(models.Model):
     inserted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game_round", "game_player"],
+                name="unique_game_round_game_player",
+            ),
+        ]
+
     def __str__(self) -> str:
         return str(self.game_round.id) + " - " + str(self.game_player.id)
 
@@ -192,3 +257,167 @@ class GamePlayerGameRound(models.Model):
             bool: Whether the given user can see this game player game round.
         """
         return self.game_round.game.visible_to(user)
+
+
+class GameSummary(models.Model):
+    """A denormalised summary of the current state of a game.
+
+    This holds everything shown in the header of the game pages, so it can be read
+    with the game rather than recomputed from the players and rounds on every request.
+    It is updated by `GameSummary.update_for_game` whenever a game is created or its
+    bids or scores change.
+
+    Attributes:
+        game (Game): The game.
+        leaders (str): The display names of the players with the highest score.
+        player_names (str): The display names of all players, in player number order.
+        latest_round_number (int): The number of the latest round in the game.
+        latest_round_card_number (int):
+            The number of cards dealt to each player in the latest round.
+        latest_round_total_tricks_predicted (int):
+            The total number of tricks predicted in the latest round, if bids have
+            been placed.
+        trump_suit (str): The trump suit of the latest round.
+        dealer_player_number (int): The player number of the dealer of the latest round.
+        version (int):
+            Incremented every time the summary is updated, i.e. every time the game's
+            bids or scores change. Caches of the game's data are keyed on it, and
+            submissions of a round claim the next version before they change anything
+            (see `claim_next_version`).
+        updated_at (datetime): The datetime when this summary was last updated.
+    """
+
+    game = models.OneToOneField(
+        Game, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    # A game has up to 20 players, each with a display name of up to 255 characters.
+    leaders = models.TextField()
+    player_names = models.TextField()
+    latest_round_number = models.IntegerField()
+    latest_round_card_number = models.IntegerField()
+    latest_round_total_tricks_predicted = models.IntegerField(null=True)
+    trump_suit = models.CharField(max_length=1)
+    dealer_player_number = models.IntegerField()
+    version = models.PositiveIntegerField(default=1)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return str(self.game.id)
+
+    @classmethod
+    def claim_next_version(cls, game: Game) -> bool:
+        """Move a game's summary on to its next version, unless it has changed since.
+
+        This compares and swaps the version read with the game's summary, so of any
+        changes made from the same version of a game only the first can claim the next
+        one. It should be the first write in the transaction of the change, as it holds
+        the summary's row until the transaction ends.
+
+        Args:
+            game (Game): The game, with its summary as read before the change.
+
+        Returns:
+            bool: Whether the version was claimed. If not, the game has changed since
+                its summary was read, and the change should be abandoned.
+        """
+        claimed = cls.objects.filter(
+            game_id=game.id, version=game.summary.version
+        ).update(version=F("version") + 1)
+
+        if claimed:
+            game.summary.version += 1
+
+        return bool(claimed)
+
+    @classmethod
+    def update_for_game(
+        cls, game: Game, version_claimed: bool = False
+    ) -> "GameSummary":
+        """Recompute and save the summary of the given game.
+
+        This should be called in the same transaction as any change to the game's
+        rounds or scores.
+
+        Args:
+            game (Game): The game to summarise.
+            version_claimed (bool): Whether the change has already claimed the summary's
+                next version with `claim_next_version`.
+
+        Returns:
+            GameSummary: The updated summary.
+        """
+        game_players = list(
+            GamePlayer.objects.filter(game=game).order_by("player_number")
+        )
+        latest_game_round: Optional[GameRound]
+
+        if game.archived_rounds is not None:
+            # An archived game's rounds can't have changed, so its latest round is the
+            # one already in its summary.
+            latest_game_round = GameRound(
+                game=game,
+                round_number=game.summary.latest_round_number,
+                card_number=game.summary.latest_round_card_number,
+                total_tricks_predicted=game.summary.latest_round_total_tricks_predicted,
+                trump_suit=game.summary.trump_suit,
+            )
+        else:
+            latest_game_round = (
+                GameRound.objects.filter(game=game).order_by("round_number").last()
+            )
+        assert latest_game_round is not None
+
+        try:
+            version = game.summary.version + (0 if version_claimed else 1)
+        except cls.DoesNotExist:
+            version = 1
+
+        summary = cls.build(game, game_players, latest_game_round, version)
+        summary.save()
+        game.summary = summary
+
+        return summary
+
+    @classmethod
+    def build(
+        cls,
+        game: Game,
+        game_players: List[GamePlayer],
+        latest_game_round: GameRound,
+        version: int = 1,
+    ) -> "GameSummary":
+        """Build the summary of a game from its players and latest round, without saving.
+
+        Args:
+            game (Game): The game to summarise.
+            game_players (List[GamePlayer]): The game's players, in player number order.
+            latest_game_round (GameRound): The game's latest round.
+            version (int): The version of the summary.
+
+        Returns:
+            GameSummary: The unsaved summary.
+        """
+        max_score = max(game_player.score for game_player in game_players)
+
+        return cls(
+            game=game,
+            version=version,
+            leaders=", ".join(
+                game_player.unique_display_name
+                for game_player in game_players
+                if game_player.score == max_score
+            ),
+            player_names=", ".join(
+                game_player.unique_display_name for game_player in game_players
+            ),
+            latest_round_number=latest_game_round.round_number,
+            latest_round_card_number=latest_game_round.card_number,
+            latest_round_total_tricks_predicted=(
+                latest_game_round.total_tricks_predicted
+            ),
+            trump_suit=latest_game_round.trump_suit,
+            dealer_player_number=dealer_player_number(
+                latest_game_round.round_number, len(game_players)
+            ),
+        )
@@ -0,0 +1,210 @@
+"""Skill ratings of players, from the results of their completed games.
+
+This is a multiplayer take on Elo. Each player in a game is rated against the field:
+their result is the share of the other players they finished above (counting ties as
+half), and their expected result comes from the gap between their rating and the
+average rating of the others. A player's rating moves by `RATING_K_FACTOR` times the
+difference. Ranking the players is the only step which isn't a single pass, so a game
+costs O(players) work, where a pairwise Elo would cost O(players²).
+
+Ratings are updated as each game is completed, and imported games are rated in the
+order they were played, after every game already rated. So the ratings are only
+approximate after a completed game is edited or deleted, which they aren't corrected
+for, or after importing games played before games already rated. In each case, they
+are put right by replaying them with the `replay_ratings` command, which rates every
+completed game in the order they were started.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..players.models import PlayerRating
+from .models import GamePlayer
+
+INITIAL_RATING = 1500.0
+RATING_K_FACTOR = 32
+
+# The number of rows read from, or written to, the database at a time.
+RATING_CHUNK_SIZE = 2000
+
+
+def rating_changes(ratings: Sequence[float], scores: Sequence[int]) -> List[float]:
+    """The change in each player's rating from the result of a game.
+
+    Args:
+        ratings (Sequence[float]): The rating of each player before the game.
+        scores (Sequence[int]): The final score of each player, in the same order.
+
+    Returns:
+        List[float]: The change in each player's rating, in the same order.
+    """
+    number_of_opponents = len(ratings) - 1
+
+    if number_of_opponents < 1:
+        return [0.0] * len(ratings)
+
+    total_rating = sum(ratings)
+    sorted_scores = sorted(scores)
+    changes = []
+
+    for rating, score in zip(ratings, scores):
+        beaten = bisect_left(sorted_scores, score)
+        tied = bisect_right(sorted_scores, score) - beaten - 1
+        actual = (beaten + tied / 2) / number_of_opponents
+
+        field_rating = (total_rating - rating) / number_of_opponents
+        expected = 1 / (1 + 10 ** ((field_rating - rating) / 400))
+
+        changes.append(RATING_K_FACTOR * (actual - expected))
+
+    return changes
+
+
+class PlayerRatings:
+    """Players' ratings, updated in memory game by game and saved together.
+
+    Args:
+        ratings (Dict[Any, PlayerRating]): The saved ratings to update, by player ID.
+            Players without one start at `INITIAL_RATING`.
+    """
+
+    def __init__(self, ratings: Dict[Any, PlayerRating]) -> None:
+        self._ratings = ratings
+        # The players whose ratings are created here, rather than loaded.
+        self._new_player_ids: Set = set()
+
+    @classmethod
+    def load(cls, player_ids: Iterable) -> "PlayerRatings":
+        """Load and lock the saved ratings of the given players.
+
+        The ratings are locked in primary key order, so that two transactions rating
+        the same players don't deadlock.
+
+        Args:
+            player_ids (Iterable): The IDs of the players.
+
+        Returns:
+            PlayerRatings: The ratings.
+        """
+        return cls(
+            {
+                rating.player_id: rating
+                for rating in PlayerRating.objects.select_for_update()
+                .filter(player_id__in=list(player_ids))
+                .order_by("pk")
+            }
+        )
+
+    def add_game(self, created_by_user_id: Any, scores: Dict[Any, int]) -> None:
+        """Update the ratings of a completed game's players from its result.
+
+        Args:
+            created_by_user_id (Any): The ID of the user who created the game.
+            scores (Dict[Any, int]): Every player's final score, by player ID.
+        """
+        ratings = []
+
+        for player_id in scores:
+            rating = self._ratings.get(player_id)
+
+            if rating is None:
+                rating = PlayerRating(
+                    player_id=player_id,
+                    created_by_user_id=created_by_user_id,
+                    rating=INITIAL_RATING,
+                )
+                self._ratings[player_id] = rating
+                self._new_player_ids.add(player_id)
+
+            ratings.append(rating)
+
+        for rating, change in zip(
+            ratings,
+            rating_changes(
+                [rating.rating for rating in ratings], list(scores.values())
+            ),
+        ):
+            rating.rating += change
+            rating.games_rated += 1
+
+    @transaction.atomic(savepoint=False)
+    def save(self) -> None:
+        """Save the ratings, creating those of players who didn't have one."""
+        updated_at = timezone.now()
+        saved_ratings = []
+        new_ratings = []
+
+        for player_id, rating in self._ratings.items():
+            rating.updated_at = updated_at
+
+            if player_id in self._new_player_ids:
+                new_ratings.append(rating)
+            else:
+                saved_ratings.append(rating)
+
+        # bulk_update() skips auto_now, so updated_at is set explicitly above.
+        PlayerRating.objects.bulk_update(
+            saved_ratings,
+            ["rating", "games_rated", "updated_at"],
+            batch_size=RATING_CHUNK_SIZE,
+        )
+        PlayerRating.objects.bulk_create(new_ratings, batch_size=RATING_CHUNK_SIZE)
+        self._new_player_ids.clear()
+
+
+def rate_games(games: List[Tuple[Any, Dict[Any, int]]]) -> None:
+    """Update the ratings of the players of newly completed games.
+
+    Args:
+        games (List[Tuple[Any, Dict[Any, int]]]): The ID of the user who created each
+            game, and every player's final score by player ID, in the order the games
+            were played.
+    """
+    if not games:
+        return
+
+    ratings = PlayerRatings.load(
+        {player_id for _, scores in games for player_id in scores}
+    )
+
+    for created_by_user_id, scores in games:
+        ratings.add_game(created_by_user_id, scores)
+
+    ratings.save()
+
+
+@transaction.atomic
+def replay_ratings() -> int:
+    """Recompute every player's rating from scratch, in one pass over the games.
+
+    The completed games' players are streamed from the database in the order the games
+    were started, and the ratings are held in memory until every game has been rated.
+
+    Returns:
+        int: The number of games rated.
+    """
+    ratings = PlayerRatings({})
+    game_count = 0
+    rows = (
+        GamePlayer.objects.filter(game__is_ongoing=False)
+        .order_by("game__inserted_at", "game_id")
+        .values_list("game_id", "game__created_by_user_id", "player_id", "score")
+        .iterator(chunk_size=RATING_CHUNK_SIZE)
+    )
+
+    for (_, created_by_user_id), game_rows in groupby(
+        rows, key=lambda row: (row[0], row[1])
+    ):
+        ratings.add_game(
+            created_by_user_id,
+            {player_id: score for _, _, player_id, score in game_rows},
+        )
+        game_count += 1
+
+    PlayerRating.objects.all().delete()
+    ratings.save()
+
+    return game_count
@@ -0,0 +1,501 @@
+"""Saving the bids and scores of a round, shared by the round pages and the API.
+
+Each function takes the round's players as loaded by `round_players_in_bidding_order`,
+works out the changes in memory, writes them in bulk and returns the scoreboard delta
+which is also pushed to the game's live subscribers. The players' statistics are
+updated in the same transaction.
+
+Nothing is locked while a submission is read and checked. Instead, its transaction
+starts by claiming the game's next version, from the version it read (see
+`GameSummary.claim_next_version`). If another submission has changed the game in the
+meantime, such as a second phone scoring the same round, the claim fails and
+RoundConflict is raised, so that nothing is saved twice.
+
+A round of an archived game is read from its archive, and the game is only unarchived
+by the transaction which saves the round (see archive.py).
+"""
+from typing import Dict, List, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .archive import archived_round, unarchive_games
+from .live import publish_on_commit, round_delta
+from .ratings import rate_games
+from .models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from .schedule import dealer_player_number, is_last_round, round_schedule
+from .scoring import GameScorer, game_scorer
+from .stats import PlayerStatsChanges
+
+
+class RoundConflict(Exception):
+    """Raised when a game has changed since a submission to one of its rounds read it."""
+
+
+def claim_next_version(game: Game) -> None:
+    """Claim the game's next version for a change to it.
+
+    Args:
+        game (Game): The game, with its summary as read before the change.
+
+    Raises:
+        RoundConflict: If the game has changed since its summary was read.
+    """
+    if not GameSummary.claim_next_version(game):
+        raise RoundConflict(f"Game {game.id} has changed since it was read.")
+
+
+def game_scores(round_players: List[GamePlayerGameRound]) -> Dict:
+    """The current score of every player in a game, by player ID.
+
+    Args:
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for a round of the game, with their game player.
+
+    Returns:
+        Dict: The scores.
+    """
+    return {
+        round_player.game_player.player_id: round_player.game_player.score
+        for round_player in round_players
+    }
+
+
+def in_bidding_order(
+    game_round: GameRound, round_players: List[GamePlayerGameRound]
+) -> List[GamePlayerGameRound]:
+    """Put the players' rows for a round in bidding order.
+
+    Args:
+        game_round (GameRound): The round.
+        round_players (List[GamePlayerGameRound]):
+            The rows, in player number order.
+
+    Returns:
+        List[GamePlayerGameRound]: The rows, starting with the player after the dealer.
+    """
+    # The player after the dealer bids first. Player numbers count from 1, so the
+    # dealer's player number is the index of the player after them.
+    starting_player_idx = dealer_player_number(
+        game_round.round_number, len(round_players)
+    )
+
+    return round_players[starting_player_idx:] + round_players[:starting_player_idx]
+
+
+def round_players_in_bidding_order(
+    game_round: GameRound,
+) -> List[GamePlayerGameRound]:
+    """Load the players' rows for a round, with their game players, in bidding order.
+
+    Args:
+        game_round (GameRound): The round, with its game.
+
+    Returns:
+        List[GamePlayerGameRound]: The rows, starting with the player after the dealer.
+    """
+    round_players = list(
+        GamePlayerGameRound.objects.select_related("game_player")
+        .filter(game_round=game_round)
+        .order_by("game_player__player_number")
+    )
+
+    for round_player in round_players:
+        round_player.game_round = game_round
+
+    return in_bidding_order(game_round, round_players)
+
+
+def load_round(
+    game: Game, round_number: int
+) -> Tuple[GameRound, List[GamePlayerGameRound]]:
+    """Load a round of a game, and its players' rows in bidding order.
+
+    The round of an archived game is unpacked from its archive without saving it, so
+    reading it doesn't change the game.
+
+    Args:
+        game (Game): The game, with its summary.
+        round_number (int): The number of the round.
+
+    Raises:
+        GameRound.DoesNotExist: If the game has no such round.
+
+    Returns:
+        Tuple[GameRound, List[GamePlayerGameRound]]: The round, with its game, and its
+            players' rows, with their game players.
+    """
+    if game.archived_rounds is not None:
+        game_round, round_players = archived_round(game, round_number)
+
+        return game_round, in_bidding_order(game_round, round_players)
+
+    game_round = GameRound.objects.get(game=game, round_number=round_number)
+    game_round.game = game
+
+    return game_round, round_players_in_bidding_order(game_round)
+
+
+def unarchive_round(
+    game: Game, game_round: GameRound, round_players: List[GamePlayerGameRound]
+) -> Tuple[GameRound, List[GamePlayerGameRound]]:
+    """Unarchive the game of a round which is being saved, if it is archived.
+
+    This must be called in the transaction which saves the round, so that the game is
+    only unarchived along with the round's changes, and after the transaction has
+    claimed the game's next version, as it writes.
+
+    Args:
+        game (Game): The game, with its summary.
+        game_round (GameRound): The round, from `load_round`.
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for the round, from `load_round`.
+
+    Returns:
+        Tuple[GameRound, List[GamePlayerGameRound]]: The round and its players' rows,
+            as saved in the game's round tables.
+    """
+    if game.archived_rounds is None:
+        return game_round, round_players
+
+    unarchive_games([game.id])
+    game.archived_rounds = None
+
+    return load_round(game, game_round.round_number)
+
+
+def change_bids(
+    scorer: GameScorer,
+    game_round: GameRound,
+    round_players: List[GamePlayerGameRound],
+    tricks_predicted: Dict[int, int],
+    stats_changes: PlayerStatsChanges,
+) -> Tuple[List[GamePlayerGameRound], List[GamePlayer]]:
+    """Change the players' bids for a round in memory, without saving them.
+
+    If the round has already been scored, the players' scores are corrected for their
+    new bids, and the statistics changes are added to `stats_changes`.
+
+    Args:
+        scorer (GameScorer): The game's scorer.
+        game_round (GameRound): The round.
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for the round, with their game player.
+        tricks_predicted (Dict[int, int]): The bid of each player, by player number.
+        stats_changes (PlayerStatsChanges): The changes to the players' statistics.
+
+    Returns:
+        Tuple[List[GamePlayerGameRound], List[GamePlayer]]: The players' rows and game
+            players which have changed.
+    """
+    round_players_by_number = {
+        round_player.game_player.player_number: round_player
+        for round_player in round_players
+    }
+
+    updated_at = timezone.now()
+    changed_round_players = []
+    changed_game_players = []
+
+    for player_number, player_tricks_predicted in tricks_predicted.items():
+        round_player = round_players_by_number[player_number]
+
+        if round_player.tricks_predicted == player_tricks_predicted:
+            continue
+
+        if round_player.tricks_won is not None:
+            # We're editing a round which has already completed, so we need to make sure
+            # we don't double-count the score from when this round was originally
+            # played.
+            old_score = scorer.round_score(
+                game_round.round_number,
+                round_player.tricks_predicted,
+                round_player.tricks_won,
+            )
+            new_score = scorer.round_score(
+                game_round.round_number,
+                player_tricks_predicted,
+                round_player.tricks_won,
+            )
+
+            if new_score != old_score:
+                round_player.game_player.score += new_score - old_score
+                round_player.game_player.updated_at = updated_at
+                changed_game_players.append(round_player.game_player)
+
+            stats_changes.add_round(
+                round_player.game_player.player_id,
+                round_player.tricks_predicted,
+                round_player.tricks_won,
+                old_score,
+                sign=-1,
+            )
+            stats_changes.add_round(
+                round_player.game_player.player_id,
+                player_tricks_predicted,
+                round_player.tricks_won,
+                new_score,
+            )
+
+        round_player.tricks_predicted = player_tricks_predicted
+        round_player.updated_at = updated_at
+        changed_round_players.append(round_player)
+
+    return changed_round_players, changed_game_players
+
+
+@transaction.atomic(savepoint=False)
+def save_round_bids(
+    game: Game,
+    game_round: GameRound,
+    round_players: List[GamePlayerGameRound],
+    tricks_predicted: Dict[int, int],
+) -> Dict:
+    """Save the bids of every player in a round.
+
+    Only the rows and scores which have changed are written. If the round has already
+    been scored, the players' scores and statistics are corrected for their new bids.
+    An archived game is unarchived first.
+
+    Args:
+        game (Game): The game, with its summary.
+        game_round (GameRound): The round, from `load_round`.
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for the round, with their game player.
+        tricks_predicted (Dict[int, int]): The bid of each player, by player number.
+
+    Raises:
+        RoundConflict: If the game has changed since its summary was read.
+
+    Returns:
+        Dict: The scoreboard delta.
+    """
+    # Unarchiving the game writes, so the game's next version is claimed first.
+    version_claimed = game.archived_rounds is not None
+
+    if version_claimed:
+        claim_next_version(game)
+        game_round, round_players = unarchive_round(game, game_round, round_players)
+
+    scorer = game_scorer(game)
+    old_scores = game_scores(round_players)
+    stats_changes = PlayerStatsChanges()
+    changed_round_players, changed_game_players = change_bids(
+        scorer, game_round, round_players, tricks_predicted, stats_changes
+    )
+
+    if changed_round_players and not version_claimed:
+        claim_next_version(game)
+
+    # bulk_update() skips auto_now, so updated_at was set when the rows were changed.
+    GamePlayerGameRound.objects.bulk_update(
+        changed_round_players, ["tricks_predicted", "updated_at"]
+    )
+    GamePlayer.objects.bulk_update(changed_game_players, ["score", "updated_at"])
+
+    if changed_game_players and not game.is_ongoing:
+        # The edit may have changed who won the game.
+        stats_changes.add_completed_game(old_scores, sign=-1)
+        stats_changes.add_completed_game(game_scores(round_players))
+
+    stats_changes.save()
+
+    total_tricks_predicted = sum(tricks_predicted.values())
+
+    if game_round.total_tricks_predicted != total_tricks_predicted:
+        game_round.total_tricks_predicted = total_tricks_predicted
+        game_round.save(update_fields=["total_tricks_predicted", "updated_at"])
+
+    if changed_round_players:
+        GameSummary.update_for_game(game, version_claimed=True)
+
+    delta = round_delta(game, game_round, round_players, scorer, event="bids")
+
+    if changed_round_players:
+        publish_on_commit(game, delta)
+
+    return delta
+
+
+def change_tricks_won(
+    scorer: GameScorer,
+    game_round: GameRound,
+    round_players: List[GamePlayerGameRound],
+    tricks_won: Dict[int, int],
+    stats_changes: PlayerStatsChanges,
+) -> Tuple[bool, List[GamePlayerGameRound], List[GamePlayer]]:
+    """Change the tricks won by the players in a round in memory, without saving them.
+
+    The players' scores are updated, and the round is added to `stats_changes`. If
+    the round had already been scored, what it added before is taken off.
+
+    Args:
+        scorer (GameScorer): The game's scorer.
+        game_round (GameRound): The round.
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for the round, with their game player.
+        tricks_won (Dict[int, int]): The tricks won by each player, by player number.
+        stats_changes (PlayerStatsChanges): The changes to the players' statistics.
+
+    Returns:
+        Tuple[bool, List[GamePlayerGameRound], List[GamePlayer]]: Whether the round had
+            already been scored, and the players' rows and game players which have
+            changed.
+    """
+    round_players_by_number = {
+        round_player.game_player.player_number: round_player
+        for round_player in round_players
+    }
+
+    updated_at = timezone.now()
+    editing_existing_round = False
+    changed_round_players = []
+    changed_game_players = []
+
+    for player_number, player_tricks_won in tricks_won.items():
+        round_player = round_players_by_number[player_number]
+        old_score = 0
+
+        if round_player.tricks_won is not None:
+            # We're editing a round which has already been scored, so we need to remove
+            # the score from when this round was originally played.
+            editing_existing_round = True
+
+            if round_player.tricks_won == player_tricks_won:
+                continue
+
+            old_score = scorer.round_score(
+                game_round.round_number,
+                round_player.tricks_predicted,
+                round_player.tricks_won,
+            )
+
+        new_score = scorer.round_score(
+            game_round.round_number,
+            round_player.tricks_predicted,
+            player_tricks_won,
+        )
+
+        if round_player.tricks_won is not None:
+            stats_changes.add_round(
+                round_player.game_player.player_id,
+                round_player.tricks_predicted,
+                round_player.tricks_won,
+                old_score,
+                sign=-1,
+            )
+
+        stats_changes.add_round(
+            round_player.game_player.player_id,
+            round_player.tricks_predicted,
+            player_tricks_won,
+            new_score,
+        )
+
+        round_player.tricks_won = player_tricks_won
+        round_player.updated_at = updated_at
+        changed_round_players.append(round_player)
+
+        if new_score != old_score:
+            round_player.game_player.score += new_score - old_score
+            round_player.game_player.updated_at = updated_at
+            changed_game_players.append(round_player.game_player)
+
+    return editing_existing_round, changed_round_players, changed_game_players
+
+
+def create_next_round(
+    game: Game, game_round: GameRound, round_players: List[GamePlayerGameRound]
+) -> None:
+    """Create the round after a round of a game, and a row for each player in it.
+
+    The round is set out by the game's schedule.
+
+    Args:
+        game (Game): The game.
+        game_round (GameRound): The round which has just been scored.
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for that round, with their game player.
+    """
+    next_round_number = game_round.round_number + 1
+    next_round_schedule = round_schedule(game, next_round_number, len(round_players))
+    next_round = GameRound.objects.create(
+        game=game,
+        round_number=next_round_number,
+        trump_suit=next_round_schedule.trump_suit,
+        card_number=next_round_schedule.card_number,
+    )
+
+    GamePlayerGameRound.objects.bulk_create(
+        GamePlayerGameRound(game_round=next_round, game_player=round_player.game_player)
+        for round_player in round_players
+    )
+
+
+@transaction.atomic(savepoint=False)
+def save_round_scores(
+    game: Game,
+    game_round: GameRound,
+    round_players: List[GamePlayerGameRound],
+    tricks_won: Dict[int, int],
+) -> Dict:
+    """Save the tricks won by every player in a round, and update their scores.
+
+    If the round hasn't been scored before, the game moves on to its next round, or
+    ends if this was the last round. The round is added to the players' statistics,
+    and if the game has ended, so is its result, and the players are rated. Editing a
+    scored round replaces what it (and the game's result) added to the statistics, but
+    doesn't correct the ratings (see ratings.py). An archived game is unarchived first.
+
+    Args:
+        game (Game): The game, with its summary.
+        game_round (GameRound): The round, from `load_round`.
+        round_players (List[GamePlayerGameRound]):
+            Every player's row for the round, with their game player.
+        tricks_won (Dict[int, int]): The tricks won by each player, by player number.
+
+    Raises:
+        RoundConflict: If the game has changed since its summary was read.
+
+    Returns:
+        Dict: The scoreboard delta.
+    """
+    claim_next_version(game)
+    game_round, round_players = unarchive_round(game, game_round, round_players)
+
+    scorer = game_scorer(game)
+    old_scores = game_scores(round_players)
+    stats_changes = PlayerStatsChanges()
+    (
+        editing_existing_round,
+        changed_round_players,
+        changed_game_players,
+    ) = change_tricks_won(scorer, game_round, round_players, tricks_won, stats_changes)
+
+    # bulk_update() skips auto_now, so updated_at was set when the rows were changed.
+    GamePlayerGameRound.objects.bulk_update(
+        changed_round_players, ["tricks_won", "updated_at"]
+    )
+    GamePlayer.objects.bulk_update(changed_game_players, ["score", "updated_at"])
+
+    if editing_existing_round and changed_game_players and not game.is_ongoing:
+        # The edit may have changed who won the game.
+        stats_changes.add_completed_game(old_scores, sign=-1)
+        stats_changes.add_completed_game(game_scores(round_players))
+
+    if not editing_existing_round:
+        if is_last_round(game, game_round.round_number):
+            game.is_ongoing = False
+            game.save(update_fields=["is_ongoing", "updated_at"])
+            stats_changes.add_completed_game(game_scores(round_players))
+            rate_games([(game.created_by_user_id, game_scores(round_players))])
+        else:
+            create_next_round(game, game_round, round_players)
+
+    stats_changes.save()
+    GameSummary.update_for_game(game, version_claimed=True)
+
+    delta = round_delta(game, game_round, round_players, scorer, event="scores")
+    publish_on_commit(game, delta)
+
+    return delta
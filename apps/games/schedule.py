@@ -0,0 +1,190 @@
+"""The schedule of a game's rounds, kept free of database access so it is cheap to call.
+
+Every round's number of cards, trump suit, dealer and score factor follow from the
+game's settings and the round number alone, so a game's rounds don't depend on the
+rounds before them. The schedule of each combination of settings is worked out once
+and memoised, and any round of it is then looked up in constant time.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from .models import Game
+
+# The number of cards dealt goes down to one and back up again, e.g. 3, 2, 1, 2, 3.
+MAX_TO_ONE_TO_MAX = "max_1_max"
+# The number of cards dealt goes up from one and back down again, e.g. 1, 2, 3, 2, 1.
+ONE_TO_MAX_TO_ONE = "1_max_1"
+# As MAX_TO_ONE_TO_MAX, but with two rounds of one card, e.g. 3, 2, 1, 1, 2, 3.
+MAX_TO_ONE_ONE_TO_MAX = "max_1_1_max"
+
+CARD_PROGRESSIONS = [
+    (MAX_TO_ONE_TO_MAX, "Down to one card and back up (e.g. 7..1..7)"),
+    (ONE_TO_MAX_TO_ONE, "Up from one card and back down (e.g. 1..7..1)"),
+    (MAX_TO_ONE_ONE_TO_MAX, "Down to one card twice and back up (e.g. 7..1, 1..7)"),
+]
+
+# The trump suits, in the order they rotate through the rounds.
+TRUMP_SUITS = ("H", "C", "D", "S", "N")
+
+
+class RoundSchedule(NamedTuple):
+    """What is dealt in a round, and how it is scored."""
+
+    card_number: int
+    trump_suit: str
+    dealer_player_number: int
+    score_factor: int
+
+
+def number_of_rounds(card_progression: str, max_card_number: int) -> int:
+    """The number of rounds in a game.
+
+    Args:
+        card_progression (str): The game's card progression.
+        max_card_number (int): The most cards dealt to each player in a round.
+
+    Returns:
+        int: The number of rounds.
+    """
+    if card_progression == MAX_TO_ONE_ONE_TO_MAX:
+        return max_card_number * 2
+
+    return max_card_number * 2 - 1
+
+
+def round_card_number(
+    card_progression: str, max_card_number: int, round_number: int
+) -> int:
+    """The number of cards dealt to each player in a round.
+
+    Args:
+        card_progression (str): The game's card progression.
+        max_card_number (int): The most cards dealt to each player in a round.
+        round_number (int): The number of the round.
+
+    Returns:
+        int: The number of cards.
+    """
+    if card_progression == ONE_TO_MAX_TO_ONE:
+        if round_number <= max_card_number:
+            return round_number
+
+        return max_card_number * 2 - round_number
+
+    if round_number <= max_card_number:
+        return max_card_number - round_number + 1
+
+    if card_progression == MAX_TO_ONE_ONE_TO_MAX:
+        return round_number - max_card_number
+
+    return round_number - max_card_number + 1
+
+
+def dealer_player_number(round_number: int, number_of_players: int) -> int:
+    """The player number of the dealer of a round. The deal passes on every round.
+
+    Args:
+        round_number (int): The number of the round.
+        number_of_players (int): The number of players in the game.
+
+    Returns:
+        int: The dealer's player number.
+    """
+    return round_number % number_of_players + 1
+
+
+@lru_cache(maxsize=1024)
+def game_schedule(
+    card_progression: str,
+    max_card_number: int,
+    double_last_round_points: bool,
+    number_of_players: int,
+) -> Tuple[RoundSchedule, ...]:
+    """The schedule of every round of a game with the given settings, memoised.
+
+    Args:
+        card_progression (str): The game's card progression.
+        max_card_number (int): The most cards dealt to each player in a round.
+        double_last_round_points (bool): Whether the last round scores double.
+        number_of_players (int): The number of players in the game.
+
+    Returns:
+        Tuple[RoundSchedule, ...]: The schedule of each round, in order.
+    """
+    last_round_number = number_of_rounds(card_progression, max_card_number)
+
+    return tuple(
+        RoundSchedule(
+            card_number=round_card_number(
+                card_progression, max_card_number, round_number
+            ),
+            trump_suit=TRUMP_SUITS[(round_number - 1) % len(TRUMP_SUITS)],
+            dealer_player_number=dealer_player_number(round_number, number_of_players),
+            score_factor=(
+                2
+                if double_last_round_points and round_number == last_round_number
+                else 1
+            ),
+        )
+        for round_number in range(1, last_round_number + 1)
+    )
+
+
+def schedule_of_game(game: "Game", number_of_players: int) -> Tuple[RoundSchedule, ...]:
+    """The schedule of every round of a game.
+
+    Args:
+        game (Game): The game.
+        number_of_players (int): The number of players in the game.
+
+    Returns:
+        Tuple[RoundSchedule, ...]: The schedule of each round, in order.
+    """
+    return game_schedule(
+        game.card_progression,
+        game.starting_round_card_number,
+        game.double_last_round_points,
+        number_of_players,
+    )
+
+
+def round_schedule(
+    game: "Game", round_number: int, number_of_players: int
+) -> RoundSchedule:
+    """The schedule of a round of a game.
+
+    Args:
+        game (Game): The game.
+        round_number (int): The number of the round, from 1 to the game's number of
+            rounds.
+        number_of_players (int): The number of players in the game.
+
+    Raises:
+        IndexError: If the game has no such round.
+
+    Returns:
+        RoundSchedule: The round's schedule.
+    """
+    schedule = schedule_of_game(game, number_of_players)
+
+    # A negative index would count back from the last round.
+    if not 1 <= round_number <= len(schedule):
+        raise IndexError(f"The game has no round {round_number}.")
+
+    return schedule[round_number - 1]
+
+
+def is_last_round(game: "Game", round_number: int) -> bool:
+    """Whether the given round is the last round of a game.
+
+    Args:
+        game (Game): The game.
+        round_number (int): The number of the round.
+
+    Returns:
+        bool: Whether the round is the last round.
+    """
+    return round_number == number_of_rounds(
+        game.card_progression, game.starting_round_card_number
+    )
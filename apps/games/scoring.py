@@ -0,0 +1,347 @@
+"""Scoring rules for games, kept free of database access so they are cheap to call.
+
+A game's scoring settings are gathered into `ScoringRules`, which are compiled into a
+`GameScorer`: a table of every score a player can get in each round, worked out once
+from the rules' formula. Compiled scorers are cached by their rules, so every game with
+the same settings shares one, and scoring a round is then a lookup however many rules
+there are. To add a rule, add its setting to `ScoringRules` and use it in `points()`.
+
+A round can be scored before every player has bid, and older games have rounds like
+that. A player without a bid scores as if they missed it, by their tricks won alone.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .models import Game
+from .schedule import game_schedule
+
+# The fields of a game which its scores depend on, for loading only those.
+SCORING_FIELDS = (
+    "card_progression",
+    "starting_round_card_number",
+    "double_last_round_points",
+    "correct_prediction_points",
+    "missed_prediction_points",
+    "zero_prediction_points",
+)
+
+# The row of each round's score table which holds the scores of a player without a bid.
+NO_BID = -1
+
+
+def bid_index(tricks_predicted: Optional[int]) -> int:
+    """The row of a round's score table which holds the scores for a bid.
+
+    Args:
+        tricks_predicted (Optional[int]): The bid, if there is one.
+
+    Returns:
+        int: The row's index.
+    """
+    return NO_BID if tricks_predicted is None else tricks_predicted
+
+
+class ScoringRules(NamedTuple):
+    """The settings of a game which its scores depend on."""
+
+    card_progression: str
+    max_card_number: int
+    double_last_round_points: bool
+    correct_prediction_points: int
+    missed_prediction_points: int
+    zero_prediction_points: Optional[int]
+
+    @classmethod
+    def for_game(cls, game: Game) -> "ScoringRules":
+        """The scoring rules of a game.
+
+        Args:
+            game (Game): The game.
+
+        Returns:
+            ScoringRules: The rules.
+        """
+        return cls(
+            card_progression=game.card_progression,
+            max_card_number=game.starting_round_card_number,
+            double_last_round_points=game.double_last_round_points,
+            correct_prediction_points=game.correct_prediction_points,
+            missed_prediction_points=game.missed_prediction_points,
+            zero_prediction_points=game.zero_prediction_points,
+        )
+
+    def points(self, tricks_predicted: Optional[int], tricks_won: int) -> int:
+        """The score of a player in a round, before the round's score factor.
+
+        This is only called to compile the rules, so it can be as involved as needed.
+
+        Args:
+            tricks_predicted (Optional[int]): The number of tricks the player predicted,
+                or None if they didn't bid.
+            tricks_won (int): The number of tricks the player won.
+
+        Returns:
+            int: The player's points.
+        """
+        if tricks_predicted is None:
+            # A missing bid is missed, but not by any number of tricks.
+            return tricks_won
+
+        if tricks_predicted == tricks_won:
+            if tricks_predicted == 0 and self.zero_prediction_points is not None:
+                return self.zero_prediction_points
+
+            return tricks_won + self.correct_prediction_points
+
+        return tricks_won - self.missed_prediction_points * abs(
+            tricks_predicted - tricks_won
+        )
+
+
+class GameScorer:
+    """A game's scoring rules, compiled into a table of scores for each round.
+
+    Args:
+        rules (ScoringRules): The rules to compile.
+    """
+
+    def __init__(self, rules: ScoringRules) -> None:
+        self.rules = rules
+
+        tricks = range(rules.max_card_number + 1)
+        bids: List[Optional[int]] = [*tricks, None]
+        # The missing bid's row comes last, so that NO_BID indexes it.
+        points = [
+            [rules.points(tricks_predicted, tricks_won) for tricks_won in tricks]
+            for tricks_predicted in bids
+        ]
+        # Rounds with the same score factor share a table.
+        tables: Dict[int, Tuple[Tuple[int, ...], ...]] = {}
+        # Round numbers start from 1, so there's nothing at index 0.
+        score_factors = [0]
+        round_points: List[Tuple[Tuple[int, ...], ...]] = [()]
+
+        for schedule in game_schedule(
+            rules.card_progression,
+            rules.max_card_number,
+            rules.double_last_round_points,
+            1,
+        ):
+            factor = schedule.score_factor
+
+            if factor not in tables:
+                tables[factor] = tuple(
+                    tuple(score * factor for score in row) for row in points
+                )
+
+            score_factors.append(factor)
+            round_points.append(tables[factor])
+
+        self._score_factors = tuple(score_factors)
+        self._round_points = tuple(round_points)
+
+    def score_factor(self, round_number: int) -> int:
+        """The factor the scores in a round are multiplied by.
+
+        Args:
+            round_number (int): The number of the round.
+
+        Returns:
+            int: 2 if this is a double points round, otherwise 1.
+        """
+        return self._score_factors[round_number]
+
+    def round_points(self, round_number: int) -> Tuple[Tuple[int, ...], ...]:
+        """The table of scores in a round, for scoring many players at once.
+
+        Args:
+            round_number (int): The number of the round.
+
+        Returns:
+            Tuple[Tuple[int, ...], ...]: The score of a player in the round, indexed by
+                the tricks they predicted (see `bid_index`), then the tricks they won.
+        """
+        return self._round_points[round_number]
+
+    def round_score(
+        self, round_number: int, tricks_predicted: Optional[int], tricks_won: int
+    ) -> int:
+        """The score of a player in a round.
+
+        Args:
+            round_number (int): The number of the round.
+            tricks_predicted (Optional[int]): The number of tricks the player predicted,
+                or None if they didn't bid.
+            tricks_won (int): The number of tricks the player won.
+
+        Returns:
+            int: The player's score for the round.
+        """
+        return self._round_points[round_number][bid_index(tricks_predicted)][tricks_won]
+
+    def total_scores(
+        self, round_rows: Iterable[Tuple[Any, int, Optional[int], int]]
+    ) -> Dict:
+        """Add up scores from many scored rounds of the game.
+
+        Args:
+            round_rows (Iterable[Tuple[Any, int, Optional[int], int]]): A key (such as
+                the game player ID), the round number, the tricks predicted (or None)
+                and the tricks won of each scored round, in any order.
+
+        Returns:
+            Dict: The total score of each key.
+        """
+        round_points = self._round_points
+        scores: Dict[Any, int] = defaultdict(int)
+
+        for key, round_number, tricks_predicted, tricks_won in round_rows:
+            scores[key] += round_points[round_number][bid_index(tricks_predicted)][
+                tricks_won
+            ]
+
+        return dict(scores)
+
+
+@lru_cache(maxsize=256)
+def compile_scoring_rules(rules: ScoringRules) -> GameScorer:
+    """Compile scoring rules, or return the scorer already compiled for them.
+
+    Args:
+        rules (ScoringRules): The rules.
+
+    Returns:
+        GameScorer: The compiled rules.
+    """
+    return GameScorer(rules)
+
+
+def game_scorer(game: Game) -> GameScorer:
+    """The compiled scoring rules of a game.
+
+    Args:
+        game (Game): The game.
+
+    Returns:
+        GameScorer: The compiled rules.
+    """
+    return compile_scoring_rules(ScoringRules.for_game(game))
+
+
+def build_round_table(
+    game: Game, round_rows: Iterable[Mapping[str, Any]], last_round_number: int
+) -> List[Tuple[str, List[Dict]]]:
+    """Build the table of rounds shown on the game page, in a single pass over the rows.
+
+    Args:
+        game (Game): The game.
+        round_rows (Iterable[Mapping[str, Any]]):
+            The game's GamePlayerGameRound rows as dictionaries, with the keys
+            `game_round__round_number`, `game_player__player_number`,
+            `tricks_predicted` and `tricks_won`. These must be ordered by round number,
+            then player number.
+        last_round_number (int): The number of the last round to include.
+
+    Returns:
+        List[Tuple[str, List[Dict]]]:
+            The round number and a cell for each player (in player number order) for
+            each round, latest round first. Each cell holds the player's bid, tricks
+            won, score for the round and running total, with blanks for anything not
+            yet entered.
+    """
+    rounds: Dict[int, List[Dict]] = {
+        round_number: [] for round_number in range(1, last_round_number + 1)
+    }
+    running_totals: Dict[int, int] = {}
+    scorer = game_scorer(game)
+
+    current_round_number = None
+    round_points: Tuple[Tuple[int, ...], ...] = ()
+
+    for row in round_rows:
+        round_number = row["game_round__round_number"]
+
+        if round_number > last_round_number:
+            break
+
+        if round_number != current_round_number:
+            current_round_number = round_number
+            round_points = scorer.round_points(round_number)
+
+        player_number = row["game_player__player_number"]
+        tricks_predicted = row["tricks_predicted"]
+        tricks_won = row["tricks_won"]
+
+        points = (
+            round_points[bid_index(tricks_predicted)][tricks_won]
+            if tricks_won is not None
+            else 0
+        )
+        running_total = running_totals.get(player_number, 0) + points
+        running_totals[player_number] = running_total
+
+        rounds[round_number].append(
+            {
+                "tricks_won": tricks_won if tricks_won is not None else "",
+                "tricks_predicted": (
+                    tricks_predicted if tricks_predicted is not None else ""
+                ),
+                "score": points if tricks_won is not None else "",
+                "running_total": running_total,
+                "player_number": player_number,
+            }
+        )
+
+    return [
+        (str(round_number), rounds[round_number])
+        for round_number in range(last_round_number, 0, -1)
+    ]
+
+
+def replay_scores(
+    games: Dict[Any, Game],
+    round_rows: Iterable[Tuple[Any, Any, int, Optional[int], int]],
+) -> Dict[Any, int]:
+    """Replay the scores of game players from their scored rounds.
+
+    Args:
+        games (Dict[Any, Game]): The games the rows belong to, by ID.
+        round_rows (Iterable[Tuple[Any, Any, int, Optional[int], int]]):
+            The game ID, game player ID, round number, tricks predicted (or None) and
+            tricks won of each scored GamePlayerGameRound row, in any order.
+
+    Returns:
+        Dict[Any, int]: The replayed score of each game player with a scored round, by
+            game player ID.
+    """
+    rows_by_game: Dict[Any, List[Tuple[Any, int, Optional[int], int]]] = defaultdict(
+        list
+    )
+
+    for (
+        game_id,
+        game_player_id,
+        round_number,
+        tricks_predicted,
+        tricks_won,
+    ) in round_rows:
+        rows_by_game[game_id].append(
+            (game_player_id, round_number, tricks_predicted, tricks_won)
+        )
+
+    scores: Dict[Any, int] = {}
+
+    for game_id, game_rows in rows_by_game.items():
+        scores.update(game_scorer(games[game_id]).total_scores(game_rows))
+
+    return scores
@@ -0,0 +1,269 @@
+"""Keeping players' statistics up to date as their games change.
+
+Changes are collected in memory by a `PlayerStatsChanges`, as rounds are scored or
+edited and games are completed, imported or deleted, then added to the players'
+`PlayerStats` rows in bulk. Undoing a change (before a round is edited, or when a
+game is deleted) adds the same change with the opposite sign.
+"""
+from collections import Counter, defaultdict
+from itertools import chain, groupby, islice
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from ..players.models import PlayerStats
+from .archive import archived_scored_rows
+from .models import Game, GamePlayerGameRound
+from .scoring import SCORING_FIELDS, game_scorer
+
+STAT_FIELDS = (
+    "completed_games",
+    "games_won",
+    "rounds_played",
+    "correct_predictions",
+    "round_points",
+    "zero_bids",
+    "zero_bids_made",
+)
+
+# The number of rows written to the database at a time.
+STATS_BATCH_SIZE = 500
+
+
+class PlayerStatsChanges:
+    """Changes to players' statistics, collected in memory and saved together."""
+
+    def __init__(self) -> None:
+        self._changes: Dict[Any, Counter] = defaultdict(Counter)
+
+    def add_round(
+        self,
+        player_id: Any,
+        tricks_predicted: Optional[int],
+        tricks_won: int,
+        points: int,
+        sign: int = 1,
+    ) -> None:
+        """Add a player's scored round to their statistics.
+
+        Args:
+            player_id (Any): The ID of the player.
+            tricks_predicted (Optional[int]): The number of tricks the player
+                predicted, or None if they didn't bid.
+            tricks_won (int): The number of tricks the player won.
+            points (int): The player's score for the round.
+            sign (int): -1 to remove the round instead.
+        """
+        changes = self._changes[player_id]
+        changes["rounds_played"] += sign
+        changes["round_points"] += points * sign
+
+        if tricks_predicted == tricks_won:
+            changes["correct_predictions"] += sign
+
+        if tricks_predicted == 0:
+            changes["zero_bids"] += sign
+
+            if tricks_won == 0:
+                changes["zero_bids_made"] += sign
+
+    def add_completed_game(self, scores: Dict[Any, int], sign: int = 1) -> None:
+        """Add a completed game to its players' statistics.
+
+        Args:
+            scores (Dict[Any, int]): Every player's final score, by player ID.
+            sign (int): -1 to remove the game instead.
+        """
+        winning_score = max(scores.values())
+
+        for player_id, score in scores.items():
+            changes = self._changes[player_id]
+            changes["completed_games"] += sign
+
+            if score == winning_score:
+                changes["games_won"] += sign
+
+    def add_game(
+        self,
+        game: Game,
+        round_rows: Iterable[Tuple[Any, int, Optional[int], Optional[int]]],
+        sign: int = 1,
+    ) -> None:
+        """Add every scored round of a game, and the game if completed, to the statistics.
+
+        Args:
+            game (Game): The game.
+            round_rows (Iterable[Tuple[Any, int, Optional[int], Optional[int]]]):
+                The player ID, round number, tricks predicted and tricks won of each of
+                the game's GamePlayerGameRound rows, in any order.
+            sign (int): -1 to remove the game instead.
+        """
+        scorer = game_scorer(game)
+        scores: Dict[Any, int] = defaultdict(int)
+
+        for player_id, round_number, tricks_predicted, tricks_won in round_rows:
+            if tricks_won is None:
+                continue
+
+            points = scorer.round_score(round_number, tricks_predicted, tricks_won)
+            scores[player_id] += points
+            self.add_round(player_id, tricks_predicted, tricks_won, points, sign)
+
+        if not game.is_ongoing and scores:
+            self.add_completed_game(scores, sign)
+
+    @transaction.atomic(savepoint=False)
+    def save(self) -> None:
+        """Add the changes to the players' saved statistics.
+
+        The statistics are locked while they are changed, and created for players who
+        don't have any yet.
+        """
+        changes_by_player = {
+            player_id: {field: change for field, change in changes.items() if change}
+            for player_id, changes in self._changes.items()
+        }
+        changes_by_player = {
+            player_id: changes
+            for player_id, changes in changes_by_player.items()
+            if changes
+        }
+        self._changes.clear()
+
+        if not changes_by_player:
+            return
+
+        saved_stats = locked_player_stats(changes_by_player)
+        missing_player_ids = [
+            player_id for player_id in changes_by_player if player_id not in saved_stats
+        ]
+
+        if missing_player_ids:
+            # Another transaction may be creating some of the same rows, in which case
+            # these inserts wait for it and are then skipped. The rows are read back
+            # either way, to change what is now saved.
+            PlayerStats.objects.bulk_create(
+                [PlayerStats(player_id=player_id) for player_id in missing_player_ids],
+                batch_size=STATS_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            saved_stats.update(locked_player_stats(missing_player_ids))
+
+        updated_at = timezone.now()
+
+        for player_id, changes in changes_by_player.items():
+            stats = saved_stats[player_id]
+
+            for field, change in changes.items():
+                setattr(stats, field, getattr(stats, field) + change)
+
+            stats.updated_at = updated_at
+
+        # bulk_update() skips auto_now, so updated_at is set explicitly above.
+        PlayerStats.objects.bulk_update(
+            saved_stats.values(),
+            [*STAT_FIELDS, "updated_at"],
+            batch_size=STATS_BATCH_SIZE,
+        )
+
+
+def locked_player_stats(player_ids: Iterable) -> Dict[Any, PlayerStats]:
+    """Read and lock the saved statistics of the given players.
+
+    The rows are locked in primary key order, as every transaction which changes
+    statistics locks them, so that two transactions changing the same players don't
+    deadlock.
+
+    Args:
+        player_ids (Iterable): The IDs of the players.
+
+    Returns:
+        Dict[Any, PlayerStats]: The statistics of each player who has any, by player ID.
+    """
+    return {
+        stats.player_id: stats
+        for stats in PlayerStats.objects.select_for_update()
+        .filter(player_id__in=list(player_ids))
+        .order_by("pk")
+    }
+
+
+def game_stats_rows(game_ids: Iterable) -> QuerySet:
+    """The rows of the given games which count towards their players' statistics.
+
+    Args:
+        game_ids (Iterable): The IDs of the games.
+
+    Returns:
+        QuerySet: The game ID, player ID, round number, tricks predicted and tricks won
+            of every scored GamePlayerGameRound row, ordered by game.
+    """
+    return (
+        GamePlayerGameRound.objects.filter(
+            game_round__game_id__in=game_ids, tricks_won__isnull=False
+        )
+        .order_by("game_round__game_id")
+        .values_list(
+            "game_round__game_id",
+            "game_player__player_id",
+            "game_round__round_number",
+            "tricks_predicted",
+            "tricks_won",
+        )
+    )
+
+
+def games_stats_changes(games: Dict[Any, Game], sign: int = 1) -> PlayerStatsChanges:
+    """Load the changes to players' statistics made by adding (or removing) games.
+
+    The rounds of archived games are read from their archives.
+
+    Args:
+        games (Dict[Any, Game]): The games, by ID.
+        sign (int): -1 to remove the games instead.
+
+    Returns:
+        PlayerStatsChanges: The unsaved changes.
+    """
+    changes = PlayerStatsChanges()
+    rows = chain(
+        game_stats_rows(games),
+        (
+            (game_id, player_id, *tricks)
+            for game_id, _, player_id, *tricks in archived_scored_rows(games)
+        ),
+    )
+
+    for game_id, game_rows in groupby(rows, key=lambda row: row[0]):
+        changes.add_game(games[game_id], (row[1:] for row in game_rows), sign)
+
+    return changes
+
+
+@transaction.atomic
+def rebuild_player_stats(batch_size: int = STATS_BATCH_SIZE) -> int:
+    """Recompute every player's statistics from scratch, from the rounds of their games.
+
+    The statistics are replaced in one transaction, so they are never seen half built.
+
+    Args:
+        batch_size (int): The number of games read at a time.
+
+    Returns:
+        int: The number of games read.
+    """
+    PlayerStats.objects.all().delete()
+    games = (
+        Game.objects.order_by("id")
+        .only("is_ongoing", *SCORING_FIELDS)
+        .iterator(chunk_size=batch_size)
+    )
+    game_count = 0
+
+    while batch := list(islice(games, batch_size)):
+        games_stats_changes({game.id: game for game in batch}).save()
+        game_count += len(batch)
+
+    return game_count
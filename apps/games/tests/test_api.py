@@ -0,0 +1,247 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..models import GamePlayer, GameRound
+from .utils import create_game, create_players, create_user
+
+
+class GameApiViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 3), starting_round_card_number=2
+        )
+        self.url = f"/api/games/{self.game.id}/"
+        self.async_client.force_login(self.user)
+
+    async def test_get(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        state = response.json()
+        self.assertEqual(state["id"], str(self.game.id))
+        self.assertEqual(state["latest_round_number"], 1)
+        self.assertEqual(state["latest_round_card_number"], 2)
+        self.assertEqual(
+            [player["player_number"] for player in state["players"]], [1, 2, 3]
+        )
+        # No bids have been placed, so there are no rounds to show yet.
+        self.assertEqual(state["rounds"], [])
+        self.assertIn("ETag", response.headers)
+
+    async def test_get_not_modified(self):
+        response = await self.async_client.get(self.url)
+
+        response = await self.async_client.get(
+            self.url, headers={"If-None-Match": response.headers["ETag"]}
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    async def test_get_for_other_user(self):
+        other_user = await sync_to_async(create_user)(email="other@example.com")
+        await sync_to_async(self.async_client.force_login)(other_user)
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("error", response.json())
+
+    async def test_get_logged_out(self):
+        await sync_to_async(self.async_client.logout)()
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_get_missing_game(self):
+        response = await self.async_client.get("/api/games/gam_doesnotexist/")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class GameRoundApiViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 3), starting_round_card_number=2
+        )
+        self.round_url = f"/api/games/{self.game.id}/rounds/1"
+        self.client.force_login(self.user)
+
+    def _post(self, path: str, body) -> object:
+        return self.client.post(
+            f"{self.round_url}/{path}/",
+            json.dumps(body),
+            content_type="application/json",
+        )
+
+    def test_round_in_two_requests(self):
+        response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}})
+
+        self.assertEqual(response.status_code, 200)
+        delta = response.json()
+        self.assertEqual(delta["event"], "bids")
+        self.assertEqual(delta["round_number"], 1)
+        self.assertEqual(
+            {
+                player["player_number"]: player["tricks_predicted"]
+                for player in delta["players"]
+            },
+            {1: 1, 2: 0, 3: 0},
+        )
+
+        response = self._post("tricks", {"tricks": {"1": 1, "2": 1, "3": 0}})
+
+        self.assertEqual(response.status_code, 200)
+        delta = response.json()
+        self.assertEqual(delta["event"], "scores")
+        self.assertEqual(delta["latest_round_number"], 2)
+        self.assertEqual(
+            {player["player_number"]: player["score"] for player in delta["players"]},
+            {1: 6, 2: 1, 3: 5},
+        )
+        self.assertEqual(
+            list(
+                GamePlayer.objects.filter(game=self.game)
+                .order_by("player_number")
+                .values_list("score", flat=True)
+            ),
+            [6, 1, 5],
+        )
+        self.assertTrue(
+            GameRound.objects.filter(game=self.game, round_number=2).exists()
+        )
+
+        state = self.client.get(f"/api/games/{self.game.id}/").json()
+        self.assertEqual(state["version"], delta["version"])
+        self.assertEqual(
+            state["rounds"][0]["players"][0],
+            {
+                "player_number": 1,
+                "tricks_predicted": 1,
+                "tricks_won": 1,
+                "round_score": 6,
+                "score": 6,
+            },
+        )
+
+    def test_bids_use_form_validation(self):
+        # The bids can't add up to the number of cards.
+        response = self._post("bids", {"bids": {"1": 1, "2": 1, "3": 0}})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("__all__", response.json()["errors"])
+
+        # Nor can a bid be more than the number of cards, or be missing.
+        response = self._post("bids", {"bids": {"1": 3, "2": 0}})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"1", "3"})
+
+    def test_tricks_use_form_validation(self):
+        self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}})
+
+        response = self._post("tricks", {"tricks": {"1": 1, "2": 0, "3": 0}})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("__all__", response.json()["errors"])
+        self.assertFalse(
+            GameRound.objects.filter(game=self.game, round_number=2).exists()
+        )
+
+    def test_tricks_before_bids(self):
+        response = self._post("tricks", {"tricks": {"1": 1, "2": 1, "3": 0}})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {
+                player["player_number"]: (player["round_score"], player["score"])
+                for player in response.json()["players"]
+            },
+            {1: (1, 1), 2: (1, 1), 3: (0, 0)},
+        )
+
+    def test_unknown_player(self):
+        response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0, "4": 0}})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"4"})
+
+    def test_malformed_body(self):
+        for body in ([], {"tricks": {}}, {"bids": [1, 0, 0]}):
+            with self.subTest(body=body):
+                self.assertEqual(self._post("bids", body).status_code, 400)
+
+        response = self.client.post(
+            f"{self.round_url}/bids/", "not json", content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_version(self):
+        response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}, "version": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], 2)
+
+        # Submitted from the game as it was before the bids above.
+        response = self._post("bids", {"bids": {"1": 0, "2": 0, "3": 1}, "version": 1})
+
+        self.assertEqual(response.status_code, 409)
+        state = response.json()["game"]
+        self.assertEqual(state["version"], 2)
+        self.assertEqual(
+            [player["tricks_predicted"] for player in state["rounds"][0]["players"]],
+            [1, 0, 0],
+        )
+
+        response = self._post(
+            "bids", {"bids": {"1": 1, "2": 0, "3": 0}, "version": "2"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_missing_round(self):
+        response = self.client.post(
+            f"/api/games/{self.game.id}/rounds/5/bids/",
+            json.dumps({"bids": {"1": 1, "2": 0, "3": 0}}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_for_other_user(self):
+        self.client.force_login(create_user(email="other@example.com"))
+
+        response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}})
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_logged_out(self):
+        self.client.logout()
+
+        response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_csrf_enforced(self):
+        self.client.handler.enforce_csrf_checks = True
+
+        response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}})
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_query_count(self):
+        # The session and user, reading the game and summary, round and round players,
+        # then claiming the game's next version, and writing the round players, round
+        # and game summary (which reads the players and latest round).
+        with self.assertNumQueries(11):
+            response = self._post("bids", {"bids": {"1": 1, "2": 0, "3": 0}})
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,291 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+
+from ..archive import archive_games, pack_rounds, unarchive_games, unpack_rounds
+from ..models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from ..rounds import RoundConflict, load_round, save_round_scores
+from .test_stats import player_stats
+from .utils import create_game, create_players, create_user
+
+
+class PackRoundsTest(SimpleTestCase):
+    def test_round_trip(self):
+        rounds = [[(1, 1), (0, 1)], [(0, 0), (1, 1)], [(2, 0), (0, 2)]]
+
+        archive = pack_rounds(2, rounds)
+
+        # A header of three values, then two values for each player in each round.
+        self.assertEqual(len(archive), (3 + 3 * 2 * 2) * 2)
+        self.assertEqual(unpack_rounds(archive), rounds)
+        self.assertEqual(unpack_rounds(memoryview(archive)), rounds)
+
+    def test_unknown_format_version(self):
+        with self.assertRaises(ValueError):
+            unpack_rounds(b"\x02\x00\x02\x00\x00\x00")
+
+
+class CompletedGameMixin:
+    """Sets up a completed game, played through the round pages, and an ongoing one."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 2), starting_round_card_number=2
+        )
+        self.client.force_login(self.user)
+
+        for round_number, bids, tricks in (
+            (1, (1, 0), (1, 1)),
+            (2, (0, 0), (0, 1)),
+            (3, (1, 0), (0, 2)),
+        ):
+            round_url = f"/games/{self.game.id}/round/{round_number}"
+            self.client.post(
+                f"{round_url}/bids/",
+                {"tricks_predicted_1": bids[0], "tricks_predicted_2": bids[1]},
+            )
+            self.client.post(
+                f"{round_url}/scores/",
+                {"tricks_won_1": tricks[0], "tricks_won_2": tricks[1]},
+            )
+
+        self.ongoing_game = create_game(self.user, create_players(self.user, 3))
+
+    def assertArchived(self):
+        self.game.refresh_from_db()
+        self.assertIsNotNone(self.game.archived_rounds)
+        self.assertFalse(GameRound.objects.filter(game=self.game).exists())
+
+
+class ArchiveGamesTest(CompletedGameMixin, TestCase):
+    def game_rounds(self):
+        cache.clear()
+
+        return self.client.get(f"/games/{self.game.id}/").context["game_rounds"]
+
+    def export(self):
+        response = self.client.get("/games/export/csv/")
+
+        return b"".join(response.streaming_content)
+
+    def test_archive(self):
+        game_rounds = self.game_rounds()
+        export = self.export()
+        stats = player_stats()
+
+        self.assertEqual(archive_games([self.game.id, self.ongoing_game.id]), 1)
+
+        self.game.refresh_from_db()
+        self.assertIsNotNone(self.game.archived_rounds)
+        self.assertFalse(GameRound.objects.filter(game=self.game).exists())
+        self.assertFalse(
+            GamePlayerGameRound.objects.filter(game_round__game=self.game).exists()
+        )
+        self.assertTrue(GameRound.objects.filter(game=self.ongoing_game).exists())
+
+        self.assertEqual(self.game_rounds(), game_rounds)
+        self.assertEqual(self.export(), export)
+        call_command("rebuild_player_stats", stdout=StringIO())
+        self.assertEqual(player_stats(), stats)
+        stdout = StringIO()
+        call_command("rescore_games", stdout=stdout)
+        self.assertIn("0 scores differed", stdout.getvalue())
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_archived_game_through_asgi(self):
+        game_rounds = await sync_to_async(self.game_rounds)()
+
+        await sync_to_async(archive_games)([self.game.id])
+        await cache.aclear()
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(f"/games/{self.game.id}/")
+
+        self.assertEqual(response.context["game_rounds"], game_rounds)
+
+    def test_unarchive(self):
+        rows = set(
+            GamePlayerGameRound.objects.filter(game_round__game=self.game).values_list(
+                "game_round__round_number",
+                "game_round__card_number",
+                "game_round__trump_suit",
+                "game_round__total_tricks_predicted",
+                "game_player_id",
+                "tricks_predicted",
+                "tricks_won",
+            )
+        )
+        archive_games([self.game.id])
+
+        self.assertEqual(unarchive_games([self.game.id, self.ongoing_game.id]), 1)
+
+        self.game.refresh_from_db()
+        self.assertIsNone(self.game.archived_rounds)
+        self.assertEqual(
+            set(
+                GamePlayerGameRound.objects.filter(
+                    game_round__game=self.game
+                ).values_list(
+                    "game_round__round_number",
+                    "game_round__card_number",
+                    "game_round__trump_suit",
+                    "game_round__total_tricks_predicted",
+                    "game_player_id",
+                    "tricks_predicted",
+                    "tricks_won",
+                )
+            ),
+            rows,
+        )
+
+    def test_editing_a_round_unarchives_the_game(self):
+        archive_games([self.game.id])
+
+        response = self.client.post(
+            f"/games/{self.game.id}/round/1/scores/",
+            {"tricks_won_1": 0, "tricks_won_2": 2},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.game.refresh_from_db()
+        self.assertIsNone(self.game.archived_rounds)
+        # Alice loses her first round bonus, and Bob gets 1 more trick.
+        self.assertEqual(
+            list(
+                GamePlayer.objects.filter(game=self.game)
+                .order_by("player_number")
+                .values_list("score", flat=True)
+            ),
+            [5, 5],
+        )
+
+    def test_viewing_a_round_leaves_the_game_archived(self):
+        archive_games([self.game.id])
+
+        for page in ("bids", "scores"):
+            response = self.client.get(f"/games/{self.game.id}/round/3/{page}/")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                sorted(
+                    (
+                        round_player.game_player.player_number,
+                        round_player.tricks_predicted,
+                        round_player.tricks_won,
+                    )
+                    for round_player in response.context["round_players"]
+                ),
+                [(1, 1, 0), (2, 0, 2)],
+            )
+
+        response = self.client.get(f"/games/{self.game.id}/round/4/scores/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertArchived()
+
+    def test_invalid_submissions_leave_the_game_archived(self):
+        archive_games([self.game.id])
+
+        # More tricks won than there were cards.
+        response = self.client.post(
+            f"/games/{self.game.id}/round/1/scores/",
+            {"tricks_won_1": 2, "tricks_won_2": 2},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].errors)
+
+        response = self.client.post(
+            f"/api/games/{self.game.id}/rounds/1/tricks/",
+            json.dumps({"tricks": {"1": 2, "2": 2}}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertArchived()
+
+    def test_saving_a_round_through_the_api_unarchives_the_game(self):
+        archive_games([self.game.id])
+
+        response = self.client.post(
+            f"/api/games/{self.game.id}/rounds/1/tricks/",
+            json.dumps({"tricks": {"1": 0, "2": 2}}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.game.refresh_from_db()
+        self.assertIsNone(self.game.archived_rounds)
+        self.assertEqual(GameRound.objects.filter(game=self.game).count(), 3)
+
+    def test_deleting_an_archived_game(self):
+        archive_games([self.game.id])
+
+        self.client.post(f"/games/delete/{self.game.id}/")
+
+        self.assertFalse(Game.objects.filter(id=self.game.id).exists())
+        self.assertEqual(player_stats(), {})
+
+    def test_command(self):
+        stdout = StringIO()
+
+        call_command("archive_games", "--days=0", stdout=stdout)
+
+        self.assertIn("Archived 1 of 1 games", stdout.getvalue())
+        self.assertTrue(Game.objects.filter(archived_rounds__isnull=False).exists())
+
+        call_command("archive_games", "--unarchive", stdout=stdout)
+
+        self.assertIn("Unarchived 1 of 1 games", stdout.getvalue())
+        self.assertFalse(Game.objects.filter(archived_rounds__isnull=False).exists())
+
+    def test_command_leaves_recent_games(self):
+        stdout = StringIO()
+
+        call_command("archive_games", stdout=stdout)
+
+        self.assertIn("Archived 0 of 0 games", stdout.getvalue())
+
+
+class ArchivedRoundConflictTest(CompletedGameMixin, TransactionTestCase):
+    """A conflict rolls back the transaction which saves the round, so this is a
+    TransactionTestCase."""
+
+    def test_a_conflicting_submission_leaves_the_game_archived(self):
+        archive_games([self.game.id])
+
+        # Another submission claims the game's next version while this one is saved.
+        with mock.patch.object(
+            GameSummary, "claim_next_version", return_value=False
+        ), mock.patch("apps.games.rounds.unarchive_games") as unarchive:
+            response = self.client.post(
+                f"/games/{self.game.id}/round/1/scores/",
+                {"tricks_won_1": 0, "tricks_won_2": 2},
+            )
+
+        self.assertEqual(response.status_code, 409)
+        # The conflict is found before the game is unarchived.
+        unarchive.assert_not_called()
+        self.assertArchived()
+
+    def test_a_submission_read_before_archiving_conflicts(self):
+        game = Game.objects.select_related("summary").get(id=self.game.id)
+        game_round, round_players = load_round(game, 1)
+
+        archive_games([self.game.id])
+
+        with self.assertRaises(RoundConflict):
+            save_round_scores(game, game_round, round_players, {1: 0, 2: 2})
+
+        self.assertArchived()
@@ -0,0 +1,182 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.players.models import PlayerStats
+
+from ..management.commands.rescore_games import audit_games, repair_drifts
+from ..models import GamePlayer, GamePlayerGameRound, GameSummary
+from .utils import create_game, create_players, create_user
+
+
+class ExplainHotQueriesCommandTest(TestCase):
+    def test_explains_each_query(self):
+        user = create_user()
+        create_game(user, create_players(user, 3))
+        stdout = StringIO()
+
+        call_command("explain_hot_queries", stdout=stdout)
+
+        self.assertIn("Round players", stdout.getvalue())
+        self.assertIn("Player list", stdout.getvalue())
+
+    def test_without_games(self):
+        with self.assertRaises(CommandError):
+            call_command("explain_hot_queries", stdout=StringIO())
+
+
+class RescoreGamesCommandTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 2), starting_round_card_number=2
+        )
+        self.client.force_login(self.user)
+
+        # Play the first round, then edit its bids, so the scores have been updated
+        # both ways.
+        round_url = f"/games/{self.game.id}/round/1"
+        self.client.post(
+            f"{round_url}/bids/", {"tricks_predicted_1": 1, "tricks_predicted_2": 0}
+        )
+        self.client.post(f"{round_url}/scores/", {"tricks_won_1": 1, "tricks_won_2": 1})
+        self.client.post(
+            f"{round_url}/bids/", {"tricks_predicted_1": 0, "tricks_predicted_2": 1}
+        )
+
+        self.other_game = create_game(self.user, create_players(self.user, 3))
+
+    def scores(self):
+        return list(
+            GamePlayer.objects.filter(game=self.game)
+            .order_by("player_number")
+            .values_list("score", flat=True)
+        )
+
+    def test_without_drift(self):
+        stdout = StringIO()
+
+        call_command("rescore_games", stdout=stdout)
+
+        self.assertIn(
+            "Replayed 2 scored rounds of 2 games", stdout.getvalue().splitlines()[-1]
+        )
+        self.assertIn("0 scores differed", stdout.getvalue())
+
+    def test_reports_drift(self):
+        GamePlayer.objects.filter(game=self.game, player_number=2).update(score=3)
+        stdout = StringIO()
+
+        call_command("rescore_games", "--batch-size", "1", stdout=stdout)
+
+        self.assertIn("saved score 3, replayed score 6", stdout.getvalue())
+        self.assertIn("1 scores differed, in 1 games", stdout.getvalue())
+        self.assertEqual(self.scores(), [1, 3])
+
+    def test_fixes_drift(self):
+        GamePlayer.objects.filter(game=self.game).update(score=0)
+        GamePlayer.objects.filter(game=self.other_game, player_number=1).update(score=5)
+        version = GameSummary.objects.get(game=self.game).version
+
+        call_command("rescore_games", "--fix", stdout=StringIO())
+
+        self.assertEqual(self.scores(), [1, 6])
+        self.assertFalse(
+            GamePlayer.objects.filter(game=self.other_game).exclude(score=0).exists()
+        )
+        summary = GameSummary.objects.get(game=self.game)
+        self.assertEqual(summary.version, version + 1)
+        self.assertEqual(summary.leaders, "Bob")
+
+        stdout = StringIO()
+        call_command("rescore_games", stdout=stdout)
+        self.assertIn("0 scores differed", stdout.getvalue())
+
+    def test_fix_audits_again_before_repairing(self):
+        GamePlayer.objects.filter(game=self.game, player_number=2).update(score=3)
+        _, drifts = audit_games([self.game.id])
+
+        # The next round is scored after the audit, and before the repair.
+        round_url = f"/games/{self.game.id}/round/2"
+        self.client.post(
+            f"{round_url}/bids/", {"tricks_predicted_1": 1, "tricks_predicted_2": 1}
+        )
+        self.client.post(f"{round_url}/scores/", {"tricks_won_1": 1, "tricks_won_2": 0})
+        version = GameSummary.objects.get(game=self.game).version
+
+        repair_drifts(drifts)
+
+        # Bob's round 2 score is kept, rather than replaced by his audited score.
+        self.assertEqual(self.scores(), [7, 6])
+        self.assertEqual(audit_games([self.game.id]), (4, []))
+        self.assertEqual(GameSummary.objects.get(game=self.game).version, version + 1)
+
+    def test_rounds_without_bids(self):
+        # An older game's round, scored without its bids.
+        GamePlayerGameRound.objects.filter(game_round__game=self.game).update(
+            tricks_predicted=None
+        )
+        stdout = StringIO()
+
+        call_command("rescore_games", stdout=stdout)
+
+        self.assertIn("saved score 6, replayed score 1", stdout.getvalue())
+        self.assertIn("1 scores differed, in 1 games", stdout.getvalue())
+
+    def test_fix_rebuilds_player_stats(self):
+        GamePlayer.objects.filter(game=self.game).update(score=0)
+        PlayerStats.objects.update(round_points=100)
+
+        call_command("rescore_games", "--fix", stdout=StringIO())
+
+        self.assertEqual(
+            sorted(PlayerStats.objects.values_list("round_points", flat=True)), [1, 6]
+        )
+
+    def test_workers_need_shared_database(self):
+        with self.assertRaises(CommandError):
+            call_command("rescore_games", "--workers", "2", stdout=StringIO())
+
+
+class RebuildPlayerStatsCommandTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 2)
+        self.client.force_login(self.user)
+
+        # Play a game starting with one card, which has a single round.
+        for _ in range(2):
+            game = create_game(self.user, self.players, starting_round_card_number=1)
+            round_url = f"/games/{game.id}/round/1"
+            self.client.post(
+                f"{round_url}/bids/", {"tricks_predicted_1": 1, "tricks_predicted_2": 1}
+            )
+            self.client.post(
+                f"{round_url}/scores/", {"tricks_won_1": 1, "tricks_won_2": 0}
+            )
+
+    def stats(self):
+        return list(
+            PlayerStats.objects.order_by("player__first_name").values_list(
+                "completed_games", "games_won", "rounds_played", "round_points"
+            )
+        )
+
+    def test_rebuild(self):
+        stats = self.stats()
+        PlayerStats.objects.update(games_won=10, round_points=0)
+        stdout = StringIO()
+
+        call_command("rebuild_player_stats", "--batch-size", "1", stdout=stdout)
+
+        self.assertEqual(self.stats(), stats)
+        self.assertEqual(stats, [(2, 2, 2, 12), (2, 0, 2, 0)])
+        self.assertIn(
+            "Rebuilt the statistics of 2 players from 2 games", stdout.getvalue()
+        )
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(CommandError):
+            call_command("rebuild_player_stats", "--batch-size", "0", stdout=StringIO())
@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from .utils import create_game, create_players, create_user
+
+
+class GameExportViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 2), starting_round_card_number=2
+        )
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+
+        round_url = f"/games/{self.game.id}/round/1"
+        self.client.post(
+            f"{round_url}/bids/", {"tricks_predicted_1": 1, "tricks_predicted_2": 0}
+        )
+        self.client.post(f"{round_url}/scores/", {"tricks_won_1": 1, "tricks_won_2": 1})
+
+        self.other_game = create_game(
+            self.user, create_players(self.user, 3), name="Other Game"
+        )
+
+        other_user = create_user(email="other@example.com")
+        create_game(other_user, create_players(other_user, 2), name="Not Mine")
+
+    def test_csv(self):
+        response = self.client.get("/games/export/csv/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("whist-games.csv", response["Content-Disposition"])
+
+        rows = list(
+            csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode()))
+        )
+
+        # Two players in two rounds of the first game, and three in one of the other.
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(
+            {row["game_name"] for row in rows}, {"Test Game", "Other Game"}
+        )
+        self.assertEqual(
+            {
+                key: rows[0][key]
+                for key in (
+                    "game_id",
+                    "round_number",
+                    "player_number",
+                    "tricks_predicted",
+                    "tricks_won",
+                    "round_score",
+                    "game_score",
+                )
+            },
+            {
+                "game_id": str(self.game.id),
+                "round_number": "1",
+                "player_number": "1",
+                "tricks_predicted": "1",
+                "tricks_won": "1",
+                "round_score": "6",
+                "game_score": "6",
+            },
+        )
+        # The second round hasn't been played.
+        self.assertEqual(rows[2]["tricks_predicted"], "")
+        self.assertEqual(rows[2]["round_score"], "")
+
+    def test_jsonl(self):
+        response = self.client.get("/games/export/jsonl/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/jsonl")
+
+        games = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+
+        self.assertEqual(
+            [game["id"] for game in games], [str(self.game.id), str(self.other_game.id)]
+        )
+        self.assertEqual(
+            games[0]["players"],
+            [
+                {"player_number": 1, "name": "Alice Smith", "score": 6},
+                {"player_number": 2, "name": "Bob Smith", "score": 1},
+            ],
+        )
+        self.assertEqual(
+            [game_round["round_number"] for game_round in games[0]["rounds"]], [1, 2]
+        )
+        self.assertEqual(
+            games[0]["rounds"][0]["players"][1],
+            {
+                "player_number": 2,
+                "tricks_predicted": 0,
+                "tricks_won": 1,
+                "round_score": 1,
+            },
+        )
+        self.assertEqual(len(games[1]["players"]), 3)
+
+    def test_without_games(self):
+        self.client.force_login(create_user(email="new@example.com"))
+
+        response = self.client.get("/games/export/jsonl/")
+
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+    def test_rows_are_streamed_in_chunks(self):
+        response = self.client.get("/games/export/csv/")
+
+        # The queries run as the response is read, not while the view builds it: one
+        # for the rows of the games, and one for any archived games.
+        with self.assertNumQueries(2):
+            lines = list(response.streaming_content)
+
+        self.assertEqual(len(lines), 8)
+
+    def test_logged_out(self):
+        self.client.logout()
+
+        response = self.client.get("/games/export/csv/")
+
+        self.assertEqual(response.status_code, 302)
+
+    async def test_asgi(self):
+        response = await self.async_client.get("/games/export/csv/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+
+        content = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(len(content.decode().splitlines()), 8)
@@ -0,0 +1,390 @@
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.players.models import Player
+
+from ..importing import GameImportError, import_games, read_games
+from ..models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from ..schedule import MAX_TO_ONE_TO_MAX, ONE_TO_MAX_TO_ONE
+from .utils import create_game, create_user
+
+
+def game_data(rounds, starting_round_card_number=2, **kwargs):
+    """A game to import with two players, Alice Smith and Bob Jones."""
+    return {
+        "name": "Historic Game",
+        "starting_round_card_number": starting_round_card_number,
+        "players": [
+            {"player_number": 1, "name": "Alice Smith"},
+            {"player_number": 2, "name": "Bob Jones"},
+        ],
+        "rounds": [
+            {
+                "round_number": round_number,
+                "players": [
+                    {
+                        "player_number": player_number,
+                        "tricks_predicted": tricks_predicted,
+                        "tricks_won": tricks_won,
+                    }
+                    for player_number, (tricks_predicted, tricks_won) in enumerate(
+                        round_tricks, start=1
+                    )
+                ],
+            }
+            for round_number, round_tricks in enumerate(rounds, start=1)
+        ],
+        **kwargs,
+    }
+
+
+# Every round of a game starting with two cards: 2, 1, then 2 cards.
+COMPLETED_ROUNDS = [
+    [(1, 1), (0, 1)],
+    [(1, 1), (1, 0)],
+    [(0, 0), (1, 2)],
+]
+
+
+class ImportGamesTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.alice = Player.objects.create(
+            first_name="Alice", last_name="Smith", created_by_user=self.user
+        )
+
+    def test_completed_game(self):
+        (game,) = import_games(
+            self.user,
+            [
+                game_data(
+                    COMPLETED_ROUNDS,
+                    inserted_at="2019-06-01T20:00:00+00:00",
+                    correct_prediction_points=10,
+                )
+            ],
+        )
+
+        game.refresh_from_db()
+        self.assertFalse(game.is_ongoing)
+        self.assertEqual(game.card_progression, MAX_TO_ONE_TO_MAX)
+        self.assertEqual(game.correct_prediction_points, 10)
+        self.assertEqual(game.inserted_at.year, 2019)
+        self.assertEqual(
+            list(
+                GameRound.objects.filter(game=game)
+                .order_by("round_number")
+                .values_list("round_number", "card_number", "trump_suit")
+            ),
+            [(1, 2, "H"), (2, 1, "C"), (3, 2, "D")],
+        )
+        game_players = list(
+            GamePlayer.objects.filter(game=game).order_by("player_number")
+        )
+        # Alice: 11 + 11 + 10. Bob: 1 + 0 + 2.
+        self.assertEqual([game_player.score for game_player in game_players], [32, 3])
+        # Alice is matched to her existing player, and Bob is created.
+        self.assertEqual(game_players[0].player, self.alice)
+        self.assertEqual(str(game_players[1].player), "Bob Jones")
+        self.assertEqual(game_players[1].player.created_by_user, self.user)
+        self.assertEqual(
+            GamePlayerGameRound.objects.filter(game_round__game=game).count(), 6
+        )
+
+        summary = GameSummary.objects.get(game=game)
+        self.assertEqual(summary.leaders, "Alice")
+        self.assertEqual(summary.latest_round_number, 3)
+        self.assertEqual(summary.latest_round_total_tricks_predicted, 1)
+
+    def test_ongoing_game(self):
+        (game,) = import_games(self.user, [game_data(COMPLETED_ROUNDS[:1])])
+
+        self.assertTrue(game.is_ongoing)
+
+        # The next round is ready for bids, as if the last round had just been played.
+        self.assertEqual(game.summary.latest_round_number, 2)
+        self.assertIsNone(game.summary.latest_round_total_tricks_predicted)
+        self.assertFalse(
+            GamePlayerGameRound.objects.filter(
+                game_round__game=game,
+                game_round__round_number=2,
+                tricks_predicted__isnull=False,
+            ).exists()
+        )
+
+        self.client.force_login(self.user)
+        response = self.client.post(
+            f"/games/{game.id}/round/2/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 1},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_ongoing_game_with_bids(self):
+        (game,) = import_games(
+            self.user, [game_data([COMPLETED_ROUNDS[0], [(1, None), (1, None)]])]
+        )
+
+        self.assertEqual(game.summary.latest_round_number, 2)
+        self.assertEqual(game.summary.latest_round_total_tricks_predicted, 2)
+        self.assertEqual(
+            list(
+                GamePlayer.objects.filter(game=game)
+                .order_by("player_number")
+                .values_list("score", flat=True)
+            ),
+            [6, 1],
+        )
+
+    def test_card_progression(self):
+        (game,) = import_games(
+            self.user,
+            [
+                game_data(
+                    [[(1, 1), (1, 0)], [(0, 0), (1, 2)], [(1, 1), (1, 0)]],
+                    card_progression=ONE_TO_MAX_TO_ONE,
+                )
+            ],
+        )
+
+        self.assertFalse(game.is_ongoing)
+        self.assertEqual(game.card_progression, ONE_TO_MAX_TO_ONE)
+        self.assertEqual(
+            list(
+                GameRound.objects.filter(game=game)
+                .order_by("round_number")
+                .values_list("card_number", flat=True)
+            ),
+            [1, 2, 1],
+        )
+
+    def test_invalid_games_import_nothing(self):
+        games = [
+            game_data(COMPLETED_ROUNDS),
+            # The bids can't add up to the number of cards.
+            game_data([[(1, 1), (1, 1)]]),
+            # The tricks won must add up to the number of cards.
+            game_data([[(1, 1), (0, 0)]]),
+            # Only the last round can be unscored.
+            game_data([[(1, None), (0, None)], [(1, 1), (1, 0)]]),
+            # A game with two cards only has three rounds.
+            game_data(COMPLETED_ROUNDS + [[(0, 0), (0, 1)]]),
+            # The starting card number must be dealable to every player.
+            game_data([], starting_round_card_number=27),
+        ]
+
+        with self.assertRaises(GameImportError) as context:
+            import_games(self.user, games)
+
+        self.assertEqual(len(context.exception.messages), 5)
+        self.assertIn("Game 2", context.exception.messages[0])
+        self.assertFalse(Game.objects.exists())
+        self.assertFalse(Player.objects.filter(first_name="Bob").exists())
+
+    def test_batches(self):
+        games = [game_data(COMPLETED_ROUNDS) for _ in range(5)]
+
+        # Opening and closing the transaction, matching (and creating) the players once
+        # for the import, checking each game's players with its form, inserting the
+        # games, game players, rounds, round players and summaries of each batch, then
+        # the players' statistics (read, created, read again and updated) and ratings
+        # (read and created) once.
+        with self.assertNumQueries(2 + 2 + 5 + 5 * 3 + 4 + 2):
+            import_games(self.user, games, batch_size=2)
+
+        self.assertEqual(Game.objects.count(), 5)
+        self.assertEqual(
+            set(GamePlayer.objects.values_list("score", flat=True)), {17, 3}
+        )
+
+    def test_export_round_trip(self):
+        # The players share a first name, so the game shows them as "Alice S." and
+        # "Alice J.".
+        game = create_game(
+            self.user,
+            [
+                self.alice,
+                Player.objects.create(
+                    first_name="Alice", last_name="Jones", created_by_user=self.user
+                ),
+            ],
+            starting_round_card_number=2,
+        )
+        player_count = Player.objects.count()
+        self.client.force_login(self.user)
+        self.client.post(
+            f"/games/{game.id}/round/1/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0},
+        )
+        self.client.post(
+            f"/games/{game.id}/round/1/scores/", {"tricks_won_1": 1, "tricks_won_2": 1}
+        )
+
+        for import_format in ("csv", "jsonl"):
+            with self.subTest(import_format=import_format):
+                response = self.client.get(f"/games/export/{import_format}/")
+                text = b"".join(response.streaming_content).decode()
+
+                (imported,) = import_games(self.user, read_games(text, import_format))
+
+                self.assertEqual(imported.name, game.name)
+                self.assertEqual(imported.inserted_at, game.inserted_at)
+                self.assertEqual(
+                    list(
+                        GamePlayer.objects.filter(game=imported)
+                        .order_by("player_number")
+                        .values_list("player", "score")
+                    ),
+                    list(
+                        GamePlayer.objects.filter(game=game)
+                        .order_by("player_number")
+                        .values_list("player", "score")
+                    ),
+                )
+                self.assertEqual(imported.summary.latest_round_number, 2)
+                self.assertEqual(Player.objects.count(), player_count)
+
+                imported.delete()
+
+    def test_export_round_trip_without_bids(self):
+        game = create_game(
+            self.user,
+            [
+                self.alice,
+                Player.objects.create(
+                    first_name="Bob", last_name="Jones", created_by_user=self.user
+                ),
+            ],
+            starting_round_card_number=2,
+        )
+        self.client.force_login(self.user)
+        self.client.post(
+            f"/games/{game.id}/round/1/scores/", {"tricks_won_1": 2, "tricks_won_2": 0}
+        )
+
+        for import_format in ("csv", "jsonl"):
+            with self.subTest(import_format=import_format):
+                response = self.client.get(f"/games/export/{import_format}/")
+                text = b"".join(response.streaming_content).decode()
+
+                (imported,) = import_games(self.user, read_games(text, import_format))
+
+                self.assertEqual(
+                    list(
+                        GamePlayerGameRound.objects.filter(
+                            game_round__game=imported, game_round__round_number=1
+                        )
+                        .order_by("game_player__player_number")
+                        .values_list("tricks_predicted", "tricks_won")
+                    ),
+                    [(None, 2), (None, 0)],
+                )
+                self.assertEqual(
+                    list(
+                        GamePlayer.objects.filter(game=imported)
+                        .order_by("player_number")
+                        .values_list("score", flat=True)
+                    ),
+                    [2, 0],
+                )
+
+                imported.delete()
+
+    def test_missing_bids_in_a_scored_round_are_checked(self):
+        rounds = [[(3, 1), (None, 1)]]
+
+        with self.assertRaises(GameImportError) as context:
+            import_games(self.user, [game_data(rounds)])
+
+        self.assertIn(
+            "Round 1: tricks_predicted_1: Ensure this value is less than or equal to 2.",
+            context.exception.messages[0],
+        )
+
+    def test_unreadable_files(self):
+        with self.assertRaises(GameImportError):
+            read_games("{not json", "jsonl")
+
+        with self.assertRaises(GameImportError):
+            read_games("game_id,game_name\n1,Game", "csv")
+
+
+class GameImportViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_login(self.user)
+
+    def upload(self, name: str, content: str):
+        return self.client.post(
+            "/games/import/",
+            {"file": SimpleUploadedFile(name, content.encode())},
+        )
+
+    def test_get(self):
+        response = self.client.get("/games/import/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_import(self):
+        response = self.upload("games.jsonl", json.dumps(game_data(COMPLETED_ROUNDS)))
+
+        self.assertRedirects(response, "/games/", fetch_redirect_response=False)
+        self.assertEqual(Game.objects.filter(created_by_user=self.user).count(), 1)
+
+    def test_invalid_game(self):
+        response = self.upload("games.jsonl", json.dumps(game_data([[(1, 1), (1, 1)]])))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Line 1", response.content.decode())
+        self.assertFalse(Game.objects.exists())
+
+    def test_wrong_file_type(self):
+        response = self.upload("games.txt", "games")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(".csv or .jsonl", response.content.decode())
+
+
+class ImportGamesCommandTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+
+    def test_import(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "games.jsonl"
+            path.write_text(
+                "\n".join(json.dumps(game_data(COMPLETED_ROUNDS)) for _ in range(3))
+            )
+            stdout = StringIO()
+
+            call_command(
+                "import_games", str(path), "--user", self.user.email, stdout=stdout
+            )
+
+        self.assertIn("Imported 3 games", stdout.getvalue())
+        self.assertEqual(Game.objects.filter(created_by_user=self.user).count(), 3)
+
+    def test_invalid_game(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "games.jsonl"
+            path.write_text(json.dumps(game_data([[(1, 1), (1, 1)]])))
+            stderr = StringIO()
+
+            with self.assertRaises(CommandError):
+                call_command(
+                    "import_games",
+                    str(path),
+                    "--user",
+                    self.user.email,
+                    stdout=StringIO(),
+                    stderr=stderr,
+                )
+
+        self.assertIn("Line 1", stderr.getvalue())
+        self.assertFalse(Game.objects.exists())
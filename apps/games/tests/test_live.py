@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..live import BroadcastHub, game_channel, hub, server_sent_event
+from .utils import create_game, create_players, create_user
+
+
+class BroadcastHubTest(SimpleTestCase):
+    async def test_delivers_to_subscribers_of_channel(self):
+        broadcast_hub = BroadcastHub()
+
+        with broadcast_hub.subscribe("game:1") as subscription, broadcast_hub.subscribe(
+            "game:2"
+        ) as other_subscription:
+            # Messages are published from the sync views' threads.
+            publisher = threading.Thread(
+                target=broadcast_hub.publish, args=("game:1", "hello")
+            )
+            publisher.start()
+            publisher.join()
+
+            self.assertEqual(await subscription.get(1), "hello")
+            self.assertIsNone(await other_subscription.get(0.01))
+
+    async def test_unsubscribes_on_exit(self):
+        broadcast_hub = BroadcastHub()
+
+        with broadcast_hub.subscribe("game:1"):
+            self.assertEqual(broadcast_hub.subscriber_count("game:1"), 1)
+
+        self.assertEqual(broadcast_hub.subscriber_count("game:1"), 0)
+
+
+@override_settings(LIVE_SCOREBOARD_ENABLED=True)
+class LiveScoreboardPublishTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(self.user, create_players(self.user, 3))
+        self.client.force_login(self.user)
+
+    def _post_bids(self):
+        self.client.post(
+            f"/games/{self.game.id}/round/1/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0, "tricks_predicted_3": 0},
+        )
+
+    def test_publishes_round_update_on_commit(self):
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._post_bids()
+
+                publish.assert_not_called()
+
+        channel, message = publish.call_args.args
+        self.assertEqual(channel, game_channel(self.game.id))
+        self.assertTrue(message.startswith("id: 2\n"))
+
+        update = json.loads(message.split("data: ")[1])
+        self.assertEqual(update["event"], "bids")
+        self.assertEqual(update["round_number"], 1)
+        self.assertEqual(
+            sorted(
+                (player["player_number"], player["tricks_predicted"], player["score"])
+                for player in update["players"]
+            ),
+            [(1, 1, 0), (2, 0, 0), (3, 0, 0)],
+        )
+
+    def test_publishes_deletion(self):
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(f"/games/delete/{self.game.id}/")
+
+        self.assertIn('"event":"deleted"', publish.call_args.args[1])
+
+    @override_settings(LIVE_SCOREBOARD_ENABLED=False)
+    def test_publishes_nothing_when_disabled(self):
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._post_bids()
+
+        publish.assert_not_called()
+
+
+@override_settings(LIVE_SCOREBOARD_ENABLED=True)
+class GameLiveViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.other_user = create_user(email="other@example.com")
+        self.game = create_game(self.user, create_players(self.user, 3))
+        self.live_url = f"/games/{self.game.id}/live/"
+        self.async_client.force_login(self.user)
+
+    async def _read_events(self, response, count: int) -> list:
+        events = response.streaming_content.__aiter__()
+        chunks = [await asyncio.wait_for(anext(events), 1) for _ in range(count)]
+        await events.aclose()
+
+        return chunks
+
+    async def test_streams_published_events(self):
+        response = await self.async_client.get(f"{self.live_url}?version=1")
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        events = response.streaming_content.__aiter__()
+        self.assertEqual(await anext(events), b"retry: 3000\n\n")
+
+        event = server_sent_event({"event": "bids", "version": 2}, 2)
+        hub.publish(game_channel(self.game.id), event)
+
+        self.assertEqual(await asyncio.wait_for(anext(events), 1), event.encode())
+        await events.aclose()
+
+    async def test_stale_version_is_reported(self):
+        response = await self.async_client.get(self.live_url, HTTP_LAST_EVENT_ID="0")
+
+        _, event = await self._read_events(response, 2)
+
+        self.assertEqual(event, b'id: 1\ndata: {"event":"stale","version":1}\n\n')
+
+    async def test_get_for_other_user(self):
+        await sync_to_async(self.async_client.force_login)(self.other_user)
+
+        response = await self.async_client.get(self.live_url)
+
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(LIVE_SCOREBOARD_ENABLED=False)
+    async def test_not_found_when_disabled(self):
+        response = await self.async_client.get(self.live_url)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_found_through_wsgi(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.live_url)
+
+        self.assertEqual(response.status_code, 404)
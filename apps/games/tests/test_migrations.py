@@ -0,0 +1,93 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from .utils import create_players, create_user
+
+BEFORE = [("games", "0006_gamesummary")]
+AFTER = [("games", "0007_remove_duplicate_rows")]
+
+
+class RemoveDuplicateRowsMigrationTest(TransactionTestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 2)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(BEFORE)
+        self.apps = executor.loader.project_state(BEFORE).apps
+
+        Game = self.apps.get_model("games", "Game")
+        GamePlayer = self.apps.get_model("games", "GamePlayer")
+        GameRound = self.apps.get_model("games", "GameRound")
+
+        self.game = Game.objects.create(
+            created_by_user_id=self.user.pk, starting_round_card_number=2
+        )
+        self.game_players = [
+            GamePlayer.objects.create(
+                game=self.game, player_id=player.pk, player_number=player_number
+            )
+            for player_number, player in enumerate(self.players, start=1)
+        ]
+        self.game_round = GameRound.objects.create(
+            game=self.game, round_number=1, card_number=2, trump_suit="H"
+        )
+
+    def tearDown(self):
+        # Any duplicates left would stop the migrations back to the latest.
+        self.apps.get_model("games", "GamePlayerGameRound").objects.all().delete()
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def create_round_player(self, game_round, game_player, **tricks):
+        GamePlayerGameRound = self.apps.get_model("games", "GamePlayerGameRound")
+
+        return GamePlayerGameRound.objects.create(
+            game_round=game_round, game_player=game_player, **tricks
+        )
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(AFTER)
+
+    def test_removes_duplicates_which_lose_nothing(self):
+        GameRound = self.apps.get_model("games", "GameRound")
+        GamePlayerGameRound = self.apps.get_model("games", "GamePlayerGameRound")
+
+        for _ in range(2):
+            self.create_round_player(
+                self.game_round, self.game_players[0], tricks_predicted=1
+            )
+
+        self.create_round_player(self.game_round, self.game_players[1])
+
+        # The next round, saved twice.
+        for _ in range(2):
+            game_round = GameRound.objects.create(
+                game=self.game, round_number=2, card_number=1, trump_suit="C"
+            )
+
+            for game_player in self.game_players:
+                self.create_round_player(game_round, game_player)
+
+        self.migrate()
+
+        self.assertEqual(GameRound.objects.filter(round_number=2).count(), 1)
+        self.assertEqual(
+            GamePlayerGameRound.objects.filter(game_round=self.game_round).count(), 2
+        )
+        self.assertEqual(GamePlayerGameRound.objects.count(), 4)
+
+    def test_stops_at_duplicates_which_differ(self):
+        self.create_round_player(
+            self.game_round, self.game_players[0], tricks_predicted=1
+        )
+        self.create_round_player(
+            self.game_round, self.game_players[0], tricks_predicted=0
+        )
+
+        with self.assertRaisesMessage(Exception, "has differing rows for round"):
+            self.migrate()
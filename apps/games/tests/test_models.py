@@ -0,0 +1,64 @@
+from django.db import IntegrityError
+from django.test import TestCase
+
+from ..models import GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from .utils import create_game, create_players, create_user
+
+
+class GameSummaryTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 3)
+
+    def test_update_for_game(self):
+        game = create_game(self.user, self.players, scores=[4, 9, 9])
+        GameRound.objects.create(
+            game=game,
+            round_number=2,
+            trump_suit="C",
+            card_number=2,
+            total_tricks_predicted=1,
+        )
+
+        GameSummary.update_for_game(game)
+
+        summary = GameSummary.objects.get(game=game)
+        self.assertEqual(summary.leaders, "Bob, Carol")
+        self.assertEqual(summary.player_names, "Alice, Bob, Carol")
+        self.assertEqual(summary.latest_round_number, 2)
+        self.assertEqual(summary.latest_round_card_number, 2)
+        self.assertEqual(summary.latest_round_total_tricks_predicted, 1)
+        self.assertEqual(summary.trump_suit, "C")
+        self.assertEqual(summary.dealer_player_number, 3)
+
+    def test_deleted_with_game(self):
+        game = create_game(self.user, self.players)
+
+        game.delete()
+
+        self.assertFalse(GameSummary.objects.exists())
+
+
+class GameConstraintsTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(self.user, create_players(self.user, 2))
+
+    def test_round_numbers_are_unique_in_game(self):
+        with self.assertRaises(IntegrityError):
+            GameRound.objects.create(game=self.game, round_number=1, card_number=3)
+
+    def test_player_numbers_are_unique_in_game(self):
+        with self.assertRaises(IntegrityError):
+            GamePlayer.objects.create(
+                game=self.game,
+                player=create_players(self.user, 1)[0],
+                player_number=1,
+            )
+
+    def test_game_players_are_unique_in_round(self):
+        with self.assertRaises(IntegrityError):
+            GamePlayerGameRound.objects.create(
+                game_round=self.game.gameround_set.get(),
+                game_player=self.game.gameplayer_set.first(),
+            )
@@ -0,0 +1,105 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from apps.players.models import PlayerRating
+
+from ..importing import import_games
+from ..ratings import INITIAL_RATING, rating_changes
+from .test_importing import COMPLETED_ROUNDS, game_data
+from .utils import create_game, create_players, create_user
+
+
+class RatingChangesTest(SimpleTestCase):
+    def test_two_equal_players(self):
+        self.assertEqual(rating_changes([1500, 1500], [20, 10]), [16, -16])
+
+    def test_tie(self):
+        self.assertEqual(rating_changes([1500, 1500], [20, 20]), [0, 0])
+
+    def test_finishing_in_the_middle(self):
+        self.assertEqual(rating_changes([1500, 1500, 1500], [5, 30, 12]), [-16, 16, 0])
+
+    def test_beating_a_stronger_player_gains_more(self):
+        underdog_change, favourite_change = rating_changes([1400, 1600], [20, 10])
+
+        self.assertGreater(underdog_change, 16)
+        self.assertAlmostEqual(underdog_change, -favourite_change)
+
+    def test_single_player(self):
+        self.assertEqual(rating_changes([1500], [10]), [0])
+
+
+class PlayerRatingsTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 2)
+        self.client.force_login(self.user)
+
+    def play_game(self, tricks_won_1: int) -> None:
+        """Play a game with one round, in which player 1 bids one trick."""
+        game = create_game(self.user, self.players, starting_round_card_number=1)
+        round_url = f"/games/{game.id}/round/1"
+        self.client.post(
+            f"{round_url}/bids/", {"tricks_predicted_1": 1, "tricks_predicted_2": 1}
+        )
+        self.client.post(
+            f"{round_url}/scores/",
+            {"tricks_won_1": tricks_won_1, "tricks_won_2": 1 - tricks_won_1},
+        )
+
+    def ratings(self):
+        return list(
+            PlayerRating.objects.order_by("player__first_name").values_list(
+                "rating", "games_rated"
+            )
+        )
+
+    def test_completed_game(self):
+        self.play_game(1)
+
+        self.assertEqual(
+            self.ratings(), [(INITIAL_RATING + 16, 1), (INITIAL_RATING - 16, 1)]
+        )
+        self.assertEqual(
+            PlayerRating.objects.filter(created_by_user=self.user).count(), 2
+        )
+
+    def test_ongoing_game(self):
+        game = create_game(self.user, self.players, starting_round_card_number=2)
+        round_url = f"/games/{game.id}/round/1"
+        self.client.post(
+            f"{round_url}/bids/", {"tricks_predicted_1": 1, "tricks_predicted_2": 0}
+        )
+        self.client.post(f"{round_url}/scores/", {"tricks_won_1": 1, "tricks_won_2": 1})
+
+        self.assertFalse(PlayerRating.objects.exists())
+
+    def test_replay_matches_incremental_ratings(self):
+        self.play_game(1)
+        self.play_game(0)
+        self.play_game(1)
+        ratings = self.ratings()
+        PlayerRating.objects.update(rating=0)
+        stdout = StringIO()
+
+        call_command("replay_ratings", stdout=stdout)
+
+        self.assertEqual(self.ratings(), ratings)
+        self.assertEqual(ratings[0][1], 3)
+        self.assertIn("Rated 2 players from 3 completed games", stdout.getvalue())
+
+    def test_imported_games(self):
+        import_games(
+            self.user,
+            [
+                game_data(COMPLETED_ROUNDS, inserted_at="2019-06-01T20:00:00+00:00"),
+                game_data(COMPLETED_ROUNDS[:1]),
+            ],
+        )
+
+        # Only the completed game is rated, and Alice won it.
+        self.assertEqual(
+            self.ratings(), [(INITIAL_RATING + 16, 1), (INITIAL_RATING - 16, 1)]
+        )
@@ -0,0 +1,116 @@
+import threading
+from typing import Dict, List, Tuple
+from unittest import mock
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from ..models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from ..rounds import (
+    RoundConflict,
+    load_round,
+    save_round_bids,
+    save_round_scores,
+)
+from .utils import create_game, create_players, create_user
+
+
+class ConcurrentRoundSubmissionTest(TransactionTestCase):
+    """Scorekeepers submitting the same round at once, each from its own thread, and so
+    with its own database connection and transaction."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 2), starting_round_card_number=2
+        )
+        save_round_bids(*self.load_round(), {1: 1, 2: 0})
+
+    def load_round(self) -> Tuple[Game, GameRound, List[GamePlayerGameRound]]:
+        game = Game.objects.select_related("summary").get(id=self.game.id)
+        game_round, round_players = load_round(game, 1)
+
+        return game, game_round, round_players
+
+    def submit_scores(self, submissions: List[Dict[int, int]]) -> List:
+        """Every submission reads the round before any saves, then they save in turn."""
+        all_read = threading.Barrier(len(submissions))
+        turns = [threading.Event() for _ in submissions]
+        results: List = [None] * len(submissions)
+
+        def submit(index: int) -> None:
+            try:
+                game, game_round, round_players = self.load_round()
+                all_read.wait()
+                turns[index].wait()
+                save_round_scores(game, game_round, round_players, submissions[index])
+                results[index] = "saved"
+            except RoundConflict:
+                results[index] = "conflict"
+            finally:
+                connection.close()
+
+                if index + 1 < len(turns):
+                    turns[index + 1].set()
+
+        threads = [
+            threading.Thread(target=submit, args=(index,))
+            for index in range(len(submissions))
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        turns[0].set()
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def scores(self) -> List[int]:
+        return list(
+            GamePlayer.objects.filter(game=self.game)
+            .order_by("player_number")
+            .values_list("score", flat=True)
+        )
+
+    def test_only_the_first_submission_is_saved(self):
+        results = self.submit_scores([{1: 1, 2: 1}, {1: 2, 2: 0}])
+
+        self.assertEqual(results, ["saved", "conflict"])
+        # Alice's correct bid is scored once, and the next round is only created once.
+        self.assertEqual(self.scores(), [6, 1])
+        self.assertEqual(
+            GameRound.objects.filter(game=self.game, round_number=2).count(), 1
+        )
+        self.assertEqual(
+            Game.objects.values_list("summary__version", flat=True).get(
+                id=self.game.id
+            ),
+            3,
+        )
+
+    def test_retry_after_a_conflict(self):
+        self.submit_scores([{1: 1, 2: 1}, {1: 2, 2: 0}])
+
+        # Retried from the round's current state, the submission is an edit of it.
+        save_round_scores(*self.load_round(), {1: 2, 2: 0})
+
+        self.assertEqual(self.scores(), [2, 5])
+        self.assertEqual(GameRound.objects.filter(game=self.game).count(), 2)
+
+    def test_conflict_on_the_round_page(self):
+        self.client.force_login(self.user)
+
+        # Another submission claims the game's next version while this one is saved.
+        with mock.patch.object(GameSummary, "claim_next_version", return_value=False):
+            response = self.client.post(
+                f"/games/{self.game.id}/round/1/scores/",
+                {"tricks_won_1": 1, "tricks_won_2": 1},
+            )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, "submit it again", status_code=409)
+        self.assertEqual(self.scores(), [0, 0])
+        self.assertFalse(GameRound.objects.filter(round_number=2).exists())
@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase
+
+from ..models import Game
+from ..schedule import (
+    MAX_TO_ONE_ONE_TO_MAX,
+    MAX_TO_ONE_TO_MAX,
+    ONE_TO_MAX_TO_ONE,
+    game_schedule,
+    is_last_round,
+    round_schedule,
+)
+
+
+def card_numbers(card_progression: str, max_card_number: int) -> list:
+    return [
+        schedule.card_number
+        for schedule in game_schedule(card_progression, max_card_number, False, 3)
+    ]
+
+
+class ScheduleTest(SimpleTestCase):
+    def test_card_progressions(self):
+        self.assertEqual(card_numbers(MAX_TO_ONE_TO_MAX, 3), [3, 2, 1, 2, 3])
+        self.assertEqual(card_numbers(ONE_TO_MAX_TO_ONE, 3), [1, 2, 3, 2, 1])
+        self.assertEqual(card_numbers(MAX_TO_ONE_ONE_TO_MAX, 3), [3, 2, 1, 1, 2, 3])
+        self.assertEqual(card_numbers(MAX_TO_ONE_TO_MAX, 1), [1])
+
+    def test_trump_suits_and_dealers(self):
+        schedule = game_schedule(MAX_TO_ONE_TO_MAX, 4, False, 3)
+
+        self.assertEqual("".join(round.trump_suit for round in schedule), "HCDSNHC")
+        self.assertEqual(
+            [round.dealer_player_number for round in schedule], [2, 3, 1, 2, 3, 1, 2]
+        )
+
+    def test_score_factor(self):
+        schedule = game_schedule(MAX_TO_ONE_ONE_TO_MAX, 2, True, 3)
+
+        self.assertEqual([round.score_factor for round in schedule], [1, 1, 1, 2])
+
+    def test_round_schedule(self):
+        game = Game(
+            starting_round_card_number=2,
+            double_last_round_points=True,
+            card_progression=ONE_TO_MAX_TO_ONE,
+        )
+
+        self.assertEqual(round_schedule(game, 2, 4), (2, "C", 3, 1))
+        self.assertFalse(is_last_round(game, 2))
+        self.assertTrue(is_last_round(game, 3))
+
+        for round_number in (0, -1, 4):
+            with self.subTest(round_number=round_number):
+                with self.assertRaises(IndexError):
+                    round_schedule(game, round_number, 4)
+
+    def test_schedule_is_memoised(self):
+        self.assertIs(
+            game_schedule(MAX_TO_ONE_TO_MAX, 5, True, 4),
+            game_schedule(MAX_TO_ONE_TO_MAX, 5, True, 4),
+        )
@@ -0,0 +1,191 @@
+from django.test import SimpleTestCase
+
+from ..models import Game
+from ..scoring import (
+    ScoringRules,
+    build_round_table,
+    compile_scoring_rules,
+    game_scorer,
+    replay_scores,
+)
+
+
+def round_row(round_number, player_number, tricks_predicted, tricks_won):
+    return {
+        "game_round__round_number": round_number,
+        "game_player__player_number": player_number,
+        "tricks_predicted": tricks_predicted,
+        "tricks_won": tricks_won,
+    }
+
+
+class ScoringTest(SimpleTestCase):
+    def setUp(self):
+        self.game = Game(
+            correct_prediction_points=10,
+            starting_round_card_number=2,
+            double_last_round_points=True,
+        )
+
+    def test_score_factor(self):
+        self.assertEqual(game_scorer(self.game).score_factor(1), 1)
+        self.assertEqual(game_scorer(self.game).score_factor(3), 2)
+
+        self.game.double_last_round_points = False
+        self.assertEqual(game_scorer(self.game).score_factor(3), 1)
+
+    def test_round_score(self):
+        scorer = game_scorer(self.game)
+
+        self.assertEqual(scorer.round_score(1, 1, 1), 11)
+        self.assertEqual(scorer.round_score(1, 0, 0), 10)
+        self.assertEqual(scorer.round_score(1, 2, 1), 1)
+        self.assertEqual(scorer.round_score(3, 1, 1), 22)
+
+    def test_missed_and_zero_prediction_points(self):
+        self.game.missed_prediction_points = 2
+        self.game.zero_prediction_points = 3
+        scorer = game_scorer(self.game)
+
+        self.assertEqual(scorer.round_score(1, 0, 0), 3)
+        self.assertEqual(scorer.round_score(1, 1, 1), 11)
+        self.assertEqual(scorer.round_score(1, 2, 0), -4)
+        self.assertEqual(scorer.round_score(3, 0, 1), -2)
+        self.assertEqual(scorer.round_points(1)[0], (3, -1, -2))
+
+    def test_round_score_without_bid(self):
+        self.game.missed_prediction_points = 2
+        scorer = game_scorer(self.game)
+
+        # A missing bid is a miss, without the penalty for the tricks it was out by.
+        self.assertEqual(scorer.round_score(1, None, 0), 0)
+        self.assertEqual(scorer.round_score(1, None, 1), 1)
+        self.assertEqual(scorer.round_score(3, None, 2), 4)
+        self.assertEqual(
+            scorer.total_scores([("alice", 1, None, 1), ("alice", 3, 1, 1)]),
+            {"alice": 23},
+        )
+
+    def test_compiled_rules_are_cached(self):
+        scorer = game_scorer(self.game)
+
+        other_game = Game(
+            correct_prediction_points=10,
+            starting_round_card_number=2,
+            double_last_round_points=True,
+        )
+
+        self.assertIs(game_scorer(other_game), scorer)
+        self.assertIs(compile_scoring_rules(ScoringRules.for_game(self.game)), scorer)
+
+    def test_total_scores(self):
+        self.assertEqual(
+            game_scorer(self.game).total_scores(
+                [("alice", 1, 1, 1), ("bob", 1, 0, 1), ("alice", 3, 0, 0)]
+            ),
+            {"alice": 31, "bob": 1},
+        )
+
+    def test_build_round_table(self):
+        round_rows = [
+            round_row(1, 1, 1, 1),
+            round_row(1, 2, 0, 1),
+            round_row(2, 1, 0, 0),
+            round_row(2, 2, 0, 1),
+            round_row(3, 1, 1, 1),
+            round_row(3, 2, 0, 1),
+        ]
+
+        game_rounds = build_round_table(self.game, round_rows, 3)
+
+        self.assertEqual(
+            [round_number for round_number, _ in game_rounds], ["3", "2", "1"]
+        )
+        self.assertEqual(
+            [(cell["score"], cell["running_total"]) for cell in game_rounds[0][1]],
+            [(22, 43), (2, 4)],
+        )
+        self.assertEqual(
+            [(cell["score"], cell["running_total"]) for cell in game_rounds[2][1]],
+            [(11, 11), (1, 1)],
+        )
+        self.assertEqual(game_rounds[2][1][1]["player_number"], 2)
+
+    def test_build_round_table_with_incomplete_round(self):
+        round_rows = [
+            round_row(1, 1, 1, 1),
+            round_row(1, 2, 0, 1),
+            round_row(2, 1, 0, None),
+            round_row(2, 2, 1, None),
+            round_row(3, 1, None, None),
+            round_row(3, 2, None, None),
+        ]
+
+        game_rounds = build_round_table(self.game, round_rows, 2)
+
+        self.assertEqual(len(game_rounds), 2)
+        self.assertEqual(
+            game_rounds[0][1][0],
+            {
+                "tricks_won": "",
+                "tricks_predicted": 0,
+                "score": "",
+                "running_total": 11,
+                "player_number": 1,
+            },
+        )
+
+    def test_build_round_table_with_missing_bids(self):
+        round_rows = [
+            round_row(1, 1, None, 1),
+            round_row(1, 2, 0, 1),
+            round_row(2, 1, None, None),
+            round_row(2, 2, None, None),
+        ]
+
+        game_rounds = build_round_table(self.game, round_rows, 2)
+
+        self.assertEqual(
+            game_rounds[1][1][0],
+            {
+                "tricks_won": 1,
+                "tricks_predicted": "",
+                "score": 1,
+                "running_total": 1,
+                "player_number": 1,
+            },
+        )
+
+    def test_build_round_table_without_rounds(self):
+        self.assertEqual(build_round_table(self.game, [], 0), [])
+
+    def test_replay_scores(self):
+        other_game = Game(
+            correct_prediction_points=5,
+            starting_round_card_number=2,
+            double_last_round_points=False,
+        )
+        round_rows = [
+            ("game", "player_1", 1, 1, 1),
+            ("other_game", "player_3", 3, 1, 1),
+            ("game", "player_2", 1, 0, 1),
+            ("game", "player_1", 3, 1, 1),
+            ("game", "player_2", 3, 0, 1),
+        ]
+
+        self.assertEqual(
+            replay_scores({"game": self.game, "other_game": other_game}, round_rows),
+            {"player_1": 33, "player_2": 3, "player_3": 6},
+        )
+
+    def test_replay_scores_with_missing_bids(self):
+        round_rows = [
+            ("game", "player_1", 1, None, 1),
+            ("game", "player_2", 1, 0, 1),
+            ("game", "player_1", 3, 1, 1),
+        ]
+
+        self.assertEqual(
+            replay_scores({"game": self.game}, round_rows),
+            {"player_1": 23, "player_2": 1},
+        )
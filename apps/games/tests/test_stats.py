@@ -0,0 +1,218 @@
+import json
+from io import StringIO
+from typing import Dict
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.players.models import Player, PlayerStats
+
+from ..importing import import_games
+from ..stats import STAT_FIELDS, PlayerStatsChanges, locked_player_stats
+from .utils import create_game, create_user
+
+
+def player_stats() -> Dict[str, Dict[str, int]]:
+    """Every player's saved statistics, by first name, leaving out any which are all 0."""
+    stats_by_name = {
+        stats.player.first_name: {field: getattr(stats, field) for field in STAT_FIELDS}
+        for stats in PlayerStats.objects.select_related("player")
+    }
+
+    return {name: stats for name, stats in stats_by_name.items() if any(stats.values())}
+
+
+class PlayerStatsTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.alice = Player.objects.create(
+            first_name="Alice", last_name="Smith", created_by_user=self.user
+        )
+        self.bob = Player.objects.create(
+            first_name="Bob", last_name="Jones", created_by_user=self.user
+        )
+        self.game = create_game(
+            self.user, [self.alice, self.bob], starting_round_card_number=2
+        )
+        self.client.force_login(self.user)
+
+    def play(self, round_number: int, bids=None, tricks=None) -> None:
+        round_url = f"/games/{self.game.id}/round/{round_number}"
+
+        if bids is not None:
+            response = self.client.post(
+                f"{round_url}/bids/",
+                {"tricks_predicted_1": bids[0], "tricks_predicted_2": bids[1]},
+            )
+            self.assertEqual(response.status_code, 302)
+
+        if tricks is not None:
+            response = self.client.post(
+                f"{round_url}/scores/",
+                {"tricks_won_1": tricks[0], "tricks_won_2": tricks[1]},
+            )
+            self.assertEqual(response.status_code, 302)
+
+    def play_game(self) -> None:
+        # Alice scores 6, 5 and 0, and Bob 1, 1 and 2.
+        self.play(1, (1, 0), (1, 1))
+        self.play(2, (0, 0), (0, 1))
+        self.play(3, (1, 0), (0, 2))
+
+    def assertMatchesRebuild(self) -> None:
+        """Check the incrementally updated statistics match those rebuilt from scratch."""
+        stats = player_stats()
+
+        call_command("rebuild_player_stats", stdout=StringIO())
+
+        self.assertEqual(stats, player_stats())
+
+    def test_completed_game(self):
+        self.play_game()
+
+        self.assertEqual(
+            player_stats(),
+            {
+                "Alice": {
+                    "completed_games": 1,
+                    "games_won": 1,
+                    "rounds_played": 3,
+                    "correct_predictions": 2,
+                    "round_points": 11,
+                    "zero_bids": 1,
+                    "zero_bids_made": 1,
+                },
+                "Bob": {
+                    "completed_games": 1,
+                    "games_won": 0,
+                    "rounds_played": 3,
+                    "correct_predictions": 0,
+                    "round_points": 4,
+                    "zero_bids": 3,
+                    "zero_bids_made": 0,
+                },
+            },
+        )
+        self.assertMatchesRebuild()
+
+    def test_ongoing_game(self):
+        self.play(1, (1, 0), (1, 1))
+        # Bids alone don't count until the round is scored.
+        self.play(2, (0, 0))
+
+        stats = player_stats()
+
+        self.assertEqual(stats["Alice"]["rounds_played"], 1)
+        self.assertEqual(stats["Alice"]["completed_games"], 0)
+        self.assertEqual(stats["Bob"]["zero_bids"], 1)
+        self.assertMatchesRebuild()
+
+    def test_editing_tricks_won_reverses_the_old_round(self):
+        self.play(1, (1, 0), (1, 1))
+        self.play(1, tricks=(0, 2))
+
+        stats = player_stats()
+
+        self.assertEqual(stats["Alice"]["rounds_played"], 1)
+        self.assertEqual(stats["Alice"]["correct_predictions"], 0)
+        self.assertEqual(stats["Alice"]["round_points"], 0)
+        self.assertEqual(stats["Bob"]["round_points"], 2)
+        self.assertMatchesRebuild()
+
+    def test_editing_bids_reverses_the_old_round(self):
+        self.play(1, (1, 0), (1, 1))
+        self.play(1, bids=(0, 1))
+
+        stats = player_stats()
+
+        self.assertEqual(stats["Alice"]["zero_bids"], 1)
+        self.assertEqual(stats["Alice"]["round_points"], 1)
+        self.assertEqual(stats["Bob"]["zero_bids"], 0)
+        self.assertEqual(stats["Bob"]["correct_predictions"], 1)
+        self.assertMatchesRebuild()
+
+    def test_editing_a_completed_game_changes_the_winner(self):
+        self.play_game()
+
+        # Alice now scores 0 in the first round and Bob 2, so they tie on 5.
+        self.play(1, tricks=(0, 2))
+
+        self.assertEqual(player_stats()["Alice"]["games_won"], 1)
+        self.assertEqual(player_stats()["Bob"]["games_won"], 1)
+        self.assertMatchesRebuild()
+
+        # Bob's bid of 2 in the last round is now right, so he wins outright.
+        self.play(3, bids=(1, 2))
+
+        self.assertEqual(player_stats()["Alice"]["games_won"], 0)
+        self.assertEqual(player_stats()["Bob"]["games_won"], 1)
+        self.assertEqual(player_stats()["Bob"]["completed_games"], 1)
+        self.assertMatchesRebuild()
+
+    def test_deleting_a_game(self):
+        self.play_game()
+        other_game = create_game(
+            self.user, [self.alice, self.bob], starting_round_card_number=2
+        )
+        self.client.post(
+            f"/games/{other_game.id}/round/1/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0},
+        )
+        self.client.post(
+            f"/games/{other_game.id}/round/1/scores/",
+            {"tricks_won_1": 1, "tricks_won_2": 1},
+        )
+
+        self.client.post(f"/games/delete/{self.game.id}/")
+
+        stats = player_stats()
+
+        self.assertEqual(stats["Alice"]["rounds_played"], 1)
+        self.assertEqual(stats["Alice"]["completed_games"], 0)
+        self.assertEqual(stats["Alice"]["games_won"], 0)
+        self.assertMatchesRebuild()
+
+    def test_importing_games(self):
+        self.play_game()
+        response = self.client.get("/games/export/jsonl/")
+        text = b"".join(response.streaming_content).decode()
+
+        import_games(self.user, [json.loads(line) for line in text.splitlines()])
+
+        stats = player_stats()
+
+        self.assertEqual(stats["Alice"]["completed_games"], 2)
+        self.assertEqual(stats["Alice"]["games_won"], 2)
+        self.assertEqual(stats["Bob"]["round_points"], 8)
+        self.assertMatchesRebuild()
+
+    def test_changes_which_cancel_out_are_not_saved(self):
+        changes = PlayerStatsChanges()
+        changes.add_round(self.alice.id, 1, 1, 6)
+        changes.add_round(self.alice.id, 1, 1, 6, sign=-1)
+
+        with self.assertNumQueries(0):
+            changes.save()
+
+        self.assertFalse(PlayerStats.objects.exists())
+
+    def test_stats_created_by_another_transaction_are_added_to(self):
+        PlayerStats.objects.create(player=self.alice, rounds_played=3, round_points=10)
+        changes = PlayerStatsChanges()
+        changes.add_round(self.alice.id, 1, 1, 6)
+        changes.add_round(self.bob.id, 0, 1, 1)
+
+        # The first read misses Alice's statistics, as if another transaction created
+        # them since.
+        with mock.patch(
+            "apps.games.stats.locked_player_stats", wraps=locked_player_stats
+        ) as read:
+            read.side_effect = [{}, mock.DEFAULT]
+            changes.save()
+
+        saved_stats = player_stats()
+        self.assertEqual(saved_stats["Alice"]["rounds_played"], 4)
+        self.assertEqual(saved_stats["Alice"]["round_points"], 16)
+        self.assertEqual(saved_stats["Bob"]["rounds_played"], 1)
+        self.assertEqual(PlayerStats.objects.count(), 2)
@@ -0,0 +1,694 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ..cache import scoreboard_cache_key, scoreboard_cache_stats
+from apps.players.models import Player
+
+from ..models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+from ..schedule import MAX_TO_ONE_ONE_TO_MAX, MAX_TO_ONE_TO_MAX
+from ..views import (
+    AsyncGameListCompletedView,
+    AsyncGameListView,
+    AsyncGameShowView,
+)
+from .utils import create_game, create_players, create_user
+
+
+class GameListViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 3)
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+
+    def _count_queries(self) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/games/")
+
+        self.assertEqual(response.status_code, 200)
+
+        return len(context.captured_queries)
+
+    def test_get(self):
+        create_game(self.user, self.players, name="Ongoing Game")
+        create_game(
+            self.user,
+            self.players,
+            name="Completed Game",
+            is_ongoing=False,
+            scores=[3, 10, 10],
+        )
+
+        response = self.client.get("/games/")
+
+        self.assertTemplateUsed(response, "game_list.html")
+        self.assertEqual(
+            [game["name"] for game in response.context["ongoing_games"]],
+            ["Ongoing Game"],
+        )
+        completed_game = response.context["completed_games"][0]
+        self.assertEqual(completed_game["name"], "Completed Game")
+        self.assertEqual(completed_game["player_names"], "AS, BS, CS")
+        self.assertEqual(completed_game["winning_player"], "Bob")
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_get_through_asgi(self):
+        await sync_to_async(create_game)(self.user, self.players, is_ongoing=False)
+
+        response = await self.async_client.get("/games/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.resolver_match.func.view_class, AsyncGameListView)
+        self.assertEqual(len(response.context["completed_games"]), 1)
+        self.assertEqual(
+            response.context["completed_games"][0]["player_names"], "AS, BS, CS"
+        )
+
+    def test_only_shows_games_of_current_user(self):
+        other_user = create_user(email="other@example.com")
+        create_game(other_user, create_players(other_user, 2), name="Other Game")
+
+        response = self.client.get("/games/")
+
+        self.assertEqual(response.context["ongoing_games"], [])
+        self.assertEqual(response.context["completed_games"], [])
+
+    def test_query_count_does_not_grow_with_number_of_games(self):
+        create_game(self.user, self.players)
+        create_game(self.user, self.players, is_ongoing=False)
+        baseline_query_count = self._count_queries()
+
+        for _ in range(10):
+            create_game(self.user, self.players)
+            create_game(self.user, self.players, is_ongoing=False)
+
+        self.assertEqual(self._count_queries(), baseline_query_count)
+
+    @mock.patch("apps.games.views.COMPLETED_GAMES_PAGE_SIZE", 2)
+    def test_completed_games_are_paginated(self):
+        for idx in range(5):
+            create_game(self.user, self.players, name=f"Game {idx}", is_ongoing=False)
+
+        # Give every game the same inserted_at, so the pages are split on the game ID.
+        Game.objects.update(inserted_at=Game.objects.first().inserted_at)
+
+        response = self.client.get("/games/")
+        game_names = [game["name"] for game in response.context["completed_games"]]
+        next_cursor = response.context["next_cursor"]
+
+        while next_cursor is not None:
+            response = self.client.get("/games/completed/", {"cursor": next_cursor})
+            self.assertTemplateUsed(response, "game_list_completed_rows.html")
+            self.assertLessEqual(len(response.context["completed_games"]), 2)
+            game_names += [game["name"] for game in response.context["completed_games"]]
+            next_cursor = response.context["next_cursor"]
+
+        self.assertEqual(game_names, ["Game 4", "Game 3", "Game 2", "Game 1", "Game 0"])
+
+    @mock.patch("apps.games.views.COMPLETED_GAMES_PAGE_SIZE", 2)
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_completed_games_are_paginated_through_asgi(self):
+        for idx in range(3):
+            await sync_to_async(create_game)(
+                self.user, self.players, name=f"Game {idx}", is_ongoing=False
+            )
+
+        response = await self.async_client.get("/games/")
+        next_cursor = response.context["next_cursor"]
+        response = await self.async_client.get(
+            "/games/completed/", {"cursor": next_cursor}
+        )
+
+        self.assertEqual(
+            response.resolver_match.func.view_class, AsyncGameListCompletedView
+        )
+        self.assertEqual(
+            [game["name"] for game in response.context["completed_games"]], ["Game 0"]
+        )
+        self.assertIsNone(response.context["next_cursor"])
+
+    def test_completed_games_with_invalid_cursor(self):
+        response = self.client.get("/games/completed/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_completed_games_with_invalid_cursor_through_asgi(self):
+        response = await self.async_client.get(
+            "/games/completed/", {"cursor": "not-a-cursor"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class GameCreateViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_login(self.user)
+
+    def _post(self, players, **data):
+        return self.client.post(
+            "/games/new/",
+            {
+                "name": "New Game",
+                "starting_round_card_number": 2,
+                "number_of_decks": 1,
+                "correct_prediction_points": 5,
+                "missed_prediction_points": 0,
+                "double_last_round_points": False,
+                "card_progression": MAX_TO_ONE_TO_MAX,
+                "players": [player.id for player in players],
+                **data,
+            },
+        )
+
+    def test_create(self):
+        players = [
+            *create_players(self.user, 2),
+            Player.objects.create(
+                first_name="Alice", last_name="Jones", created_by_user=self.user
+            ),
+        ]
+
+        response = self._post(players)
+
+        game = Game.objects.get(name="New Game")
+        self.assertRedirects(
+            response, f"/games/{game.id}", fetch_redirect_response=False
+        )
+        self.assertEqual(
+            list(
+                GamePlayer.objects.filter(game=game).values_list(
+                    "player", "player_number", "unique_display_name"
+                )
+            ),
+            [
+                (players[0].id, 1, "Alice S."),
+                (players[1].id, 2, "Bob"),
+                (players[2].id, 3, "Alice J."),
+            ],
+        )
+        self.assertEqual(
+            GamePlayerGameRound.objects.filter(
+                game_round__game=game, game_round__round_number=1
+            ).count(),
+            3,
+        )
+        summary = GameSummary.objects.get(game=game)
+        self.assertEqual(summary.player_names, "Alice S., Bob, Alice J.")
+        self.assertEqual(summary.latest_round_card_number, 2)
+
+    def test_create_with_card_progression(self):
+        players = create_players(self.user, 2)
+
+        self._post(
+            players,
+            starting_round_card_number=1,
+            card_progression=MAX_TO_ONE_ONE_TO_MAX,
+        )
+
+        # One card is dealt twice, so the game only ends after the second round.
+        game = Game.objects.get(name="New Game")
+        for round_number in (1, 2):
+            self.client.post(
+                f"/games/{game.id}/round/{round_number}/bids/",
+                {"tricks_predicted_1": 1, "tricks_predicted_2": 1},
+            )
+            self.client.post(
+                f"/games/{game.id}/round/{round_number}/scores/",
+                {"tricks_won_1": 1, "tricks_won_2": 0},
+            )
+
+        game.refresh_from_db()
+        self.assertFalse(game.is_ongoing)
+        self.assertEqual(
+            list(
+                GameRound.objects.filter(game=game)
+                .order_by("round_number")
+                .values_list("card_number", "trump_suit")
+            ),
+            [(1, "H"), (1, "C")],
+        )
+
+    def test_create_with_scoring_rules(self):
+        self._post(
+            create_players(self.user, 3),
+            missed_prediction_points=2,
+            zero_prediction_points=1,
+        )
+
+        game = Game.objects.get(name="New Game")
+        round_url = f"/games/{game.id}/round/1"
+        self.client.post(
+            f"{round_url}/bids/",
+            {"tricks_predicted_1": 0, "tricks_predicted_2": 0, "tricks_predicted_3": 1},
+        )
+        self.client.post(
+            f"{round_url}/scores/",
+            {"tricks_won_1": 0, "tricks_won_2": 2, "tricks_won_3": 0},
+        )
+
+        # Alice made her zero bid, Bob missed his by two and Carol hers by one.
+        self.assertEqual(
+            list(
+                GamePlayer.objects.filter(game=game)
+                .order_by("player_number")
+                .values_list("score", flat=True)
+            ),
+            [1, -2, -2],
+        )
+
+    def test_query_count_does_not_grow_with_number_of_players(self):
+        players = create_players(self.user, 20)
+
+        for player_count in range(2, 21):
+            with self.subTest(player_count=player_count):
+                # The session and user, checking the players, then in a savepoint
+                # inserting the game, its players, its first round, the round's players
+                # and the game summary.
+                with self.assertNumQueries(2 + 1 + 2 + 5):
+                    response = self._post(players[:player_count])
+
+                self.assertEqual(response.status_code, 302)
+
+
+class GameShowViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.players = create_players(self.user, 3)
+        self.game = create_game(self.user, self.players)
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+
+    def test_get(self):
+        response = self.client.get(f"/games/{self.game.id}/")
+
+        self.assertTemplateUsed(response, "game_show.html")
+        self.assertEqual(response.context["game_summary"].latest_round_number, 1)
+        self.assertEqual(response.context["dealer"].player_number, 2)
+        self.assertEqual(response.context["winning_players"], "Alice, Bob, Carol")
+
+    def test_get_for_other_user(self):
+        self.client.force_login(create_user(email="other@example.com"))
+
+        response = self.client.get(f"/games/{self.game.id}/")
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_when_logged_out(self):
+        self.client.logout()
+
+        response = self.client.get(f"/games/{self.game.id}/")
+
+        self.assertRedirects(
+            response,
+            f"/accounts/login/?next=/games/{self.game.id}/",
+            fetch_redirect_response=False,
+        )
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_get_through_asgi(self):
+        response = await self.async_client.get(f"/games/{self.game.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.resolver_match.func.view_class, AsyncGameShowView)
+        self.assertEqual(response.context["game_summary"].latest_round_number, 1)
+        self.assertEqual(response.context["winning_players"], "Alice, Bob, Carol")
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_unchanged_page_is_not_modified_through_asgi(self):
+        etag = (await self.async_client.get(f"/games/{self.game.id}/"))["ETag"]
+
+        response = await self.async_client.get(
+            f"/games/{self.game.id}/", headers={"If-None-Match": etag}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_get_errors_through_asgi(self):
+        response = await self.async_client.get("/games/gam_doesnotexist/")
+
+        self.assertEqual(response.status_code, 404)
+
+        other_user = await sync_to_async(create_user)(email="other@example.com")
+        await sync_to_async(self.async_client.force_login)(other_user)
+        response = await self.async_client.get(f"/games/{self.game.id}/")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn("ETag", response)
+
+        await sync_to_async(self.async_client.logout)()
+        response = await self.async_client.get(f"/games/{self.game.id}/")
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_scoreboard_is_cached_until_game_changes(self):
+        scoreboard_cache_stats.clear()
+        game_url = f"/games/{self.game.id}/"
+
+        self.client.get(game_url)
+
+        # Session, user, ETag version and game with summary: the scoreboard comes from
+        # the cache.
+        with self.assertNumQueries(4):
+            response = self.client.get(game_url)
+
+        self.assertEqual(scoreboard_cache_stats, {"hits": 1, "misses": 1})
+        self.assertEqual(response.context["game_rounds"], [])
+
+        self.client.post(
+            f"/games/{self.game.id}/round/1/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0, "tricks_predicted_3": 0},
+        )
+        response = self.client.get(game_url)
+
+        self.assertEqual(scoreboard_cache_stats, {"hits": 1, "misses": 2})
+        self.assertEqual(
+            [
+                cell["tricks_predicted"]
+                for cell in response.context["game_rounds"][0][1]
+            ],
+            [1, 0, 0],
+        )
+
+    def test_delete_invalidates_scoreboard(self):
+        self.client.get(f"/games/{self.game.id}/")
+        self.game.refresh_from_db()
+        key = scoreboard_cache_key(self.game)
+        self.assertIsNotNone(cache.get(key))
+
+        self.client.post(f"/games/delete/{self.game.id}/")
+
+        self.assertIsNone(cache.get(key))
+
+
+class GameConditionalGetTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(self.user, create_players(self.user, 3))
+        self.client.force_login(self.user)
+        self.page_urls = [
+            f"/games/{self.game.id}/",
+            f"/games/{self.game.id}/round/1/bids/",
+            f"/games/{self.game.id}/round/1/scores/",
+        ]
+
+    def test_unchanged_page_is_not_modified(self):
+        for url in self.page_urls:
+            with self.subTest(url=url):
+                # The first load of a form sets the CSRF cookie, which the ETag covers.
+                self.client.get(url)
+                etag = self.client.get(url)["ETag"]
+
+                # Session, user and ETag version: the page itself isn't built.
+                with self.assertNumQueries(3):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 304)
+
+    def test_pages_must_be_revalidated(self):
+        response = self.client.get(self.page_urls[0])
+
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_etag_changes_when_bids_change(self):
+        etags = [self.client.get(url)["ETag"] for url in self.page_urls]
+
+        self.client.post(
+            f"/games/{self.game.id}/round/1/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0, "tricks_predicted_3": 0},
+        )
+
+        for url, etag in zip(self.page_urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_differs_between_users(self):
+        etag = self.client.get(self.page_urls[0])["ETag"]
+        superuser = create_user(email="admin@example.com")
+        superuser.is_superuser = True
+        superuser.save()
+        self.client.force_login(superuser)
+
+        response = self.client.get(self.page_urls[0], HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_errors_are_not_tagged(self):
+        response = self.client.get(f"/games/{self.game.id}/round/9/bids/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+        self.client.force_login(create_user(email="other@example.com"))
+        response = self.client.get(self.page_urls[1])
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn("ETag", response)
+
+    def test_deleted_game_is_not_found(self):
+        etag = self.client.get(self.page_urls[0])["ETag"]
+
+        self.client.post(f"/games/delete/{self.game.id}/")
+        response = self.client.get(self.page_urls[0], HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class GameRoundViewsTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 3)
+        self.game = create_game(self.user, self.players, starting_round_card_number=2)
+        self.client.force_login(self.user)
+
+    def _post_bids(self, round_number: int, bids: list) -> None:
+        response = self.client.post(
+            f"/games/{self.game.id}/round/{round_number}/bids/",
+            {f"tricks_predicted_{idx + 1}": bid for idx, bid in enumerate(bids)},
+        )
+        self.assertRedirects(
+            response, f"/games/{self.game.id}", fetch_redirect_response=False
+        )
+
+    def _post_scores(self, round_number: int, scores: list) -> None:
+        response = self.client.post(
+            f"/games/{self.game.id}/round/{round_number}/scores/",
+            {f"tricks_won_{idx + 1}": score for idx, score in enumerate(scores)},
+        )
+        self.assertRedirects(
+            response, f"/games/{self.game.id}", fetch_redirect_response=False
+        )
+
+    def test_play_game(self):
+        self._post_bids(1, [1, 0, 0])
+        self._post_scores(1, [1, 1, 0])
+
+        self.game.refresh_from_db()
+        summary = self.game.summary
+        self.assertEqual(summary.latest_round_number, 2)
+        self.assertEqual(summary.latest_round_card_number, 1)
+        self.assertIsNone(summary.latest_round_total_tricks_predicted)
+        self.assertEqual(summary.trump_suit, "C")
+        self.assertEqual(summary.dealer_player_number, 3)
+        self.assertEqual(summary.leaders, "Alice")
+        self.assertEqual([gp.score for gp in self.game.gameplayer_set.all()], [6, 1, 5])
+
+        self._post_bids(2, [1, 1, 0])
+        self.game.summary.refresh_from_db()
+        self.assertEqual(self.game.summary.latest_round_total_tricks_predicted, 2)
+
+        self._post_scores(2, [0, 1, 0])
+        self._post_bids(3, [0, 0, 0])
+        self._post_scores(3, [1, 0, 1])
+
+        self.game.refresh_from_db()
+        self.assertFalse(self.game.is_ongoing)
+        self.assertEqual(
+            [gp.score for gp in self.game.gameplayer_set.all()], [7, 12, 11]
+        )
+        self.assertEqual(self.game.summary.leaders, "Bob")
+
+    def test_edit_past_round(self):
+        self._post_bids(1, [1, 0, 0])
+        self._post_scores(1, [1, 1, 0])
+
+        # Bob's bid is corrected to 1, so Bob rather than Carol gets the bonus.
+        self._post_bids(1, [1, 1, 1])
+        self.game.refresh_from_db()
+        self.assertEqual([gp.score for gp in self.game.gameplayer_set.all()], [6, 6, 0])
+        self.assertEqual(self.game.summary.leaders, "Alice, Bob")
+
+        # Then the tricks won are corrected, so Alice loses the bonus to Carol.
+        self._post_scores(1, [0, 1, 1])
+        self.game.refresh_from_db()
+        self.assertEqual([gp.score for gp in self.game.gameplayer_set.all()], [0, 6, 6])
+        self.assertEqual(self.game.summary.leaders, "Bob, Carol")
+        self.assertEqual(self.game.gameround_set.count(), 2)
+
+    def test_scores_before_bids(self):
+        # Without bids, every player scores as if they missed them.
+        self._post_scores(1, [1, 1, 0])
+
+        self.game.refresh_from_db()
+        self.assertEqual([gp.score for gp in self.game.gameplayer_set.all()], [1, 1, 0])
+        self.assertEqual(self.game.summary.latest_round_number, 2)
+
+        response = self.client.get(f"/games/{self.game.id}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_score_query_count_does_not_grow_with_number_of_players(self):
+        def count_score_queries(game, player_count):
+            round_url = f"/games/{game.id}/round/1"
+            self.client.post(
+                f"{round_url}/bids/",
+                {f"tricks_predicted_{idx}": 0 for idx in range(1, player_count + 1)},
+            )
+
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(
+                    f"{round_url}/scores/",
+                    {
+                        f"tricks_won_{idx}": 1 if idx <= 2 else 0
+                        for idx in range(1, player_count + 1)
+                    },
+                )
+
+            return len(context.captured_queries)
+
+        baseline_query_count = count_score_queries(self.game, 3)
+
+        game = create_game(
+            self.user, create_players(self.user, 7), starting_round_card_number=2
+        )
+
+        self.assertEqual(count_score_queries(game, 7), baseline_query_count)
+        self.assertEqual(game.gameround_set.count(), 2)
+        self.assertEqual(
+            list(game.gameround_set.get(round_number=2).game_players.all()),
+            list(game.gameplayer_set.all()),
+        )
+
+    def test_resubmitting_bids_writes_nothing(self):
+        self._post_bids(1, [1, 0, 0])
+
+        with CaptureQueriesContext(connection) as context:
+            self._post_bids(1, [1, 0, 0])
+
+        self.assertFalse(
+            [
+                query
+                for query in context.captured_queries
+                if query["sql"].startswith(("UPDATE", "INSERT"))
+                and "django_session" not in query["sql"]
+            ]
+        )
+
+    def test_editing_bid_without_changing_score_skips_game_player(self):
+        self._post_bids(1, [1, 0, 0])
+        self._post_scores(1, [1, 1, 0])
+        game_player_updated_ats = [
+            gp.updated_at for gp in self.game.gameplayer_set.all()
+        ]
+
+        # Bob's bid was wrong before and after the edit, so no scores change.
+        self._post_bids(1, [1, 2, 0])
+
+        self.assertEqual(
+            [gp.updated_at for gp in self.game.gameplayer_set.all()],
+            game_player_updated_ats,
+        )
+        self.assertEqual(
+            self.game.gameround_set.get(round_number=1).total_tricks_predicted, 3
+        )
+
+
+class GameRoundViewsQueryCountTest(TestCase):
+    """The round views load the game, round and round players once per request.
+
+    Each request also makes two queries for the session and user, and each GET one more
+    for the version the ETag is computed from.
+    """
+
+    def setUp(self):
+        self.user = create_user()
+        self.game = create_game(
+            self.user, create_players(self.user, 3), starting_round_card_number=2
+        )
+        self.round_url = f"/games/{self.game.id}/round/1"
+        self.client.force_login(self.user)
+
+    def test_get_bids(self):
+        # ETag version, game and summary, round, round players.
+        with self.assertNumQueries(6):
+            response = self.client.get(f"{self.round_url}/bids/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_bids(self):
+        # As GET, then claiming the game's next version, and writing the round players,
+        # round and game summary (which reads the players and latest round). The save
+        # joins the test's transaction rather than opening a savepoint.
+        with self.assertNumQueries(11):
+            response = self.client.post(
+                f"{self.round_url}/bids/",
+                {
+                    "tricks_predicted_1": 1,
+                    "tricks_predicted_2": 0,
+                    "tricks_predicted_3": 0,
+                },
+            )
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_get_scores(self):
+        self.client.post(
+            f"{self.round_url}/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0, "tricks_predicted_3": 0},
+        )
+
+        with self.assertNumQueries(6):
+            response = self.client.get(f"{self.round_url}/scores/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_scores(self):
+        self.client.post(
+            f"{self.round_url}/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0, "tricks_predicted_3": 0},
+        )
+
+        # As GET, then claiming the game's next version, and writing the round players,
+        # game players, next round, next round players, players' statistics (read,
+        # created, read again and updated) and game summary (which reads the players
+        # and latest round).
+        with self.assertNumQueries(17):
+            response = self.client.post(
+                f"{self.round_url}/scores/",
+                {"tricks_won_1": 1, "tricks_won_2": 1, "tricks_won_3": 0},
+            )
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_post_for_other_user(self):
+        self.client.force_login(create_user(email="other@example.com"))
+
+        response = self.client.post(
+            f"{self.round_url}/bids/",
+            {"tricks_predicted_1": 1, "tricks_predicted_2": 0, "tricks_predicted_3": 0},
+        )
+
+        self.assertEqual(response.status_code, 403)
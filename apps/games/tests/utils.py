@@ -0,0 +1,107 @@
+from typing import List, Optional
+
+from apps.players.models import Player
+from apps.users.models import User
+
+from ..models import Game, GamePlayer, GamePlayerGameRound, GameRound, GameSummary
+
+FIRST_NAMES = [
+    "Alice",
+    "Bob",
+    "Carol",
+    "Dave",
+    "Erin",
+    "Frank",
+    "Grace",
+    "Heidi",
+    "Ivan",
+    "Judy",
+    "Ken",
+    "Liam",
+    "Mallory",
+    "Niaj",
+    "Olivia",
+    "Peggy",
+    "Quentin",
+    "Rupert",
+    "Sybil",
+    "Trent",
+]
+
+
+def create_user(email: str = "something@example.com") -> User:
+    """Create a user, along with the player representing them.
+
+    The user has no usable password (skipping the slow password hashing), so log in
+    with `force_login`.
+    """
+    user = User.objects.create_user(
+        email=email,
+        first_name="First",
+        last_name="Last",
+    )
+
+    Player.objects.create(
+        first_name=user.first_name,
+        last_name=user.last_name,
+        created_by_user=user,
+        user=user,
+    )
+
+    return user
+
+
+def create_players(user: User, count: int) -> List[Player]:
+    """Create the given number of players for a user."""
+    return [
+        Player.objects.create(
+            first_name=FIRST_NAMES[idx % len(FIRST_NAMES)],
+            last_name="Smith",
+            created_by_user=user,
+        )
+        for idx in range(count)
+    ]
+
+
+def create_game(
+    user: User,
+    players: List[Player],
+    name: str = "Test Game",
+    starting_round_card_number: int = 3,
+    is_ongoing: bool = True,
+    scores: Optional[List[int]] = None,
+) -> Game:
+    """Create a game with its players and first round, as GameCreateView does."""
+    game = Game.objects.create(
+        name=name,
+        is_ongoing=is_ongoing,
+        starting_round_card_number=starting_round_card_number,
+        created_by_user=user,
+    )
+
+    game_players = [
+        GamePlayer.objects.create(
+            game=game,
+            player=player,
+            player_number=idx + 1,
+            unique_display_name=player.unique_display_name(players),
+            score=scores[idx] if scores is not None else 0,
+        )
+        for idx, player in enumerate(players)
+    ]
+
+    game_round = GameRound.objects.create(
+        game=game,
+        round_number=1,
+        trump_suit="H",
+        card_number=starting_round_card_number,
+    )
+
+    for game_player in game_players:
+        GamePlayerGameRound.objects.create(
+            game_round=game_round, game_player=game_player
+        )
+
+    GameSummary.update_for_game(game)
+
+    return game
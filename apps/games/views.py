@@ -1,26 +1,66 @@
-from typing import Dict
+import datetime
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.handlers.asgi import ASGIRequest
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Max
+from django.db.models import Prefetch, Q, QuerySet
+from django.forms import Form
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.http import (
+    Http404,
     HttpRequest,
     HttpResponse,
+    HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseRedirect,
+    StreamingHttpResponse,
 )
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, render
-from django.views.generic import TemplateView
+from django.utils.functional import cached_property
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag, urlsafe_base64_decode, urlsafe_base64_encode
+from django.views.generic import TemplateView, View
 from django.views.generic.edit import CreateView, DeleteView, FormView
 
-from ..players.models import Player
+from predictive_whist.replica import replica_reads
 
+from ..players.models import Player, unique_display_names
+from ..users.views import AsyncLoginRequiredView
+
+from .archive import round_table_rows
+from .cache import (
+    aget_or_build_scoreboard,
+    get_or_build_scoreboard,
+    invalidate_scoreboard,
+)
+from .export import EXPORTERS, aexport_lines, export_lines, export_rows
+from .importing import MAX_REPORTED_ERRORS, GameImportError, import_games, read_games
+from .live import publish_on_commit, scoreboard_events
 from .forms import (
+    GameImportForm,
     GameModelForm,
     GameRoundPredictionForm,
     GameRoundScoreForm,
+    tricks_by_player_number,
+)
+from .models import GameRound, GamePlayerGameRound, Game, GamePlayer, GameSummary
+from .rounds import (
+    RoundConflict,
+    load_round,
+    save_round_bids,
+    save_round_scores,
 )
-from .models import GameRound, GamePlayerGameRound, Game, GamePlayer
+from .schedule import round_schedule
+from .scoring import build_round_table, game_scorer
+from .stats import games_stats_changes
 
 
 TRUMP_SUIT_TO_EMOJI = {
@@ -31,96 +71,425 @@ TRUMP_SUIT_TO_EMOJI = {
     "N": "🃏",
 }
 
-NEXT_TRUMP_SUIT = {
-    "H": "C",
-    "C": "D",
-    "D": "S",
-    "S": "N",
-    "N": "H",
-}
+COMPLETED_GAMES_PAGE_SIZE = 20
+
+
+def game_base_context(
+    game: Game, game_players: Optional[List[GamePlayer]] = None
+) -> Dict:
+    """Return a base context for all game views.
+
+    The header is built from the game's summary, so load the game with
+    `select_related("summary")` to read both in one query.
+
+    Args:
+        game (Game): The game.
+        game_players (List[GamePlayer], optional):
+            The game's players in player number order, if already loaded.
+
+    Returns:
+        Dict: The base context.
+    """
+    try:
+        game_summary = game.summary
+    except GameSummary.DoesNotExist:
+        game_summary = GameSummary.update_for_game(game)
 
+    if game_players is None:
+        game_players = list(
+            GamePlayer.objects.filter(game=game).order_by("player_number")
+        )
+
+    return {
+        "game": game,
+        "game_summary": game_summary,
+        "game_players": game_players,
+        "game_player_names": game_summary.player_names,
+        "winning_players": game_summary.leaders,
+        "game_round_trump_suit_image_url": f"images/card-drawing-{game_summary.trump_suit}.png",
+        "trump_suit": TRUMP_SUIT_TO_EMOJI[game_summary.trump_suit],
+        "dealer": next(
+            game_player
+            for game_player in game_players
+            if game_player.player_number == game_summary.dealer_player_number
+        ),
+        "is_double_points_round": (
+            game_scorer(game).score_factor(game_summary.latest_round_number) == 2
+        ),
+    }
 
-def game_base_context(game: Game) -> Dict:
-    """Return a base context for all game views."""
-    game_players = (
-        GamePlayer.objects.select_related("game", "player")
-        .filter(game=game)
-        .order_by("player_number")
-        .all()
+
+def game_etag(request: HttpRequest, *args, **kwargs) -> Optional[str]:
+    """Return an ETag for a game page, which changes whenever the game's bids or scores do.
+
+    This only reads the version of the game's summary, so an unchanged page can be
+    answered with 304 Not Modified before any of the work to build it. The ETag also
+    covers the user and their CSRF cookie, which the page's content depends on.
+    """
+    game_id = kwargs.get("game_id") or kwargs.get("pk")
+
+    try:
+        version = (
+            GameSummary.objects.filter(game_id=game_id)
+            .values_list("version", flat=True)
+            .first()
+        )
+    except ValueError:
+        # Not a valid game ID, so let the view return a 404.
+        return None
+
+    if version is None:
+        return None
+
+    page_state = ":".join(
+        [
+            str(game_id),
+            str(version),
+            str(request.user.pk),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        ]
     )
 
-    max_score = game_players.aggregate(Max("score"))["score__max"]
-    winning_players = ", ".join(
-        game_players.filter(score=max_score).values_list(
-            "unique_display_name", flat=True
+    return quote_etag(hashlib.sha256(page_state.encode()).hexdigest())
+
+
+def conditional_game_page(handler: Callable) -> Callable:
+    """Decorate a game page's GET handler to answer unchanged pages with 304 Not Modified.
+
+    The ETag from `game_etag` is checked before the handler runs. Browsers must
+    revalidate game pages on every load, which costs only the ETag check when nothing
+    has changed. The handler may be sync or async.
+    """
+
+    def not_modified_response(request: HttpRequest, etag: Optional[str]):
+        return None if etag is None else get_conditional_response(request, etag=etag)
+
+    def add_headers(response: HttpResponse, etag: Optional[str]) -> HttpResponse:
+        # Only the page itself is tagged, so that an error, such as a 404 for a missing
+        # round of the game, isn't later revalidated as the page.
+        if etag is not None and response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return response
+
+    if iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def async_conditional_handler(
+            view, request: HttpRequest, *args, **kwargs
+        ):
+            etag = await sync_to_async(game_etag)(request, *args, **kwargs)
+            response = not_modified_response(request, etag)
+
+            if response is None:
+                response = await handler(view, request, *args, **kwargs)
+
+            return add_headers(response, etag)
+
+        return async_conditional_handler
+
+    @wraps(handler)
+    def conditional_handler(view, request: HttpRequest, *args, **kwargs):
+        etag = game_etag(request, *args, **kwargs)
+        response = not_modified_response(request, etag)
+
+        if response is None:
+            response = handler(view, request, *args, **kwargs)
+
+        return add_headers(response, etag)
+
+    return conditional_handler
+
+
+def game_list_games(games: QuerySet[Game]) -> QuerySet[Game]:
+    """Load the given games with their players, as the game list summarises them.
+
+    The games and their players are loaded in two queries (one for the games, one for all
+    of their players), rather than querying the players of each game in turn.
+
+    Args:
+        games (QuerySet[Game]): The games to summarise, in the order to display them.
+
+    Returns:
+        QuerySet[Game]: The games, to be summarised by `game_list_summary`.
+    """
+    # The list doesn't show the rounds, so the archives of archived games aren't read.
+    return games.defer("archived_rounds").prefetch_related(
+        Prefetch(
+            "gameplayer_set",
+            queryset=GamePlayer.objects.select_related("player").order_by(
+                "player_number"
+            ),
         )
     )
 
-    latest_game_round = (
-        GameRound.objects.filter(game=game).order_by("round_number").last()
+
+def game_list_summary(game: Game) -> Dict:
+    """Return the summary shown in the game list for a game from `game_list_games`."""
+    game_players = list(game.gameplayer_set.all())
+    game_summary = {
+        "id": game.id,
+        "is_ongoing": game.is_ongoing,
+        "inserted_at": game.inserted_at,
+        "name": game.name,
+        "player_names": ", ".join(gp.player.initials() for gp in game_players),
+        "winning_player": "TBC",
+    }
+
+    if game_players and not game.is_ongoing:
+        # max() returns the first of any tied players, i.e. the lowest player number.
+        game_summary["winning_player"] = max(
+            game_players, key=lambda gp: gp.score
+        ).unique_display_name
+
+    return game_summary
+
+
+def game_list_summaries(games: QuerySet[Game]) -> List[Dict]:
+    """Return the summaries shown in the game list for the given games.
+
+    Args:
+        games (QuerySet[Game]): The games to summarise, in the order to display them.
+
+    Returns:
+        List[Dict]: A summary of each game.
+    """
+    return [game_list_summary(game) for game in game_list_games(games)]
+
+
+async def agame_list_summaries(games: QuerySet[Game]) -> List[Dict]:
+    """The async equivalent of `game_list_summaries`."""
+    return [game_list_summary(game) async for game in game_list_games(games)]
+
+
+def scoreboard_round_rows(game: Game) -> QuerySet:
+    """The rows of an unarchived game's rounds, as `build_round_table` reads them."""
+    return (
+        GamePlayerGameRound.objects.filter(game_round__game=game)
+        .order_by("game_round__round_number", "game_player__player_number")
+        .values(
+            "game_round__round_number",
+            "game_player__player_number",
+            "tricks_predicted",
+            "tricks_won",
+        )
     )
-    assert latest_game_round is not None
 
-    dealer_player_number = latest_game_round.round_number % len(game_players) + 1
+
+def scoreboard_from_rows(
+    game: Game,
+    game_players: List[GamePlayer],
+    round_rows: Iterable[Mapping[str, Any]],
+) -> Dict:
+    """Return a game's scoreboard, from its players and the rows of its rounds."""
+    game_summary = game.summary
+
+    last_round_to_show = (
+        game_summary.latest_round_number
+        if game_summary.latest_round_total_tricks_predicted is not None
+        else game_summary.latest_round_number - 1
+    )
 
     return {
-        "game": game,
         "game_players": game_players,
-        "game_player_names": ", ".join(
-            game_players.values_list("unique_display_name", flat=True)
-        ),
-        "winning_players": winning_players,
-        "latest_game_round": latest_game_round,
-        "game_round_trump_suit_image_url": f"images/card-drawing-{latest_game_round.trump_suit}.png",
-        "trump_suit": TRUMP_SUIT_TO_EMOJI[latest_game_round.trump_suit],
-        "dealer": game_players.get(player_number=dealer_player_number),
-        "is_double_points_round": round_score_factor(latest_game_round.round_number, game) == 2,
+        "game_rounds": build_round_table(game, round_rows, last_round_to_show),
     }
 
 
+def build_scoreboard(game: Game) -> Dict:
+    """Build a game's players (with their scores) and round table.
+
+    Args:
+        game (Game): The game, with its summary.
+
+    Returns:
+        Dict: The game's players in player number order, and its round table.
+    """
+    game_players = list(GamePlayer.objects.filter(game=game).order_by("player_number"))
+    round_rows: Iterable[Mapping[str, Any]]
+
+    if game.archived_rounds is not None:
+        round_rows = round_table_rows(game)
+    else:
+        round_rows = list(scoreboard_round_rows(game))
+
+    return scoreboard_from_rows(game, game_players, round_rows)
+
+
+async def abuild_scoreboard(game: Game) -> Dict:
+    """The async equivalent of `build_scoreboard`.
+
+    The players and the round rows are independent queries, but they are awaited in
+    turn: every async ORM call of a request runs on the same thread, so gathering them
+    wouldn't overlap them.
+    """
+    game_players = [
+        game_player
+        async for game_player in GamePlayer.objects.filter(game=game).order_by(
+            "player_number"
+        )
+    ]
+    round_rows: Iterable[Mapping[str, Any]]
+
+    if game.archived_rounds is not None:
+        round_rows = round_table_rows(game)
+    else:
+        round_rows = [round_row async for round_row in scoreboard_round_rows(game)]
+
+    return scoreboard_from_rows(game, game_players, round_rows)
+
+
+def encode_game_cursor(game_summary: Dict) -> str:
+    """Encode the position of a game in the game list as an opaque cursor."""
+    position = f"{game_summary['inserted_at'].isoformat()}|{game_summary['id']}"
+
+    return urlsafe_base64_encode(position.encode())
+
+
+def decode_game_cursor(cursor: str) -> Tuple[datetime.datetime, str]:
+    """Decode a cursor created by encode_game_cursor.
+
+    Raises:
+        ValueError: If the cursor is not valid.
+
+    Returns:
+        Tuple[datetime.datetime, str]: The inserted_at and ID of the game.
+    """
+    inserted_at, game_id = urlsafe_base64_decode(cursor).decode().split("|")
+
+    if not game_id.startswith("gam_"):
+        raise ValueError("Invalid game cursor.")
+
+    return datetime.datetime.fromisoformat(inserted_at), game_id
+
+
+def completed_games_query(user, cursor: Optional[str] = None) -> QuerySet[Game]:
+    """Return the games for a page of the given user's completed games.
+
+    Pages are found by keyset on (inserted_at, id), so fetching a page costs the same
+    however far down the user's history it is. One extra game is fetched to find out
+    whether there is another page.
+
+    Args:
+        user (auth.User): The user whose games to return.
+        cursor (str, optional): The cursor returned with the previous page, if any.
+
+    Raises:
+        ValueError: If the cursor is not valid.
+
+    Returns:
+        QuerySet[Game]: The games, most recent first.
+    """
+    games = Game.objects.filter(created_by_user=user, is_ongoing=False)
+
+    if cursor is not None:
+        inserted_at, game_id = decode_game_cursor(cursor)
+        games = games.filter(
+            Q(inserted_at__lt=inserted_at) | Q(inserted_at=inserted_at, id__lt=game_id)
+        )
+
+    return games.order_by("-inserted_at", "-id")[: COMPLETED_GAMES_PAGE_SIZE + 1]
+
+
+def completed_games_cursor(
+    game_summaries: List[Dict],
+) -> Tuple[List[Dict], Optional[str]]:
+    """Split the summaries of `completed_games_query`'s games into a page and a cursor.
+
+    Returns:
+        Tuple[List[Dict], Optional[str]]:
+            The summaries of the games in the page, and the cursor for the next page (or
+            None if this is the last page).
+    """
+    if len(game_summaries) <= COMPLETED_GAMES_PAGE_SIZE:
+        return game_summaries, None
+
+    game_summaries = game_summaries[:COMPLETED_GAMES_PAGE_SIZE]
+
+    return game_summaries, encode_game_cursor(game_summaries[-1])
+
+
+def completed_games_page(
+    user, cursor: Optional[str] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """Return a page of the given user's completed games, most recent first.
+
+    Args:
+        user (auth.User): The user whose games to return.
+        cursor (str, optional): The cursor returned with the previous page, if any.
+
+    Raises:
+        ValueError: If the cursor is not valid.
+
+    Returns:
+        Tuple[List[Dict], Optional[str]]:
+            The summaries of the games in the page, and the cursor for the next page (or
+            None if this is the last page).
+    """
+    return completed_games_cursor(
+        game_list_summaries(completed_games_query(user, cursor))
+    )
+
+
+async def acompleted_games_page(
+    user, cursor: Optional[str] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """The async equivalent of `completed_games_page`."""
+    return completed_games_cursor(
+        await agame_list_summaries(completed_games_query(user, cursor))
+    )
+
+
+@method_decorator(replica_reads, name="dispatch")
 class GameListView(LoginRequiredMixin, TemplateView):
-    """This view lists all games created by the current user."""
+    """This view lists all games created by the current user.
+
+    All ongoing games are shown, along with the first page of completed games. Further
+    pages of completed games are loaded by GameListCompletedView as the user scrolls.
+    """
 
     template_name = "game_list.html"
 
     def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
         assert self.request.user.is_authenticated
 
-        games = [
+        ongoing_games = game_list_summaries(
+            Game.objects.filter(
+                created_by_user=self.request.user, is_ongoing=True
+            ).order_by("inserted_at", "id")
+        )
+
+        completed_games, next_cursor = completed_games_page(self.request.user)
+
+        return render(
+            request,
+            self.template_name,
             {
-                "id": game.id,
-                "is_ongoing": game.is_ongoing,
-                "inserted_at": game.inserted_at,
-                "name": game.name,
-            }
-            for game in Game.objects.filter(created_by_user=self.request.user).all()
-        ]
-        game_players = GamePlayer.objects.select_related("game", "player").all()
+                "ongoing_games": ongoing_games,
+                "completed_games": completed_games,
+                "next_cursor": next_cursor,
+            },
+        )
 
-        ongoing_games = []
-        completed_games = []
 
-        for game in games:
-            game["player_names"] = ", ".join(
-                map(
-                    lambda gp: gp.player.initials(),
-                    game_players.filter(game__id=game["id"]),
-                )
-            )
+@method_decorator(replica_reads, name="dispatch")
+class AsyncGameListView(AsyncLoginRequiredView):
+    """The async equivalent of GameListView, which serves it under ASGI."""
 
-            winning_game_player = (
-                game_players.filter(game__id=game["id"]).order_by("-score").first()
-            )
+    template_name = "game_list.html"
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        assert self.request.user.is_authenticated
 
-            if winning_game_player is not None and not game["is_ongoing"]:
-                game["winning_player"] = winning_game_player.unique_display_name
-            else:
-                game["winning_player"] = "TBC"
+        ongoing_games = await agame_list_summaries(
+            Game.objects.filter(
+                created_by_user=self.request.user, is_ongoing=True
+            ).order_by("inserted_at", "id")
+        )
 
-            if game["is_ongoing"]:
-                ongoing_games.append(game)
-            else:
-                completed_games.append(game)
+        completed_games, next_cursor = await acompleted_games_page(self.request.user)
 
         return render(
             request,
@@ -128,10 +497,111 @@ class GameListView(LoginRequiredMixin, TemplateView):
             {
                 "ongoing_games": ongoing_games,
                 "completed_games": completed_games,
+                "next_cursor": next_cursor,
             },
         )
 
 
+@method_decorator(replica_reads, name="dispatch")
+class GameListCompletedView(LoginRequiredMixin, TemplateView):
+    """This view renders a page of the current user's completed games as table rows."""
+
+    template_name = "game_list_completed_rows.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        assert self.request.user.is_authenticated
+
+        try:
+            completed_games, next_cursor = completed_games_page(
+                self.request.user, self.request.GET.get("cursor")
+            )
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "completed_games": completed_games,
+                "next_cursor": next_cursor,
+            },
+        )
+
+
+@method_decorator(replica_reads, name="dispatch")
+class AsyncGameListCompletedView(AsyncLoginRequiredView):
+    """The async equivalent of GameListCompletedView, which serves it under ASGI."""
+
+    template_name = "game_list_completed_rows.html"
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        assert self.request.user.is_authenticated
+
+        try:
+            completed_games, next_cursor = await acompleted_games_page(
+                self.request.user, self.request.GET.get("cursor")
+            )
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "completed_games": completed_games,
+                "next_cursor": next_cursor,
+            },
+        )
+
+
+class GameExportView(LoginRequiredMixin, View):
+    """This view streams an export of all of the user's games, as CSV or JSON Lines."""
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> StreamingHttpResponse:
+        exporter = EXPORTERS[self.kwargs["export_format"]]()
+        rows = export_rows(request.user)
+
+        response = StreamingHttpResponse(
+            aexport_lines(exporter, rows)
+            if isinstance(request, ASGIRequest)
+            else export_lines(exporter, rows),
+            content_type=exporter.content_type,
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="whist-games.{exporter.file_extension}"'
+        patch_cache_control(response, private=True, no_store=True)
+
+        return response
+
+
+class GameImportView(LoginRequiredMixin, FormView):
+    """This view allows the user to import games from a file."""
+
+    template_name = "game_import.html"
+    form_class = GameImportForm
+
+    def form_valid(self, form: GameImportForm) -> HttpResponse:
+        try:
+            text = form.cleaned_data["file"].read().decode("utf-8-sig")
+            import_games(self.request.user, read_games(text, form.import_format))
+        except UnicodeDecodeError:
+            form.add_error("file", "The file must be encoded as UTF-8.")
+            return self.form_invalid(form)
+        except GameImportError as error:
+            messages = error.messages[:MAX_REPORTED_ERRORS]
+
+            if len(error.messages) > MAX_REPORTED_ERRORS:
+                messages.append(
+                    f"... and {len(error.messages) - MAX_REPORTED_ERRORS} more errors."
+                )
+
+            form.add_error("file", ValidationError(messages))
+            return self.form_invalid(form)
+
+        return HttpResponseRedirect("/games/")
+
+
 class GameCreateView(LoginRequiredMixin, CreateView):
     """This view allows the user to create a new game."""
 
@@ -159,7 +629,9 @@ class GameCreateView(LoginRequiredMixin, CreateView):
         """Save the game and redirect to the game page.
 
         Creates the game, the game players, the first round. Adds the game players to the
-        first round, creating a GamePlayerGameRound object for each.
+        first round, creating a GamePlayerGameRound object for each. The rows are
+        inserted in bulk, so this takes the same number of queries for any number of
+        players.
 
         Args:
             form (GameModelForm): The form containing the game data.
@@ -177,41 +649,54 @@ class GameCreateView(LoginRequiredMixin, CreateView):
                 correct_prediction_points=form.cleaned_data[
                     "correct_prediction_points"
                 ],
+                missed_prediction_points=form.cleaned_data["missed_prediction_points"],
+                zero_prediction_points=form.cleaned_data["zero_prediction_points"],
                 starting_round_card_number=form.cleaned_data[
                     "starting_round_card_number"
                 ],
                 number_of_decks=form.cleaned_data["number_of_decks"],
                 double_last_round_points=form.cleaned_data["double_last_round_points"],
+                card_progression=form.cleaned_data["card_progression"],
                 created_by_user=self.request.user,
             )
 
             players = list(form.cleaned_data["players"])
 
             # Then, save the players by creating a GamePlayer object for each, making sure we
-            # set the player_number correctly.
+            # set the player_number correctly. They are inserted together, and
+            # bulk_create() sets their IDs for the rows of the first round.
             # TODO: Enable users to choose the player order in the form.
-            game_players = [
-                GamePlayer.objects.create(
+            game_players = GamePlayer.objects.bulk_create(
+                GamePlayer(
                     game=game,
                     player=player,
                     player_number=idx + 1,
-                    unique_display_name=player.unique_display_name(players),
+                    unique_display_name=unique_display_name,
+                )
+                for idx, (player, unique_display_name) in enumerate(
+                    zip(players, unique_display_names(players))
                 )
-                for idx, player in enumerate(players)
-            ]
+            )
 
-            # Then we create the first round of the game, with H as the first trump
-            # suit, and the card number as the starting round card number.
+            # Then we create the first round of the game, as set out by the game's
+            # schedule.
+            first_round_schedule = round_schedule(game, 1, len(players))
             game_round = GameRound.objects.create(
                 game=game,
                 round_number=1,
-                trump_suit="H",
-                card_number=game.starting_round_card_number,
+                trump_suit=first_round_schedule.trump_suit,
+                card_number=first_round_schedule.card_number,
+            )
+
+            # Now add the game players to the round, with a GamePlayerGameRound for each.
+            GamePlayerGameRound.objects.bulk_create(
+                GamePlayerGameRound(game_round=game_round, game_player=game_player)
+                for game_player in game_players
             )
 
-            # Now set the game_players of the game_round to the game_players we created
-            # earlier.
-            game_round.game_players.set(game_players)
+            # The summary is built from the players and round in memory, rather than
+            # read back by GameSummary.update_for_game().
+            GameSummary.build(game, game_players, game_round).save(force_insert=True)
 
         return HttpResponseRedirect(f"/games/{game.id}")
 
@@ -221,6 +706,7 @@ class GameDeleteView(LoginRequiredMixin, DeleteView, SuccessMessageMixin):
 
     object: Game  # work around python/mypy#9031
     model = Game
+    queryset = Game.objects.select_related("summary")
     success_url = "/games"
     template_name = "game_confirm_delete.html"
 
@@ -233,154 +719,219 @@ class GameDeleteView(LoginRequiredMixin, DeleteView, SuccessMessageMixin):
 
         return super().post(request, *args, **kwargs)
 
+    def form_valid(self, form):
+        """Remove the game from its players' statistics and the cache as it's deleted."""
+        with transaction.atomic():
+            games_stats_changes({self.object.id: self.object}, sign=-1).save()
+            invalidate_scoreboard(self.object)
+            publish_on_commit(self.object, {"event": "deleted"})
+
+            return super().form_valid(form)
+
 
+@method_decorator(replica_reads, name="dispatch")
 class GameShowView(LoginRequiredMixin, TemplateView):
     """This view shows the details of a game and enables gameplay."""
 
     template_name = "game_show.html"
 
+    @conditional_game_page
     def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        game = get_object_or_404(Game, id=self.kwargs["pk"])
+        game = get_object_or_404(
+            Game.objects.select_related("summary"), id=self.kwargs["pk"]
+        )
 
         if not game.visible_to(self.request.user):
             return HttpResponseForbidden()
 
-        base_context = game_base_context(game)
+        # The players' scores and the round table only change when a bid or score is
+        # submitted, so they are cached against the game summary's version.
+        scoreboard = get_or_build_scoreboard(game, lambda: build_scoreboard(game))
 
-        round_players = (
-            GamePlayerGameRound.objects.select_related("game_round", "game_player")
-            .filter(game_round__game=game)
-            .order_by("game_round__round_number", "game_player__player_number")
-            .all()
+        return render(
+            request,
+            self.template_name,
+            {
+                **game_base_context(game, game_players=scoreboard["game_players"]),
+                "game_rounds": scoreboard["game_rounds"],
+                "live_scoreboard": settings.LIVE_SCOREBOARD_ENABLED,
+            },
         )
 
-        latest_game_round = base_context["latest_game_round"]
 
-        last_round_to_show = (
-            latest_game_round.round_number
-            if latest_game_round.total_tricks_predicted is not None
-            else latest_game_round.round_number - 1
-        )
+@method_decorator(replica_reads, name="dispatch")
+class AsyncGameShowView(AsyncLoginRequiredView):
+    """The async equivalent of GameShowView, which serves it under ASGI."""
 
-        # TODO: Neaten this up, it's a bit of a mess.
-        game_rounds = [
-            (
-                str(round_number),
-                [
-                    {
-                        "tricks_won": round_player.tricks_won
-                        if round_player.tricks_won is not None
-                        else "",
-                        "tricks_predicted": round_player.tricks_predicted
-                        if round_player.tricks_predicted is not None
-                        else "",
-                        "score": (
-                            (round_player.tricks_won or 0)
-                            + (
-                                game.correct_prediction_points
-                                if round_player.tricks_predicted
-                                == round_player.tricks_won
-                                else 0
-                            )
-                        )
-                        * round_score_factor(int(round_number), game)
-                        if round_player.tricks_won is not None
-                        else "",
-                        "player_number": round_player.game_player.player_number,
-                    }
-                    for round_player in round_players
-                    if round_player.game_round.round_number == round_number
-                ],
+    template_name = "game_show.html"
+
+    @conditional_game_page
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            game = await Game.objects.select_related("summary").aget(
+                id=self.kwargs["pk"]
             )
-            for round_number in range(last_round_to_show, 0, -1)
-        ]
+        except Game.DoesNotExist as error:
+            raise Http404 from error
+
+        if not game.visible_to(self.request.user):
+            return HttpResponseForbidden()
+
+        scoreboard = await aget_or_build_scoreboard(
+            game, lambda: abuild_scoreboard(game)
+        )
 
         return render(
             request,
             self.template_name,
             {
-                **base_context,
-                "game_rounds": game_rounds,
+                **game_base_context(game, game_players=scoreboard["game_players"]),
+                "game_rounds": scoreboard["game_rounds"],
+                "live_scoreboard": settings.LIVE_SCOREBOARD_ENABLED,
             },
         )
 
 
+class GameLiveView(View):
+    """This view streams a game's scoreboard deltas to its page, as they happen.
+
+    The stream is held open by an async view, so it is only served through ASGI.
+    """
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        if not settings.LIVE_SCOREBOARD_ENABLED or not isinstance(request, ASGIRequest):
+            raise Http404
+
+        user = await sync_to_async(get_user)(request)
+
+        if not user.is_authenticated:
+            return HttpResponseForbidden()
+
+        try:
+            game = await Game.objects.aget(id=self.kwargs["pk"])
+        except Game.DoesNotExist as error:
+            raise Http404 from error
+
+        if not game.visible_to(user):
+            return HttpResponseForbidden()
+
+        # The browser sends the ID of the last event it saw when it reconnects.
+        last_version = (
+            request.headers.get("Last-Event-ID") or request.GET.get("version") or ""
+        )
+
+        response = StreamingHttpResponse(
+            scoreboard_events(
+                game.id, int(last_version) if last_version.isdigit() else None
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stop proxies from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+
 class GameRoundBaseView(LoginRequiredMixin, FormView):
-    """This is the base for round-specific views."""
+    """This is the base for round-specific views.
 
-    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        game = get_object_or_404(Game, pk=self.kwargs["game_id"])
-        game_round = get_object_or_404(
-            GameRound, round_number=self.kwargs["round_number"], game=game
+    The game, round, round players and base context are each loaded at most once per
+    request, and shared by every hook in the view.
+    """
+
+    @cached_property
+    def game(self) -> Game:
+        """The game, with its summary."""
+        return get_object_or_404(
+            Game.objects.select_related("summary"), pk=self.kwargs["game_id"]
+        )
+
+    @cached_property
+    def loaded_round(self) -> Tuple[GameRound, List[GamePlayerGameRound]]:
+        """The round of the game, and the players' rows for it in bidding order."""
+        try:
+            return load_round(self.game, int(self.kwargs["round_number"]))
+        except GameRound.DoesNotExist as error:
+            raise Http404 from error
+
+    @property
+    def game_round(self) -> GameRound:
+        """The round of the game."""
+        return self.loaded_round[0]
+
+    @property
+    def round_players(self) -> List[GamePlayerGameRound]:
+        """The players' rows for the round (with their game players), in bidding order."""
+        return self.loaded_round[1]
+
+    @cached_property
+    def base_context(self) -> Dict:
+        """The base context for the game, reusing the game players loaded for the round."""
+        return game_base_context(
+            self.game,
+            game_players=sorted(
+                (round_player.game_player for round_player in self.round_players),
+                key=lambda game_player: game_player.player_number,
+            ),
         )
 
-        if not game_round.visible_to(self.request.user):
+    @conditional_game_page
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not self.game_round.visible_to(self.request.user):
             return HttpResponseForbidden()
 
         return super().get(request, *args, **kwargs)
 
+    def post(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        if not self.game_round.visible_to(self.request.user):
+            return HttpResponseForbidden()
+
+        return super().post(request, *args, **kwargs)
+
     def get_success_url(self) -> str:
         return self.request.path
 
     def get_form_kwargs(self) -> Dict:
         kwargs = super().get_form_kwargs()
-        game = get_object_or_404(Game, pk=self.kwargs["game_id"])
-        game_round = get_object_or_404(
-            GameRound, round_number=self.kwargs["round_number"], game=game
-        )
 
         # We want to display the players in the order they should bid.
-        round_players = list(
-            GamePlayerGameRound.objects.select_related("game_round", "game_player")
-            .filter(game_round=game_round)
-            .order_by("game_player__player_number")
-            .all()
-        )
-
-        # TODO: This is duplicating logic from determining the dealer.
-        starting_player_idx = game_round.round_number % len(round_players) + 1
-
-        round_players = (
-            round_players[starting_player_idx:] + round_players[:starting_player_idx]
-        )
-
-        kwargs["round_players"] = round_players
-        kwargs["card_number"] = game_round.card_number
+        kwargs["round_players"] = self.round_players
+        kwargs["card_number"] = self.game_round.card_number
 
         return kwargs
 
-    def get_context_data(self, **kwargs) -> Dict:
-        context = super().get_context_data(**kwargs)
+    def conflict_response(self, form: Form) -> HttpResponse:
+        """Show the round again, as the game changed while the form was submitted.
 
-        game = get_object_or_404(Game, id=self.kwargs["game_id"])
-
-        base_context = game_base_context(game)
+        Args:
+            form (Form): The submitted form.
 
-        game_round = get_object_or_404(
-            GameRound, round_number=self.kwargs["round_number"], game=game
-        )
+        Returns:
+            HttpResponse: The round's page, with the game's current state.
+        """
+        for name in ("game", "loaded_round", "base_context"):
+            self.__dict__.pop(name, None)
 
-        round_players = list(
-            GamePlayerGameRound.objects.select_related("game_round", "game_player")
-            .filter(game_round=game_round)
-            .order_by("game_player__player_number")
-            .all()
+        form.add_error(
+            None,
+            "The game was changed by someone else while this was submitted. Check the "
+            "round and submit it again.",
         )
 
-        starting_player_idx = game_round.round_number % len(round_players) + 1
+        return self.render_to_response(self.get_context_data(form=form), status=409)
 
-        round_players = (
-            round_players[starting_player_idx:] + round_players[:starting_player_idx]
-        )
+    def get_context_data(self, **kwargs) -> Dict:
+        context = super().get_context_data(**kwargs)
 
         context = {
             **context,
-            **base_context,
-            "game_round": game_round,
-            "round_players": round_players,
+            **self.base_context,
+            "game_round": self.game_round,
+            "round_players": self.round_players,
             "player_number": (
                 self.kwargs.get("player_number")
-                or round_players[0].game_player.player_number
+                or self.round_players[0].game_player.player_number
             ),
         }
 
@@ -394,51 +945,17 @@ class GameRoundPredictionView(GameRoundBaseView):
     form_class = GameRoundPredictionForm
 
     def form_valid(self, form: GameRoundPredictionForm) -> HttpResponse:
-        with transaction.atomic():
-            game = get_object_or_404(Game, pk=self.kwargs["game_id"])
-            round_number = int(self.kwargs["round_number"])
-            game_round = get_object_or_404(
-                GameRound, round_number=round_number, game=game
+        try:
+            save_round_bids(
+                self.game,
+                self.game_round,
+                self.round_players,
+                tricks_by_player_number(form),
             )
+        except RoundConflict:
+            return self.conflict_response(form)
 
-            total_tricks_predicted = 0
-
-            for round_player in form.cleaned_data:
-                player_number = round_player.split("_")[-1]
-                tricks_predicted = form.cleaned_data[round_player]
-                game_player_game_round = GamePlayerGameRound.objects.get(
-                    game_round=game_round, game_player__player_number=player_number
-                )
-
-                if game_player_game_round.tricks_won is not None:
-                    # We're editing a round which has already completed, so we need to
-                    # make sure we don't double-count the score from when this round was
-                    # originally played.
-                    score_factor = round_score_factor(round_number, game)
-
-                    if (
-                        game_player_game_round.tricks_predicted
-                        == game_player_game_round.tricks_won
-                    ):
-                        game_player_game_round.game_player.score -= (
-                            game_round.game.correct_prediction_points
-                        ) * score_factor
-
-                    if tricks_predicted == game_player_game_round.tricks_won:
-                        game_player_game_round.game_player.score += (
-                            game_round.game.correct_prediction_points
-                        ) * score_factor
-
-                game_player_game_round.tricks_predicted = tricks_predicted
-                game_player_game_round.save()
-                game_player_game_round.game_player.save()
-
-                total_tricks_predicted += tricks_predicted
-
-            game_round.total_tricks_predicted = total_tricks_predicted
-            game_round.save()
-
-        return HttpResponseRedirect(f"/games/{game_round.game.id}")
+        return HttpResponseRedirect(f"/games/{self.game.id}")
 
 
 class GameRoundScoreView(GameRoundBaseView):
@@ -448,107 +965,14 @@ class GameRoundScoreView(GameRoundBaseView):
     form_class = GameRoundScoreForm
 
     def form_valid(self, form: GameRoundScoreForm) -> HttpResponse:
-        with transaction.atomic():
-            game = get_object_or_404(Game, pk=self.kwargs["game_id"])
-            round_number = int(self.kwargs["round_number"])
-            game_round = get_object_or_404(
-                GameRound, round_number=round_number, game=game
+        try:
+            save_round_scores(
+                self.game,
+                self.game_round,
+                self.round_players,
+                tricks_by_player_number(form),
             )
+        except RoundConflict:
+            return self.conflict_response(form)
 
-            # TODO: Neaten this up.
-            editing_existing_round = False
-
-            for round_player in form.cleaned_data:
-                player_number = round_player.split("_")[-1]
-                tricks_won = form.cleaned_data[round_player]
-                (
-                    game_player_game_round,
-                    _,
-                ) = GamePlayerGameRound.objects.get_or_create(
-                    game_round=game_round,
-                    game_player__player_number=player_number,
-                    defaults={"tricks_won": tricks_won},
-                )
-
-                score_factor = round_score_factor(round_number, game)
-
-                if game_player_game_round.tricks_won is not None:
-                    editing_existing_round = True
-
-                    old_tricks_won = game_player_game_round.tricks_won
-
-                    game_player_game_round.game_player.score -= (
-                        old_tricks_won * score_factor
-                    )
-
-                    if game_player_game_round.tricks_predicted == old_tricks_won:
-                        game_player_game_round.game_player.score -= (
-                            game_round.game.correct_prediction_points
-                        ) * score_factor
-
-                game_player_game_round.tricks_won = tricks_won
-
-                game_player_game_round.game_player.score += tricks_won * score_factor
-
-                if (
-                    game_player_game_round.tricks_predicted
-                    == game_player_game_round.tricks_won
-                ):
-                    game_player_game_round.game_player.score += (
-                        game_round.game.correct_prediction_points
-                    ) * score_factor
-
-                game_player_game_round.save()
-                game_player_game_round.game_player.save()
-
-            if not editing_existing_round:
-                # Now we need to figure out how many cards to deal for the next round.
-                if game_round.game.card_number_descending:
-                    if game_round.card_number == 1:
-                        game_round.game.card_number_descending = False
-                        game_round.game.save()
-                        next_round_card_number = 2
-                    else:
-                        next_round_card_number = game_round.card_number - 1
-                else:
-                    next_round_card_number = game_round.card_number + 1
-
-                # If the next round card number is higher than the starting round card number,
-                # then the game is over.
-                if next_round_card_number > game_round.game.starting_round_card_number:
-                    game_round.game.is_ongoing = False
-                    game_round.game.save()
-
-                    # And we need to redirect to the game's homepage.
-                    return HttpResponseRedirect(f"/games/{game_round.game.id}")
-
-                # We create the next round of the game, with the next trump suit and the
-                # new card number.
-                next_round = GameRound.objects.create(
-                    game=game_round.game,
-                    round_number=game_round.round_number + 1,
-                    trump_suit=NEXT_TRUMP_SUIT[game_round.trump_suit],
-                    card_number=next_round_card_number,
-                )
-
-                # Now set the game_players of the new game_round to the game_players we created
-                # earlier. This will also create the GamePlayerGameRound objects.
-                next_round.game_players.set(game_round.game_players.all())
-
-                next_round.save()
-
-        return HttpResponseRedirect(f"/games/{game_round.game.id}")
-
-
-# TODO: Move these two functions (temporary addition for holiday playing!)
-def is_last_round(round_number: int, starting_round_card_number: int):
-    return round_number == starting_round_card_number * 2 - 1
-
-
-def round_score_factor(round_number: int, game: Game):
-    if game.double_last_round_points and is_last_round(
-        round_number, game.starting_round_card_number
-    ):
-        return 2
-
-    return 1
+        return HttpResponseRedirect(f"/games/{self.game.id}")
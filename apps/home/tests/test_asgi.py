@@ -0,0 +1,40 @@
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.templatetags.static import static
+from django.test import TestCase
+from django.urls import resolve
+
+from apps.games.views import AsyncGameShowView, GameCreateView
+from apps.home.views import AsyncPageView, HomeView
+from predictive_whist.asgi import application
+from predictive_whist.static import StaticFilesMiddleware
+
+
+class AsgiTest(TestCase):
+    def test_read_only_pages_are_served_by_async_views(self):
+        urlconf = application.request_class.urlconf
+
+        self.assertEqual(resolve("/", urlconf).func.view_class, AsyncPageView)
+        self.assertEqual(
+            resolve("/games/gam_abc123/", urlconf).func.view_class, AsyncGameShowView
+        )
+        # Every other page is served by its sync view, as under WSGI.
+        self.assertEqual(
+            resolve("/games/new/", urlconf).func.view_class, GameCreateView
+        )
+        self.assertEqual(resolve("/").func.view_class, HomeView)
+
+    def test_static_files_middleware_is_async_under_asgi(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(StaticFilesMiddleware(get_response)))
+        self.assertFalse(
+            iscoroutinefunction(StaticFilesMiddleware(lambda request: HttpResponse()))
+        )
+
+    async def test_static_files_are_served_under_asgi(self):
+        response = await self.async_client.get(static("images/aces.png"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
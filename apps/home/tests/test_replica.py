@@ -0,0 +1,142 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.games.models import Game
+from apps.games.tests.utils import create_game, create_players, create_user
+from apps.players.models import Player
+from predictive_whist.replica import (
+    PRIMARY_COOKIE,
+    REPLICA_DATABASE,
+    ReplicaMiddleware,
+    replica_reads,
+)
+
+
+@override_settings(DATABASE_REPLICA_LAG_SECONDS=5)
+class ReplicaTest(TestCase):
+    """The primary is the test database, and the replica a second SQLite file, which
+    is a copy of the primary from when `replicate()` was last called."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.directory = TemporaryDirectory()
+        connections.settings[REPLICA_DATABASE] = {
+            **connections.settings[DEFAULT_DB_ALIAS],
+            "NAME": str(Path(cls.directory.name) / "replica.sqlite3"),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA_DATABASE].close()
+        del connections[REPLICA_DATABASE]
+        del connections.settings[REPLICA_DATABASE]
+        cls.directory.cleanup()
+
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = create_user()
+        self.user.is_staff = True
+        self.user.is_superuser = True
+        self.user.save()
+        self.game = create_game(self.user, create_players(self.user, 2))
+        self.replicate()
+
+        # The replica hasn't caught up with this game yet.
+        self.new_game = create_game(self.user, list(Player.objects.all()))
+        self.client.force_login(self.user)
+
+    def replicate(self):
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[REPLICA_DATABASE]
+        replica.close()
+        Path(replica.settings_dict["NAME"]).unlink(missing_ok=True)
+
+        # The primary's changes are uncommitted, inside the test's transaction, so they
+        # are copied as SQL rather than with SQLite's backup. The tables are dumped in
+        # name order, so foreign keys are only checked once they are all there.
+        primary.ensure_connection()
+        replica.ensure_connection()
+        replica.connection.executescript(
+            "PRAGMA foreign_keys = OFF;\n"
+            + "\n".join(primary.connection.iterdump())
+            + "\nPRAGMA foreign_keys = ON;"
+        )
+
+    def ongoing_game_ids(self) -> list:
+        response = self.client.get("/games/")
+
+        return [game["id"] for game in response.context["ongoing_games"]]
+
+    def test_read_only_pages_read_from_the_replica(self):
+        self.assertEqual(self.ongoing_game_ids(), [self.game.id])
+
+        response = self.client.get(f"/games/{self.new_game.id}/")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get("/admin/games/game/")
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+    async def test_through_asgi(self):
+        self.async_client.cookies = self.client.cookies
+
+        response = await self.async_client.get("/games/")
+
+        self.assertEqual(
+            [game["id"] for game in response.context["ongoing_games"]], [self.game.id]
+        )
+
+    def test_other_pages_read_from_the_primary(self):
+        response = self.client.get(f"/games/{self.new_game.id}/round/1/bids/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_writes_keep_the_user_on_the_primary(self):
+        response = self.client.post(
+            "/players/new/", {"first_name": "Zoe", "last_name": "Smith"}
+        )
+
+        self.assertEqual(response.cookies[PRIMARY_COOKIE]["max-age"], 5)
+
+        self.assertEqual(self.ongoing_game_ids(), [self.game.id, self.new_game.id])
+
+        # Once the lag tolerance has passed, the replica is read again.
+        self.client.cookies.pop(PRIMARY_COOKIE)
+        self.assertEqual(self.ongoing_game_ids(), [self.game.id])
+
+    @override_settings(DATABASE_REPLICA_LAG_SECONDS=0)
+    def test_no_lag_tolerance(self):
+        response = self.client.post(
+            "/players/new/", {"first_name": "Zoe", "last_name": "Smith"}
+        )
+
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+    def test_reads_after_a_write_use_the_primary(self):
+        databases = []
+
+        @replica_reads
+        def view(request):
+            databases.append(router.db_for_read(Game))
+            Player.objects.create(
+                first_name="Zoe", last_name="Smith", created_by_user=self.user
+            )
+            databases.append(router.db_for_read(Game))
+
+            return HttpResponse()
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+
+            return view(request)
+
+        middleware = ReplicaMiddleware(get_response)
+        middleware(RequestFactory().get("/"))
+
+        self.assertEqual(databases, [REPLICA_DATABASE, DEFAULT_DB_ALIAS])
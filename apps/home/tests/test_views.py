@@ -1,6 +1,8 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from ..views import AsyncPageView
+
 
 class HomeViewTest(TestCase):
     def test_get_by_path(self):
@@ -14,6 +16,13 @@ class HomeViewTest(TestCase):
         self.assertTemplateUsed(response, "index.html")
         self.assertEqual(response.status_code, 200)
 
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_get_through_asgi(self):
+        response = await self.async_client.get("/")
+
+        self.assertTemplateUsed(response, "index.html")
+        self.assertEqual(response.resolver_match.func.view_class, AsyncPageView)
+
     def test_only_get_method_allowed(self):
         response = self.client.put("/")
         self.assertEqual(response.status_code, 405)
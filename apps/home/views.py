@@ -2,6 +2,8 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from ..users.views import AsyncUserView
+
 
 class HomeView(TemplateView):
     """Home view."""
@@ -37,3 +39,15 @@ class PrivacyPolicyView(TemplateView):
 
     def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
         return render(request, self.template_name, {})
+
+
+class AsyncPageView(AsyncUserView):
+    """The async equivalent of the views above, which serves them under ASGI.
+
+    The page's template is given to `as_view()`.
+    """
+
+    template_name = "index.html"
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        return render(request, self.template_name, {})
@@ -1,10 +1,22 @@
 from django.contrib import admin
 
-from .models import Player
+from predictive_whist.replica import ReplicaReadsAdminMixin
 
+from .models import Player, PlayerRating, PlayerStats
 
-class PlayerAdmin(admin.ModelAdmin):
+
+class PlayerAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
     readonly_fields = ("inserted_at", "updated_at")
 
 
+class PlayerStatsAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
+    readonly_fields = ("updated_at",)
+
+
+class PlayerRatingAdmin(ReplicaReadsAdminMixin, admin.ModelAdmin):
+    readonly_fields = ("updated_at",)
+
+
 admin.site.register(Player, PlayerAdmin)
+admin.site.register(PlayerStats, PlayerStatsAdmin)
+admin.site.register(PlayerRating, PlayerRatingAdmin)
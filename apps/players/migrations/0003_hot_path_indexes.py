@@ -0,0 +1,31 @@
+# Generated by Django 4.2.3 on 2026-10-17 19:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("players", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="player",
+            name="created_by_user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="created_players",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="player",
+            index=models.Index(
+                fields=["created_by_user", "is_deleted"], name="player_user_deleted_idx"
+            ),
+        ),
+    ]
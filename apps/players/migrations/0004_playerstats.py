@@ -0,0 +1,39 @@
+# Generated by Django 4.2.3 on 2026-10-17 20:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("players", "0003_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerStats",
+            fields=[
+                (
+                    "player",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="players.player",
+                    ),
+                ),
+                ("completed_games", models.IntegerField(default=0)),
+                ("games_won", models.IntegerField(default=0)),
+                ("rounds_played", models.IntegerField(default=0)),
+                ("correct_predictions", models.IntegerField(default=0)),
+                ("round_points", models.IntegerField(default=0)),
+                ("zero_bids", models.IntegerField(default=0)),
+                ("zero_bids_made", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "player stats",
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.3 on 2026-10-17 20:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("players", "0004_playerstats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerRating",
+            fields=[
+                (
+                    "player",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating",
+                        serialize=False,
+                        to="players.player",
+                    ),
+                ),
+                ("rating", models.FloatField()),
+                ("games_rated", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "created_by_user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["created_by_user", "-rating"],
+                        name="rating_user_rating_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from typing import Any, List
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
 from django.db import models
 from django.conf import settings
 
@@ -27,12 +28,24 @@ class Player(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="created_players",
+        # Covered by the leading column of the index in Meta.
+        db_index=False,
     )
     is_deleted = models.BooleanField(default=False)
 
     inserted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # The timestamps and index declarations are Django boilerplate shared with Game.
+    # pylint: disable-next=duplicate-code
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_by_user", "is_deleted"],
+                name="player_user_deleted_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
@@ -50,7 +63,7 @@ class Player(models.Model):
         Returns:
             bool: Whether the given user can see this player.
         """
-        return self.created_by_user == user or user.is_superuser
+        return self.created_by_user_id == user.id or user.is_superuser
 
     def full_name(self) -> str:
         """The full name of this player.
@@ -75,27 +88,7 @@ class Player(models.Model):
         Returns:
             str: The unique player name.
         """
-        if len([p for p in players if self.first_name == p.first_name]) == 1:
-            return self.first_name
-
-        # There is more than one player with this first name. Append as many letters as
-        # necessary from the surname to make it unique.
-        for i in range(1, len(self.last_name) - 1):
-            truncated_last_name = f"{self.last_name[:i]}"
-            if (
-                len(
-                    [
-                        p
-                        for p in players
-                        if p.first_name == self.first_name
-                        and p.last_name.startswith(truncated_last_name)
-                    ]
-                )
-                == 1
-            ):
-                return self.first_name + " " + truncated_last_name + "."
-
-        return self.full_name()
+        return unique_display_names([self, *(p for p in players if p != self)])[0]
 
     def initials(self) -> str:
         """The initials of this player.
@@ -108,3 +101,199 @@ class Player(models.Model):
             return "".join(s[0] for s in string.replace(" ", "-").split("-"))
 
         return _initials(self.first_name) + _initials(self.last_name)
+
+
+def unique_display_names(players: List[Player]) -> List[str]:
+    """Returns the unique display name of each player in a list, as in a game.
+
+    The names are those described in `Player.unique_display_name`, worked out for every
+    player at once: the players are grouped by first name, and the prefixes of the
+    surnames within each group are counted, so nobody's name needs another scan of
+    the list.
+
+    Args:
+        players (List[Player]): The list of all players in a game.
+
+    Returns:
+        List[str]: The unique display name of each player, in the same order.
+    """
+    names = [player.first_name for player in players]
+    indices_by_first_name: Dict[str, List[int]] = defaultdict(list)
+
+    for idx, player in enumerate(players):
+        indices_by_first_name[player.first_name].append(idx)
+
+    for indices in indices_by_first_name.values():
+        if len(indices) == 1:
+            continue
+
+        # The number of players with this first name whose surname starts with each
+        # prefix.
+        prefix_counts = Counter(
+            players[idx].last_name[:i]
+            for idx in indices
+            for i in range(1, len(players[idx].last_name) + 1)
+        )
+
+        for idx in indices:
+            player = players[idx]
+            names[idx] = next(
+                (
+                    f"{player.first_name} {player.last_name[:i]}."
+                    for i in range(1, len(player.last_name) - 1)
+                    if prefix_counts[player.last_name[:i]] == 1
+                ),
+                player.full_name(),
+            )
+
+    return names
+
+
+class PlayerStats(models.Model):
+    """A player's statistics across every game they have played.
+
+    These are counters, kept up to date as rounds are scored or edited and as games are
+    completed, imported or deleted (see `apps.games.stats`), so a player's statistics
+    are read from one row rather than recomputed from every round they have played.
+    They can be rebuilt from the rounds with the `rebuild_player_stats` command.
+
+    Attributes:
+        player (Player): The player.
+        completed_games (int): The number of completed games the player played in.
+        games_won (int):
+            The number of completed games in which nobody scored more than the player.
+        rounds_played (int): The number of scored rounds the player played in.
+        correct_predictions (int):
+            The number of rounds in which the player won the tricks they bid.
+        round_points (int): The total of the player's scores in every round.
+        zero_bids (int): The number of rounds in which the player bid no tricks.
+        zero_bids_made (int):
+            The number of rounds in which the player bid no tricks and won none.
+        updated_at (datetime): The datetime when these statistics were last updated.
+    """
+
+    player = models.OneToOneField(
+        Player, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    # The mypy plugin can't derive the type of a foreign key to a hashid primary key.
+    player_id: Any
+    completed_games = models.IntegerField(default=0)
+    games_won = models.IntegerField(default=0)
+    rounds_played = models.IntegerField(default=0)
+    correct_predictions = models.IntegerField(default=0)
+    round_points = models.IntegerField(default=0)
+    zero_bids = models.IntegerField(default=0)
+    zero_bids_made = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "player stats"
+
+    def __str__(self) -> str:
+        return str(self.player_id)
+
+    @classmethod
+    def for_player(cls, player: Player) -> "PlayerStats":
+        """The statistics of a player loaded with `select_related("stats")`.
+
+        Args:
+            player (Player): The player.
+
+        Returns:
+            PlayerStats: The player's statistics, which are all zero (and unsaved) if
+                they haven't played a round yet.
+        """
+        try:
+            return player.stats  # type: ignore[attr-defined]
+        except cls.DoesNotExist:
+            return cls(player=player)
+
+    def bid_accuracy(self) -> Optional[float]:
+        """The percentage of rounds in which the player won the tricks they bid.
+
+        Returns:
+            Optional[float]: The percentage, if the player has played a round.
+        """
+        if not self.rounds_played:
+            return None
+
+        return 100 * self.correct_predictions / self.rounds_played
+
+    def average_round_points(self) -> Optional[float]:
+        """The player's average score in a round.
+
+        Returns:
+            Optional[float]: The average score, if the player has played a round.
+        """
+        if not self.rounds_played:
+            return None
+
+        return self.round_points / self.rounds_played
+
+    def zero_bid_success_rate(self) -> Optional[float]:
+        """The percentage of the player's bids of no tricks in which they won none.
+
+        Returns:
+            Optional[float]: The percentage, if the player has bid no tricks.
+        """
+        if not self.zero_bids:
+            return None
+
+        return 100 * self.zero_bids_made / self.zero_bids
+
+    def win_rate(self) -> Optional[float]:
+        """The percentage of completed games the player has won.
+
+        Returns:
+            Optional[float]: The percentage, if the player has completed a game.
+        """
+        if not self.completed_games:
+            return None
+
+        return 100 * self.games_won / self.completed_games
+
+
+class PlayerRating(models.Model):
+    """A player's skill rating, from the results of the completed games they played.
+
+    Ratings are updated as games are completed (see `apps.games.ratings`), and can be
+    recomputed from every completed game with the `replay_ratings` command. The user
+    who created the player is copied here so that a user's leaderboard is read from
+    the index in order.
+
+    Attributes:
+        player (Player): The player.
+        created_by_user (auth.User): The user who created the player.
+        rating (float): The player's rating.
+        games_rated (int): The number of completed games the rating is based on.
+        updated_at (datetime): The datetime when this rating was last updated.
+    """
+
+    player = models.OneToOneField(
+        Player, on_delete=models.CASCADE, primary_key=True, related_name="rating"
+    )
+    # The mypy plugin can't derive the type of a foreign key to a hashid primary key.
+    player_id: Any
+    created_by_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        # Covered by the leading column of the index in Meta.
+        db_index=False,
+    )
+    rating = models.FloatField()
+    games_rated = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_by_user", "-rating"],
+                name="rating_user_rating_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.player_id}: {self.rating:.0f}"
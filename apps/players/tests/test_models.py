@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+
+from ..models import Player, unique_display_names
+
+
+def players(*names):
+    return [
+        Player(first_name=first_name, last_name=last_name)
+        for first_name, last_name in (name.split(" ") for name in names)
+    ]
+
+
+class UniqueDisplayNamesTest(SimpleTestCase):
+    def test_unique_first_names(self):
+        self.assertEqual(
+            unique_display_names(players("Alice Smith", "Bob Smith")), ["Alice", "Bob"]
+        )
+
+    def test_shared_first_names(self):
+        self.assertEqual(
+            unique_display_names(
+                players("Alice Smith", "Bob Smith", "Alice Smythe", "Alice Jones")
+            ),
+            ["Alice Smi.", "Bob", "Alice Smy.", "Alice J."],
+        )
+
+    def test_indistinguishable_names(self):
+        self.assertEqual(
+            unique_display_names(players("Alice Smith", "Alice Smith", "Alice Sm")),
+            ["Alice Smith", "Alice Smith", "Alice Sm"],
+        )
+
+    def test_unique_display_name(self):
+        game_players = players("Alice Smith", "Bob Smith", "Alice Jones")
+
+        self.assertEqual(game_players[2].unique_display_name(game_players), "Alice J.")
@@ -0,0 +1,191 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.games.tests.utils import create_game, create_players, create_user
+
+from ..models import PlayerRating, PlayerStats
+from ..views import AsyncPlayerListView, AsyncPlayerShowView
+
+
+class PlayerListViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.players = create_players(self.user, 3)
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+
+    def _count_queries(self) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/players/")
+
+        self.assertEqual(response.status_code, 200)
+
+        return len(context.captured_queries)
+
+    def test_get(self):
+        create_game(self.user, self.players, scores=[1, 2, 3])
+        create_game(self.user, self.players, is_ongoing=False, scores=[10, 4, 10])
+        create_game(self.user, self.players[:2], is_ongoing=False, scores=[2, 5])
+        # The games are created without playing their rounds, so their statistics are
+        # saved by hand.
+        PlayerStats.objects.create(
+            player=self.players[0],
+            completed_games=2,
+            games_won=1,
+            rounds_played=4,
+            correct_predictions=3,
+            round_points=13,
+        )
+        PlayerStats.objects.create(
+            player=self.players[1], completed_games=2, games_won=1
+        )
+        PlayerStats.objects.create(
+            player=self.players[2], completed_games=1, games_won=1
+        )
+
+        response = self.client.get("/players/")
+
+        self.assertTemplateUsed(response, "player_list.html")
+        players = {
+            player["full_name"]: player for player in response.context["players"]
+        }
+
+        self.assertEqual(players["Alice Smith"]["ongoing_games"], 1)
+        self.assertEqual(players["Alice Smith"]["completed_games"], 2)
+        self.assertEqual(players["Alice Smith"]["games_won"], 1)
+        self.assertEqual(players["Alice Smith"]["total_points"], 13)
+        self.assertEqual(players["Alice Smith"]["bid_accuracy"], 75)
+        self.assertEqual(players["Alice Smith"]["average_round_points"], 3.25)
+        self.assertFalse(players["Alice Smith"]["is_deletable"])
+
+        self.assertEqual(players["Bob Smith"]["games_won"], 1)
+        self.assertEqual(players["Carol Smith"]["games_won"], 1)
+        self.assertEqual(players["Carol Smith"]["completed_games"], 1)
+
+        self.assertEqual(players["First Last"]["ongoing_games"], 0)
+        self.assertEqual(players["First Last"]["games_won"], 0)
+        self.assertEqual(players["First Last"]["total_points"], 0)
+        self.assertIsNone(players["First Last"]["bid_accuracy"])
+        self.assertFalse(players["First Last"]["is_deletable"])
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_get_through_asgi(self):
+        response = await self.async_client.get("/players/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.resolver_match.func.view_class, AsyncPlayerListView)
+        self.assertEqual(len(response.context["players"]), 4)
+
+    def test_query_count_does_not_grow_with_number_of_players(self):
+        create_game(self.user, self.players, is_ongoing=False)
+        baseline_query_count = self._count_queries()
+
+        players = create_players(self.user, 10)
+        create_game(self.user, players)
+        create_game(self.user, players, is_ongoing=False)
+
+        self.assertEqual(self._count_queries(), baseline_query_count)
+
+
+class PlayerShowViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        (self.player,) = create_players(self.user, 1)
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+
+    def test_get(self):
+        PlayerStats.objects.create(
+            player=self.player,
+            completed_games=4,
+            games_won=1,
+            rounds_played=20,
+            correct_predictions=9,
+            round_points=130,
+            zero_bids=5,
+            zero_bids_made=4,
+        )
+
+        # The session and user, then the player with their statistics.
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/players/{self.player.id}/")
+
+        self.assertTemplateUsed(response, "player_show.html")
+        content = response.content.decode()
+        self.assertIn("Alice Smith", content)
+        self.assertIn("45%", content)
+        self.assertIn("6.5", content)
+        self.assertIn("4 of 5", content)
+
+    def test_rating(self):
+        PlayerStats.objects.create(
+            player=self.player, completed_games=3, rounds_played=15
+        )
+        PlayerRating.objects.create(
+            player=self.player, created_by_user=self.user, rating=1532.4, games_rated=3
+        )
+
+        response = self.client.get(f"/players/{self.player.id}/")
+
+        self.assertIn("1532 (from 3 games)", response.content.decode())
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_get_through_asgi(self):
+        response = await self.async_client.get(f"/players/{self.player.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.resolver_match.func.view_class, AsyncPlayerShowView)
+        self.assertIn("hasn't played a round yet", response.content.decode())
+
+    def test_other_users_player(self):
+        self.client.force_login(create_user(email="other@example.com"))
+
+        response = self.client.get(f"/players/{self.player.id}/")
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_not_found(self):
+        response = self.client.get("/players/pla_doesnotexist/")
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(ROOT_URLCONF="predictive_whist.asgi_urls")
+    async def test_not_found_through_asgi(self):
+        response = await self.async_client.get("/players/pla_doesnotexist/")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class PlayerLeaderboardViewTest(TestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_login(self.user)
+
+    def rate(self, players, ratings):
+        for player, rating in zip(players, ratings):
+            PlayerRating.objects.create(
+                player=player, created_by_user=player.created_by_user, rating=rating
+            )
+
+    def test_get(self):
+        players = create_players(self.user, 3)
+        self.rate(players, [1480, 1530, 1490])
+        players[2].delete()
+        other_user = create_user(email="other@example.com")
+        self.rate(create_players(other_user, 1), [1600])
+
+        # The session and user, then the ratings with their players.
+        with self.assertNumQueries(3):
+            response = self.client.get("/players/leaderboard/")
+
+        self.assertTemplateUsed(response, "player_leaderboard.html")
+        self.assertEqual(
+            [rating.player.first_name for rating in response.context["ratings"]],
+            ["Bob", "Alice"],
+        )
+
+    def test_without_ratings(self):
+        response = self.client.get("/players/leaderboard/")
+
+        self.assertIn("once they have completed a game", response.content.decode())
@@ -1,21 +1,101 @@
+from typing import Dict, Iterable, List
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db.models import Count, Q, QuerySet, Sum
 from django.http import (
+    Http404,
     HttpRequest,
     HttpResponse,
+    HttpResponseForbidden,
     HttpResponseRedirect,
 )
 from django.shortcuts import get_object_or_404, render
+from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 from django.views.generic.edit import CreateView, DeleteView
 
+from predictive_whist.replica import replica_reads
+
 from .forms import (
     PlayerModelForm,
 )
-from .models import Player
+from .models import Player, PlayerRating, PlayerStats
 from ..games.models import GamePlayer
+from ..users.views import AsyncLoginRequiredView
+
+
+def player_list_players(user) -> QuerySet[Player]:
+    """The players shown in the given user's player list."""
+    return (
+        Player.objects.filter(created_by_user=user)
+        .exclude(is_deleted=True)
+        .select_related("stats")
+    )
+
+
+def player_list_counts(user) -> QuerySet:
+    """Every player's counters of games in the given user's player list.
+
+    They are computed in one grouped query. The rest of the players' statistics are read
+    with them, from PlayerStats.
+    """
+    return (
+        GamePlayer.objects.filter(player__created_by_user=user)
+        .exclude(player__is_deleted=True)
+        .values("player")
+        .annotate(
+            ongoing_games=Count("id", filter=Q(game__is_ongoing=True)),
+            completed_games=Count("id", filter=Q(game__is_ongoing=False)),
+            total_points=Sum("score"),
+        )
+    )
+
+
+def player_list_rows(
+    user, player_rows: Iterable[Player], player_counts: Dict
+) -> List[Dict]:
+    """Return the rows of the given user's player list.
+
+    Args:
+        user (auth.User): The user whose players are listed.
+        player_rows (Iterable[Player]): The players, from `player_list_players`.
+        player_counts (Dict): The counters of each player's games, by player ID, from
+            `player_list_counts`.
+
+    Returns:
+        List[Dict]: A row for each player.
+    """
+    players = []
+
+    for player in player_rows:
+        counts = player_counts.get(player.id, {})
+        stats = PlayerStats.for_player(player)
+        ongoing_games = counts.get("ongoing_games", 0)
+        players.append(
+            {
+                "full_name": player.full_name(),
+                "inserted_at": player.inserted_at,
+                "id": player.id,
+                "ongoing_games": ongoing_games,
+                "completed_games": counts.get("completed_games", 0),
+                "games_won": stats.games_won,
+                "total_points": counts.get("total_points", 0),
+                "bid_accuracy": stats.bid_accuracy(),
+                "average_round_points": stats.average_round_points(),
+                "is_deletable": (
+                    ongoing_games == 0
+                    and player.created_by_user_id == user.id
+                    # The user's own player can't be deleted.
+                    and player.user_id != user.id
+                ),
+            }
+        )
+
+    return players
 
 
+@method_decorator(replica_reads, name="dispatch")
 class PlayerListView(LoginRequiredMixin, TemplateView):
     """This view lists all players created by the current user."""
 
@@ -25,42 +105,119 @@ class PlayerListView(LoginRequiredMixin, TemplateView):
         """Get all players created by the current user."""
         assert self.request.user.is_authenticated
 
-        players = [
+        players = player_list_rows(
+            self.request.user,
+            player_list_players(self.request.user),
             {
-                "full_name": player.full_name(),
-                "inserted_at": player.inserted_at,
-                "created_by_user": player.created_by_user,
-                "id": player.id,
-            }
-            for player in Player.objects.filter(created_by_user=self.request.user)
-            .exclude(is_deleted=True)
-            .all()
-        ]
-
-        game_players = (
-            GamePlayer.objects.select_related("player", "game")
-            .filter(player__created_by_user=self.request.user)
-            .exclude(player__is_deleted=True)
-            .all()
+                counts["player"]: counts
+                for counts in player_list_counts(self.request.user)
+            },
         )
 
-        for player in players:
-            player["ongoing_games"] = game_players.filter(
-                player__id=player["id"], game__is_ongoing=True
-            ).count()
-            player["completed_games"] = game_players.filter(
-                player__id=player["id"], game__is_ongoing=False
-            ).count()
-            # TODO: Add games won.
-            player["is_deletable"] = (
-                player["ongoing_games"] == 0
-                and player["created_by_user"] == self.request.user
-                and player["id"] != self.request.user.player.id
-            )
+        return render(request, self.template_name, {"players": players})
+
+
+@method_decorator(replica_reads, name="dispatch")
+class AsyncPlayerListView(AsyncLoginRequiredView):
+    """The async equivalent of PlayerListView, which serves it under ASGI."""
+
+    template_name = "player_list.html"
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        assert self.request.user.is_authenticated
+
+        players = player_list_rows(
+            self.request.user,
+            [player async for player in player_list_players(self.request.user)],
+            {
+                counts["player"]: counts
+                async for counts in player_list_counts(self.request.user)
+            },
+        )
 
         return render(request, self.template_name, {"players": players})
 
 
+class PlayerShowView(LoginRequiredMixin, TemplateView):
+    """This view shows a player's statistics."""
+
+    template_name = "player_show.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        player = get_object_or_404(
+            Player.objects.select_related("stats", "rating"), pk=self.kwargs["pk"]
+        )
+
+        if not player.visible_to(self.request.user):
+            return HttpResponseForbidden()
+
+        try:
+            rating = player.rating  # type: ignore[attr-defined]
+        except PlayerRating.DoesNotExist:
+            rating = None
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "player": player,
+                "stats": PlayerStats.for_player(player),
+                "rating": rating,
+            },
+        )
+
+
+class AsyncPlayerShowView(AsyncLoginRequiredView):
+    """The async equivalent of PlayerShowView, which serves it under ASGI."""
+
+    template_name = "player_show.html"
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            player = await Player.objects.select_related("stats", "rating").aget(
+                pk=self.kwargs["pk"]
+            )
+        except Player.DoesNotExist as error:
+            raise Http404 from error
+
+        if not player.visible_to(self.request.user):
+            return HttpResponseForbidden()
+
+        try:
+            rating = player.rating  # type: ignore[attr-defined]
+        except PlayerRating.DoesNotExist:
+            rating = None
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "player": player,
+                "stats": PlayerStats.for_player(player),
+                "rating": rating,
+            },
+        )
+
+
+class PlayerLeaderboardView(LoginRequiredMixin, TemplateView):
+    """This view ranks the current user's players by their rating."""
+
+    template_name = "player_leaderboard.html"
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        assert self.request.user.is_authenticated
+
+        # The ratings are read in order from the (created_by_user, -rating) index.
+        ratings = (
+            PlayerRating.objects.filter(created_by_user=self.request.user)
+            .exclude(player__is_deleted=True)
+            .select_related("player")
+            .order_by("-rating")
+        )
+
+        return render(request, self.template_name, {"ratings": ratings})
+
+
 class PlayerCreateView(LoginRequiredMixin, CreateView):
     """This view allows the user to create a new player."""
 
@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
+from predictive_whist.replica import ReplicaReadsAdminMixin
+
 from .forms import UserCreateForm, UserUpdateForm
 from .models import User
 
 
-class UserAdmin(DjangoUserAdmin):
+class UserAdmin(ReplicaReadsAdminMixin, DjangoUserAdmin):
     list_display = ("email", "first_name", "last_name")
     ordering = ("email",)
 
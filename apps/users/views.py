@@ -1,5 +1,10 @@
-from django.contrib.auth.mixins import LoginRequiredMixin
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
 from django.db import transaction
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.views.generic import View
 from django.views.generic.edit import UpdateView
 
 from django_registration.backends.one_step.views import RegistrationView  # type: ignore
@@ -52,3 +57,39 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
             player.save()
 
         return super().form_valid(form)
+
+
+class AsyncUserView(View):
+    """The base of views with async handlers, which loads the request's user first.
+
+    Django loads `request.user` lazily from the session and the database, which can't
+    happen in an async view. The user is loaded in a thread first, so the handlers and
+    the templates they render can read it as normal.
+    """
+
+    # The view returned by as_view() is a coroutine function when the handlers are
+    # async, so Django awaits what dispatch() returns.
+    # pylint: disable-next=invalid-overridden-method
+    async def dispatch(  # type: ignore[override]
+        self, request: HttpRequest, *args, **kwargs
+    ) -> HttpResponseBase:
+        request.user = await sync_to_async(get_user)(request)  # type: ignore[assignment]
+
+        return await super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+
+class AsyncLoginRequiredView(AccessMixin, View):
+    """The equivalent of `LoginRequiredMixin` for views with async handlers."""
+
+    # The view returned by as_view() is a coroutine function when the handlers are
+    # async, so Django awaits what dispatch() returns.
+    # pylint: disable-next=invalid-overridden-method
+    async def dispatch(  # type: ignore[override]
+        self, request: HttpRequest, *args, **kwargs
+    ) -> HttpResponseBase:
+        request.user = await sync_to_async(get_user)(request)  # type: ignore[assignment]
+
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+
+        return await super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
@@ -0,0 +1,9 @@
+"""The app served through ASGI with the same (sync) views as under WSGI.
+
+The serving benchmark compares it against predictive_whist.asgi, which serves the
+read-only pages from their async views, to tell the gain from the views apart from the
+gain from the server.
+"""
+from django.core.asgi import get_asgi_application
+
+application = get_asgi_application()
@@ -0,0 +1,126 @@
+"""Benchmark building the game page's round table for a long game.
+
+Compares `build_round_table` against the nested comprehension GameShowView used
+before, with the score factor helpers it called, at 7 players x 52 rounds. No database
+is needed.
+
+Usage:
+    python -m benchmarks.round_table
+"""
+import os
+import timeit
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "predictive_whist.settings")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from apps.games.models import Game, GamePlayer, GamePlayerGameRound, GameRound
+from apps.games.schedule import MAX_TO_ONE_ONE_TO_MAX
+from apps.games.scoring import build_round_table
+
+PLAYERS = 7
+ROUNDS = 52
+REPEATS = 20
+
+
+def legacy_is_last_round(round_number: int, starting_round_card_number: int):
+    """Whether a round was the last, as GameShowView used to work it out."""
+    return round_number == starting_round_card_number * 2 - 1
+
+
+def legacy_round_score_factor(round_number: int, game: Game):
+    """The score factor of a round, as GameShowView used to work it out."""
+    if game.double_last_round_points and legacy_is_last_round(
+        round_number, game.starting_round_card_number
+    ):
+        return 2
+
+    return 1
+
+
+def legacy_round_table(game, round_players, last_round_to_show):
+    """The round table as GameShowView used to build it."""
+    return [
+        (
+            str(round_number),
+            [
+                {
+                    "tricks_won": round_player.tricks_won
+                    if round_player.tricks_won is not None
+                    else "",
+                    "tricks_predicted": round_player.tricks_predicted
+                    if round_player.tricks_predicted is not None
+                    else "",
+                    "score": (
+                        (round_player.tricks_won or 0)
+                        + (
+                            game.correct_prediction_points
+                            if round_player.tricks_predicted == round_player.tricks_won
+                            else 0
+                        )
+                    )
+                    * legacy_round_score_factor(int(round_number), game)
+                    if round_player.tricks_won is not None
+                    else "",
+                    "player_number": round_player.game_player.player_number,
+                }
+                for round_player in round_players
+                if round_player.game_round.round_number == round_number
+            ],
+        )
+        for round_number in range(last_round_to_show, 0, -1)
+    ]
+
+
+def main() -> None:
+    game = Game(
+        correct_prediction_points=5,
+        starting_round_card_number=ROUNDS // 2,
+        double_last_round_points=True,
+        card_progression=MAX_TO_ONE_ONE_TO_MAX,
+    )
+    game_players = [
+        GamePlayer(player_number=player_number)
+        for player_number in range(1, PLAYERS + 1)
+    ]
+    game_rounds = [
+        GameRound(round_number=round_number) for round_number in range(1, ROUNDS + 1)
+    ]
+
+    round_players = [
+        GamePlayerGameRound(
+            game_round=game_round,
+            game_player=game_player,
+            tricks_predicted=game_player.player_number % 3,
+            tricks_won=game_round.round_number % 3,
+        )
+        for game_round in game_rounds
+        for game_player in game_players
+    ]
+    round_rows = [
+        {
+            "game_round__round_number": round_player.game_round.round_number,
+            "game_player__player_number": round_player.game_player.player_number,
+            "tricks_predicted": round_player.tricks_predicted,
+            "tricks_won": round_player.tricks_won,
+        }
+        for round_player in round_players
+    ]
+
+    legacy_seconds = timeit.timeit(
+        lambda: legacy_round_table(game, round_players, ROUNDS), number=REPEATS
+    )
+    seconds = timeit.timeit(
+        lambda: build_round_table(game, round_rows, ROUNDS), number=REPEATS
+    )
+
+    print(f"{PLAYERS} players x {ROUNDS} rounds, mean of {REPEATS} runs:")
+    print(f"  legacy comprehension: {legacy_seconds / REPEATS * 1000:8.3f} ms")
+    print(f"  build_round_table:    {seconds / REPEATS * 1000:8.3f} ms")
+    print(f"  speedup:              {legacy_seconds / seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Benchmark concurrent-request throughput of the read-only pages under each server.
+
+Compares the sync views under gunicorn's sync workers (as served in production) against
+the async views of the read-only pages under gunicorn running uvicorn's ASGI workers,
+with the same number of workers each. The sync views are also served under uvicorn, to
+tell the gain from the async views apart from the gain from the server.
+
+A throwaway database and static files are set up in a temporary directory (see
+benchmarks/settings.py), with a benchmark user who has some games, then each server is
+started in turn and the game, game list, player list and home pages are requested by
+many concurrent clients.
+
+Needs uvicorn (see requirements-dev.txt).
+
+Usage:
+    python -m benchmarks.serving [--workers 2] [--concurrency 32] [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import secrets
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import django
+
+# The servers inherit the environment, and so share the settings, the benchmark's
+# directory and the secret key, which they need to read the benchmark user's session.
+os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+os.environ["BENCHMARK_DIRECTORY"] = tempfile.mkdtemp(prefix="whist-benchmark-")
+os.environ.setdefault("DJANGO_SECRET_KEY", secrets.token_urlsafe(nbytes=64))
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client
+
+from apps.games.models import Game
+from apps.games.tests.utils import create_game, create_players
+from apps.users.models import User
+
+BENCHMARK_EMAIL = "benchmark@example.com"
+BENCHMARK_GAMES = 10
+HOST = "127.0.0.1"
+PORT = 8765
+
+SERVERS = {
+    "gunicorn (sync views)": ["gunicorn", "predictive_whist.wsgi"],
+    "uvicorn (sync views)": [
+        "gunicorn",
+        "benchmarks.asgi:application",
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+    ],
+    "uvicorn (async views)": [
+        "gunicorn",
+        "predictive_whist.asgi:application",
+        "--worker-class",
+        "uvicorn.workers.UvicornWorker",
+    ],
+}
+
+
+def seed() -> Tuple[List[str], str]:
+    """Set up the database and static files, add the benchmark user and their games,
+    and log the user in.
+
+    Returns:
+        Tuple[List[str], str]: The pages to request, and the session cookie to send.
+    """
+    call_command("migrate", verbosity=0)
+    call_command("collectstatic", interactive=False, verbosity=0)
+
+    user = User.objects.create_user(email=BENCHMARK_EMAIL)
+    players = create_players(user, 4)
+
+    for number in range(BENCHMARK_GAMES):
+        create_game(
+            user,
+            players,
+            name=f"Benchmark {number}",
+            is_ongoing=number % 2 == 0,
+            scores=[number, 2 * number, 3 * number, 4 * number],
+        )
+
+    client = Client()
+    client.force_login(user)
+    session_cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+
+    game = Game.objects.filter(created_by_user=user).order_by("id").first()
+    assert game is not None
+
+    return (
+        ["/", "/games/", "/players/", f"/games/{game.id}/"],
+        f"{session_cookie.key}={session_cookie.value}",
+    )
+
+
+async def request(path: str, cookie: str) -> int:
+    """Make a GET request on a new connection, and return the response's status."""
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    writer.write(
+        (
+            f"GET {path} HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+    return int(status_line.split()[1])
+
+
+async def load(paths: List[str], cookie: str, concurrency: int, seconds: float):
+    """Request the pages from concurrent clients until the time is up.
+
+    Returns:
+        Tuple[List[float], int]: The latency of each successful request, and the number
+            of failed requests.
+    """
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(offset: int) -> None:
+        nonlocal errors
+        number = offset
+
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+
+            try:
+                status = await request(paths[number % len(paths)], cookie)
+            except OSError:
+                status = 0
+
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+            number += 1
+
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+
+    return latencies, errors
+
+
+def wait_for_server(server: subprocess.Popen, timeout: float = 30) -> None:
+    """Wait until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("The server exited before it started listening.")
+
+        try:
+            with socket.create_connection((HOST, PORT), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError("The server didn't start listening in time.")
+
+
+def benchmark(workers: int, concurrency: int, seconds: float) -> None:
+    """Benchmark each server in turn, and print the results."""
+    paths, cookie = seed()
+
+    print(
+        f"{workers} workers, {concurrency} concurrent clients, "
+        f"{seconds:g}s per server, pages: {', '.join(paths)}"
+    )
+    print(f"  {'server':<24}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+
+    for name, command in SERVERS.items():
+        with subprocess.Popen(
+            [
+                *command,
+                "--workers",
+                str(workers),
+                "--bind",
+                f"{HOST}:{PORT}",
+                "--log-level",
+                "warning",
+            ],
+            stdout=subprocess.DEVNULL,
+        ) as server:
+            try:
+                wait_for_server(server)
+                # Warm up each worker's connections and caches.
+                asyncio.run(load(paths, cookie, concurrency, 1))
+                latencies, errors = asyncio.run(
+                    load(paths, cookie, concurrency, seconds)
+                )
+            finally:
+                server.terminate()
+
+        if not latencies:
+            print(f"  {name:<24}{'-':>8}{'-':>9}{'-':>9}{errors:>8}", file=sys.stderr)
+            continue
+
+        percentiles = statistics.quantiles(latencies, n=20)
+        print(
+            f"  {name:<24}{len(latencies) / seconds:>8.1f}"
+            f"{percentiles[9] * 1000:>9.1f}{percentiles[18] * 1000:>9.1f}{errors:>8}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    try:
+        benchmark(args.workers, args.concurrency, args.seconds)
+    finally:
+        shutil.rmtree(os.environ["BENCHMARK_DIRECTORY"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
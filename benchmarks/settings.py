@@ -0,0 +1,21 @@
+"""Settings for the benchmarks which run the app's servers.
+
+The database and static files are kept in BENCHMARK_DIRECTORY, a temporary directory
+which the benchmark creates, so that running it leaves nothing behind in the
+repository or the development database.
+"""
+import os
+
+# pylint: disable-next=wildcard-import,unused-wildcard-import
+from predictive_whist.settings import *  # noqa: F401,F403
+
+BENCHMARK_DIRECTORY = os.environ["BENCHMARK_DIRECTORY"]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BENCHMARK_DIRECTORY, "db.sqlite3"),
+    }
+}
+
+STATIC_ROOT = os.path.join(BENCHMARK_DIRECTORY, "staticfiles")
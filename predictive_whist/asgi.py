@@ -3,14 +3,31 @@ ASGI config for predictive_whist project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Requests are routed by asgi_urls.py, which serves the read-only pages from async views.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler, ASGIRequest
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "predictive_whist.settings")
 
-application = get_asgi_application()
+
+class AsyncViewsRequest(ASGIRequest):
+    """A request which is routed by asgi_urls.py, rather than the ROOT_URLCONF."""
+
+    urlconf = "predictive_whist.asgi_urls"
+
+
+class AsyncViewsHandler(ASGIHandler):
+    request_class = AsyncViewsRequest
+
+
+# As get_asgi_application() does, before creating the handler.
+django.setup(set_prefix=False)
+
+application = AsyncViewsHandler()
@@ -0,0 +1,66 @@
+"""
+URL configuration for predictive_whist when it is served through ASGI (see asgi.py).
+
+The read-only pages are served by their async views, which don't hold one of the
+server's threads for the whole request, and every other URL by the same view as under
+WSGI (see urls.py). The async views come first, so they are matched before the sync
+views of the same URLs.
+"""
+from django.urls import path, re_path
+
+from apps.games.views import (
+    AsyncGameListCompletedView,
+    AsyncGameListView,
+    AsyncGameShowView,
+)
+from apps.home.views import (
+    AsyncPageView,
+    HomeView,
+    InfoView,
+    PrivacyPolicyView,
+    RulesView,
+)
+from apps.players.views import AsyncPlayerListView, AsyncPlayerShowView
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path(
+        "",
+        AsyncPageView.as_view(template_name=HomeView.template_name),
+        name="home",
+    ),
+    path(
+        "info/",
+        AsyncPageView.as_view(template_name=InfoView.template_name),
+        name="info",
+    ),
+    path(
+        "rules/",
+        AsyncPageView.as_view(template_name=RulesView.template_name),
+        name="rules",
+    ),
+    path(
+        "privacy-policy/",
+        AsyncPageView.as_view(template_name=PrivacyPolicyView.template_name),
+        name="privacy",
+    ),
+    path("players/", AsyncPlayerListView.as_view(), name="players"),
+    re_path(
+        r"^players/(?P<pk>pla_[0-9a-zA-Z]+)/$",
+        AsyncPlayerShowView.as_view(),
+        name="player_show",
+    ),
+    path("games/", AsyncGameListView.as_view(), name="games"),
+    path(
+        "games/completed/",
+        AsyncGameListCompletedView.as_view(),
+        name="games_completed",
+    ),
+    re_path(
+        r"^games/(?P<pk>gam_[0-9a-zA-Z]+)/$",
+        AsyncGameShowView.as_view(),
+        name="game_show",
+    ),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,212 @@
+"""Routing of read-only pages' queries to a read replica of the database.
+
+When a `replica` database is configured (see settings.py), the GET requests of views
+marked with `replica_reads` read from it, and everything else reads from and writes to
+the primary (`default`) database. A request which writes anything reads the rest of its
+queries from the primary too.
+
+A replica lags behind the primary, so a user who has just changed something could be
+shown the page from before their change. To allow for this, a response to a request
+which wrote sets a cookie, which keeps the user's requests on the primary for
+DATABASE_REPLICA_LAG_SECONDS.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+
+REPLICA_DATABASE = "replica"
+
+# The cookie which keeps a user's requests on the primary after they write.
+PRIMARY_COOKIE = "db_primary"
+
+# The apps whose tables are only used through the primary: the sessions, so that a user
+# is never logged out by the replica lagging, and the database cache, which isn't
+# replicated data. Writing to them doesn't count as writing.
+PRIMARY_APP_LABELS = frozenset(("sessions", "django_cache"))
+
+READ_METHODS = frozenset(("GET", "HEAD"))
+
+
+@dataclass
+class RequestState:
+    """Where the current request's queries are routed."""
+
+    # Whether the request's view reads from the replica.
+    reads_replica: bool = False
+    # Whether the request arrived within the lag tolerance of the user's last write.
+    pinned: bool = False
+    # Whether the request has written to the primary.
+    wrote: bool = False
+
+    @property
+    def uses_replica(self) -> bool:
+        """Whether the request's next read is from the replica."""
+        return self.reads_replica and not self.pinned and not self.wrote
+
+
+# The state of the request being handled, which is set by ReplicaMiddleware. It is
+# mutated in place, so that writes made in a thread by sync_to_async() are seen by the
+# request's other threads and tasks.
+request_state: ContextVar[Optional[RequestState]] = ContextVar(
+    "request_state", default=None
+)
+
+
+def replica_reads(view_func: Callable) -> Callable:
+    """Mark a view as reading from the replica in its GET requests.
+
+    Like `csrf_exempt`, this only sets an attribute on the view, which
+    ReplicaMiddleware looks for. Class-based views are marked by decorating their
+    `dispatch()` with `method_decorator`.
+
+    Args:
+        view_func (Callable): The view.
+
+    Returns:
+        Callable: The view, marked.
+    """
+    view_func.replica_reads = True  # type: ignore[attr-defined]
+
+    return view_func
+
+
+class ReplicaReadsAdminMixin:
+    """Reads a model admin's list pages from the replica."""
+
+    @replica_reads
+    def changelist_view(self, request, extra_context=None):
+        return super().changelist_view(  # type: ignore[misc]
+            request, extra_context=extra_context
+        )
+
+
+class ReplicaRouter:
+    """Routes the reads of requests handled by replica views to the replica.
+
+    Everything outside of a request handled by ReplicaMiddleware, such as management
+    commands and background tasks, uses the primary.
+    """
+
+    # The methods' signatures are Django's router interface, whose arguments aren't all
+    # needed here, and `_meta` and `_state` are the public API of models despite their
+    # names.
+    # pylint: disable=unused-argument,protected-access,invalid-name
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        state = request_state.get()
+
+        if state is None:
+            return None
+
+        if state.uses_replica and model._meta.app_label not in PRIMARY_APP_LABELS:
+            return REPLICA_DATABASE
+
+        # Objects read from the replica would otherwise read their relations from it.
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> Optional[str]:
+        state = request_state.get()
+
+        if state is None:
+            return None
+
+        if model._meta.app_label not in PRIMARY_APP_LABELS:
+            state.wrote = True
+
+        # Objects read from the replica would otherwise be saved to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # The replica holds the same rows as the primary.
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DATABASE}:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, **hints) -> Optional[bool]:
+        # The replica is migrated by replicating the primary.
+        if db == REPLICA_DATABASE:
+            return False
+
+        return None
+
+
+class ReplicaMiddleware:
+    """Tracks where each request's queries are routed, for ReplicaRouter.
+
+    It must come before the middleware whose queries are routed, such as
+    SessionMiddleware, so that the state covers them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if REPLICA_DATABASE not in connections.settings:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        state = RequestState(pinned=PRIMARY_COOKIE in request.COOKIES)
+        token = request_state.set(state)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            request_state.reset(token)
+
+        return self.pin_primary(state, response)
+
+    async def __acall__(self, request: HttpRequest):
+        state = RequestState(pinned=PRIMARY_COOKIE in request.COOKIES)
+        token = request_state.set(state)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_state.reset(token)
+
+        return self.pin_primary(state, response)
+
+    def process_view(self, request: HttpRequest, view_func: Callable, *args) -> None:
+        state = request_state.get()
+
+        if state is not None:
+            state.reads_replica = request.method in READ_METHODS and getattr(
+                view_func, "replica_reads", False
+            )
+
+    def pin_primary(self, state: RequestState, response: HttpResponse) -> HttpResponse:
+        """Keep the user's requests on the primary for a while, if the request wrote.
+
+        Args:
+            state (RequestState): The request's state.
+            response (HttpResponse): The response to the request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if state.wrote and settings.DATABASE_REPLICA_LAG_SECONDS > 0:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_LAG_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
@@ -95,7 +95,11 @@ MIDDLEWARE = [
     # excellent WhiteNoise package to do so instead. The WhiteNoise middleware must be listed
     # after Django's `SecurityMiddleware` so that security redirects are still performed.
     # See: https://whitenoise.readthedocs.io
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Its middleware is wrapped so that it can be called from async requests too.
+    "predictive_whist.static.StaticFilesMiddleware",
+    # Routes the queries of read-only pages to the read replica, if there is one. It comes
+    # before the middleware which reads the session and user, so their queries are routed.
+    "predictive_whist.replica.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -151,6 +155,84 @@ else:
         }
     }
 
+# Read replica
+#
+# Setting the `DATABASE_REPLICA_URL` env var (in the same form as `DATABASE_URL`) adds a
+# read replica of the database. The GET requests of the pages which only read, such as
+# the game and player lists, a game's page and the admin's lists, then read from it (see
+# predictive_whist/replica.py). A request uses the primary once it writes, and so do a
+# user's requests for DATABASE_REPLICA_LAG_SECONDS afterwards, to allow for the replica
+# lagging behind. Locally, a copy of db.sqlite3 can be used as the replica, with
+# `DATABASE_REPLICA_URL=sqlite:///db-replica.sqlite3`. The tests leave the replica out
+# (see predictive_whist/test_runner.py).
+
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        conn_health_checks=True,
+        ssl_require=IS_HEROKU_APP,
+    )
+
+DATABASE_ROUTERS = ["predictive_whist.replica.ReplicaRouter"]
+
+DATABASE_REPLICA_LAG_SECONDS = int(os.environ.get("DATABASE_REPLICA_LAG_SECONDS", "5"))
+
+TEST_RUNNER = "predictive_whist.test_runner.PrimaryDatabaseTestRunner"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# The cache holds each game's scoreboard data, keyed on the game's version (see
+# apps/games/cache.py). There are many small entries, and a game is mostly looked at
+# while it's being played, so entries expire after a day. Once MAX_ENTRIES is reached,
+# expired entries and then a quarter (1 / CULL_FREQUENCY) of the rest are culled.
+
+CACHE_OPTIONS = {
+    "TIMEOUT": 60 * 60 * 24,
+    "OPTIONS": {
+        "MAX_ENTRIES": 10000,
+        "CULL_FREQUENCY": 4,
+    },
+}
+
+if IS_HEROKU_APP:
+    # In production, use the database so that the cache is shared by every worker and
+    # survives restarts. The table is created by `createcachetable` in the release phase.
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            **CACHE_OPTIONS,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            **CACHE_OPTIONS,
+        },
+    }
+
+
+# Live scoreboard
+#
+# Game pages can be kept up to date by streaming each change to their scoreboard over
+# Server-Sent Events (see apps/games/live.py). A stream holds its request open, so this
+# needs the app to be served through ASGI (predictive_whist.asgi) and is opt-in, by
+# setting the `LIVE_SCOREBOARD` env var. In production every worker listens for changes
+# through Postgres, so a change made in one worker reaches the streams of all of them.
+
+LIVE_SCOREBOARD_ENABLED = os.environ.get("LIVE_SCOREBOARD", "").lower() in ("1", "true")
+
+if IS_HEROKU_APP:
+    LIVE_SCOREBOARD_BACKEND = "apps.games.live.PostgresBroadcastBackend"
+else:
+    LIVE_SCOREBOARD_BACKEND = "apps.games.live.InMemoryBroadcastBackend"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
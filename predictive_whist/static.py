@@ -0,0 +1,41 @@
+"""Serving of the static files by WhiteNoise, under both WSGI and ASGI."""
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpRequest
+from whitenoise.middleware import WhiteNoiseMiddleware  # type: ignore
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise's middleware, which can also be called from an async request.
+
+    WhiteNoise's own middleware is sync only, which under ASGI would make Django run the
+    rest of the middleware, and the view, in a thread for every request. Here only the
+    requests for static files are served by a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable, *args, **kwargs) -> None:
+        super().__init__(get_response, *args, **kwargs)
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        return super().__call__(request)
+
+    async def __acall__(self, request: HttpRequest):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+
+        return await self.get_response(request)
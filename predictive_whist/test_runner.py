@@ -0,0 +1,18 @@
+"""The runner of the project's tests (see TEST_RUNNER in settings.py)."""
+from django.db import connections
+from django.test.runner import DiscoverRunner
+
+from .replica import REPLICA_DATABASE
+
+
+class PrimaryDatabaseTestRunner(DiscoverRunner):
+    """Runs the tests against the primary database alone.
+
+    A read replica configured with `DATABASE_REPLICA_URL` is left out, as each test's
+    data is only in its transaction on the primary. apps/home/tests/test_replica.py
+    sets up a replica of its own.
+    """
+
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        connections.settings.pop(REPLICA_DATABASE, None)
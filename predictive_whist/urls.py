@@ -18,11 +18,16 @@ from django.contrib import admin
 from django.contrib.auth.views import PasswordResetView
 from django.urls import include, path, re_path
 
+from apps.games.api import GameApiView, GameRoundBidsApiView, GameRoundTricksApiView
 from apps.games.views import (
     GameDeleteView,
+    GameExportView,
+    GameImportView,
+    GameLiveView,
     GameRoundPredictionView,
     GameRoundScoreView,
     GameShowView,
+    GameListCompletedView,
     GameListView,
     GameCreateView,
 )
@@ -31,7 +36,9 @@ from apps.players.views import (
     PlayerCreateView,
     PlayerDeleteView,
     PlayerDeleteErrorView,
+    PlayerLeaderboardView,
     PlayerListView,
+    PlayerShowView,
 )
 from apps.users.views import UserCreateView, UserUpdateView
 from apps.users.forms import UserCreateForm, UserUpdateForm
@@ -68,6 +75,16 @@ urlpatterns = [
     path("rules/", RulesView.as_view(), name="rules"),
     path("players/", PlayerListView.as_view(), name="players"),
     path("players/new/", PlayerCreateView.as_view(), name="player_create"),
+    path(
+        "players/leaderboard/",
+        PlayerLeaderboardView.as_view(),
+        name="player_leaderboard",
+    ),
+    re_path(
+        r"^players/(?P<pk>pla_[0-9a-zA-Z]+)/$",
+        PlayerShowView.as_view(),
+        name="player_show",
+    ),
     re_path(
         r"^players/(?P<pk>pla_[0-9a-zA-Z]+)/delete/$",
         PlayerDeleteView.as_view(),
@@ -79,10 +96,26 @@ urlpatterns = [
         name="player_delete_error",
     ),
     path("games/", GameListView.as_view(), name="games"),
+    path(
+        "games/completed/",
+        GameListCompletedView.as_view(),
+        name="games_completed",
+    ),
     re_path(
         r"^games/(?P<pk>gam_[0-9a-zA-Z]+)/$", GameShowView.as_view(), name="game_show"
     ),
+    re_path(
+        r"^games/(?P<pk>gam_[0-9a-zA-Z]+)/live/$",
+        GameLiveView.as_view(),
+        name="game_live",
+    ),
     path("games/new/", GameCreateView.as_view(), name="game_create"),
+    path("games/import/", GameImportView.as_view(), name="games_import"),
+    re_path(
+        r"^games/export/(?P<export_format>csv|jsonl)/$",
+        GameExportView.as_view(),
+        name="games_export",
+    ),
     re_path(
         r"^games/delete/(?P<pk>gam_[0-9a-zA-Z]+)/$",
         GameDeleteView.as_view(),
@@ -108,6 +141,19 @@ urlpatterns = [
         GameRoundScoreView.as_view(),
         name="game_round_scores",
     ),
+    re_path(
+        r"^api/games/(?P<pk>gam_[0-9a-zA-Z]+)/$", GameApiView.as_view(), name="api_game"
+    ),
+    re_path(
+        r"^api/games/(?P<game_id>gam_[0-9a-zA-Z]+)/rounds/(?P<round_number>[0-9]+)/bids/$",
+        GameRoundBidsApiView.as_view(),
+        name="api_game_round_bids",
+    ),
+    re_path(
+        r"^api/games/(?P<game_id>gam_[0-9a-zA-Z]+)/rounds/(?P<round_number>[0-9]+)/tricks/$",
+        GameRoundTricksApiView.as_view(),
+        name="api_game_round_tricks",
+    ),
     path("privacy-policy/", PrivacyPolicyView.as_view(), name="privacy"),
     path("admin/", admin.site.urls),
 ]